@@ -1,103 +1,183 @@
-import librosa
-import librosa.display
 import numpy as np
-import scipy.signal
-import soundfile as sf
 import os
+import sys
 import argparse
-import threading
-import queue
 import time
+import functools
+import hashlib
+import importlib
+import json
+import concurrent.futures
+import csv
+import glob
+import tempfile
+import shutil
+
+# Deferred Imports
+#
+# librosa, scipy, soundfile and the optional packages take seconds to import between
+# them, so they are bound to LazyModule stand-ins and imported on first attribute
+# access: `--help` or a format conversion only pays for what it uses. Optional packages
+# are checked with available() where a feature needs them, which also reports what is
+# missing (once) instead of printing warnings at every start.
+
+class LazyModule:
+    """Module stand-in that runs `import import_name` on first attribute access."""
+    def __init__(self, import_name, module_name=None, missing=None):
+        self._import_name = import_name
+        self._module_name = module_name or import_name  # e.g. 'scipy' for `import scipy.signal`
+        self._missing = missing
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            importlib.import_module(self._import_name)
+            self._module = sys.modules[self._module_name]
+        return self._module
+
+    def __getattr__(self, attribute):
+        if attribute.startswith('__'):  # Keeps copy/pickle/inspect probes from importing
+            raise AttributeError(attribute)
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._import_name}' ({state})>"
+
+DEFERRED_IMPORTS = {}
+
+def lazy_import(alias, import_name, module_name=None, missing=None):
+    """Registers a deferred import under `alias` and returns its stand-in."""
+    DEFERRED_IMPORTS[alias] = LazyModule(import_name, module_name, missing)
+    return DEFERRED_IMPORTS[alias]
+
+@functools.lru_cache(maxsize=None)
+def available(module):
+    """Imports a deferred module if possible; reports a missing optional package once."""
+    try:
+        module._load()
+        return True
+    except ImportError:
+        if module._missing:
+            print(module._missing)
+        return False
 
-try:
-    import pyaudio
-except ImportError:
-    print("PyAudio not installed. Real-time processing will be disabled.")
-    pyaudio = None
-
-try:
-    import speech_recognition as sr
-except ImportError:
-    print("SpeechRecognition not installed. Speech recognition will be disabled.")
-    sr = None
-
-try:
-    import tkinter as tk
-    from tkinter import ttk
-    from tkinter import filedialog
-    GUI_ENABLED = True
-except ImportError:
-    print("Tkinter not installed. GUI will be disabled.")
-    GUI_ENABLED = False
+librosa = lazy_import('librosa', 'librosa')
+scipy = lazy_import('scipy', 'scipy.signal', 'scipy')
+sf = lazy_import('sf', 'soundfile')
+Image = lazy_import('Image', 'PIL.Image', missing="Pillow not installed. Spectrogram export will use matplotlib.")
+pyaudio = lazy_import('pyaudio', 'pyaudio', missing="PyAudio not installed. Real-time processing will be disabled.")
+sr = lazy_import('sr', 'speech_recognition',
+                 missing="SpeechRecognition not installed. Speech recognition will be disabled.")
+tk = lazy_import('tk', 'tkinter', missing="Tkinter not installed. GUI will be disabled.")
+ttk = lazy_import('ttk', 'tkinter.ttk')
+filedialog = lazy_import('filedialog', 'tkinter.filedialog')
 
 # Audio Processing Functions
 
-def noise_reduction_spectral_subtraction(audio, noise_clip, sr, prop_decrease=1.0):
-    """Noise reduction using spectral subtraction."""
-    noise_stft = librosa.stft(noise_clip)
-    noise_stft_db = librosa.amplitude_to_db(np.abs(noise_stft), ref=np.max)
-    mean_noise_db = np.mean(noise_stft_db, axis=1)
-    noise_stft_smoothed = librosa.db_to_amplitude(mean_noise_db)
-
-    audio_stft = librosa.stft(audio)
-    audio_stft_db = librosa.amplitude_to_db(np.abs(audio_stft), ref=np.max)
-
-    reduced_stft_db = np.zeros_like(audio_stft_db)
-    for i in range(audio_stft_db.shape[1]):
-        reduced_stft_db[:, i] = np.maximum(audio_stft_db[:, i] - prop_decrease * mean_noise_db, -80)  # -80 dB floor
-
-    reduced_stft = librosa.db_to_amplitude(reduced_stft_db)
-    reduced_audio = librosa.istft(reduced_stft)
+def noise_profile_db(noise_clip, n_fft=2048, hop_length=512, dtype=np.float32):
+    """Mean level per frequency bin of a noise clip, in dB relative to its loudest bin."""
+    noise_stft = librosa.stft(np.asarray(noise_clip, dtype=dtype), n_fft=n_fft, hop_length=hop_length)
+    return np.mean(librosa.amplitude_to_db(np.abs(noise_stft), ref=np.max), axis=1)
 
-    return reduced_audio
-
-def noise_reduction_wiener(audio, noise_clip, sr, lFilterLength=800):
+def noise_reduction_spectral_subtraction(audio, noise_clip, sr, prop_decrease=1.0, n_fft=2048, hop_length=512,
+                                         floor_db=-80.0, dtype=np.float32, reference=None, mean_noise_db=None):
+    """Noise reduction using spectral subtraction."""
+    # The noise profile is subtracted from every frame at once (in dB, floored at floor_db).
+    # In the amplitude domain that is one gain per bin, so the whole spectrogram is handled
+    # with a few in-place array operations and the original phase and level are kept.
+    # `reference` (the loudest STFT magnitude) is passed in when processing a file in blocks.
+    audio = np.asarray(audio, dtype=dtype)
+    if mean_noise_db is None:
+        mean_noise_db = noise_profile_db(noise_clip, n_fft, hop_length, dtype)
+    gain = librosa.db_to_amplitude(-prop_decrease * mean_noise_db).astype(dtype)[:, None]
+
+    audio_stft = librosa.stft(audio, n_fft=n_fft, hop_length=hop_length)
+    magnitude = np.abs(audio_stft)
+    floor = (magnitude.max() if reference is None else reference) * dtype(librosa.db_to_amplitude(floor_db))
+
+    scale = np.maximum(magnitude, floor)
+    scale *= gain
+    np.maximum(scale, floor, out=scale)
+    np.maximum(magnitude, np.finfo(dtype).tiny, out=magnitude)
+    scale /= magnitude
+    del magnitude
+    audio_stft *= scale
+    del scale
+
+    return librosa.istft(audio_stft, hop_length=hop_length, n_fft=n_fft, length=len(audio))
+
+def noise_reduction_wiener(audio, noise_clip, sr, lFilterLength=800, dtype=np.float32, audio_psd=None):
     """Noise reduction using Wiener filtering."""
     win = int(lFilterLength/2)
     if len(noise_clip) < win:
         return audio
-    noise_psd = np.abs(librosa.stft(noise_clip, n_fft=lFilterLength, hop_length=win)).mean(axis=1)
-    audio_psd = np.abs(librosa.stft(audio, n_fft=lFilterLength, hop_length=win)).mean(axis=1)
-    
-    wiener_filter = audio_psd / (audio_psd + noise_psd)
+    audio = np.asarray(audio, dtype=dtype)
+    noise_psd = np.abs(librosa.stft(np.asarray(noise_clip, dtype=dtype), n_fft=lFilterLength, hop_length=win)).mean(axis=1)
 
+    # One STFT of the signal serves both the PSD estimate and the filtering;
+    # `audio_psd` is passed in when processing a file in blocks
     audio_stft = librosa.stft(audio, n_fft=lFilterLength, hop_length=win)
-    filtered_stft = audio_stft * wiener_filter[:, None]
-    filtered_audio = librosa.istft(filtered_stft)
-    return filtered_audio
+    if audio_psd is None:
+        audio_psd = np.abs(audio_stft).mean(axis=1)
+    wiener_filter = audio_psd / np.maximum(audio_psd + noise_psd, np.finfo(dtype).tiny)
 
-def convert_audio_format(input_file, output_file, target_format):
+    audio_stft *= wiener_filter[:, None]
+    return librosa.istft(audio_stft, n_fft=lFilterLength, hop_length=win, length=len(audio))
+
+def convert_audio_format(input_file, output_file, target_format, block_size=65536):
     """Converts audio format using soundfile."""
     try:
-        data, samplerate = sf.read(input_file)
-        sf.write(output_file, data, samplerate, format=target_format)
+        # Copied block by block, so memory use does not grow with the file length
+        with sf.SoundFile(input_file) as source:
+            with sf.SoundFile(output_file, 'w', samplerate=source.samplerate, channels=source.channels,
+                              format=target_format) as target:
+                for block in source.blocks(blocksize=block_size):
+                    target.write(block)
         return True
     except Exception as e:
         print(f"Error during format conversion: {e}")
         return False
 
+FEATURE_TYPES = ('mfcc', 'chroma', 'spectral_centroid')
+
+def stft_features(stft, sr, feature_types, n_mfcc=13, n_fft=2048):
+    """Derives several features from one STFT (same values as computing each from the signal)."""
+    features = {}
+    power = None
+    for feature_type in feature_types:
+        if feature_type in ('mfcc', 'chroma') and power is None:
+            power = np.abs(stft) ** 2
+        if feature_type == 'mfcc':
+            mel = librosa.feature.melspectrogram(S=power, sr=sr, n_fft=n_fft)
+            features['mfcc'] = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=n_mfcc)
+        elif feature_type == 'chroma':
+            features['chroma'] = librosa.feature.chroma_stft(S=power, sr=sr, n_fft=n_fft)
+        elif feature_type == 'spectral_centroid':
+            features['spectral_centroid'] = librosa.feature.spectral_centroid(S=np.abs(stft), sr=sr, n_fft=n_fft)[0]
+        else:
+            raise ValueError("Invalid feature type.")
+    return features
+
 def extract_features(audio, sr, feature_type='mfcc', n_mfcc=13):
     """Extracts audio features."""
-    if feature_type == 'mfcc':
-        mfccs = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=n_mfcc)
-        return mfccs
-    elif feature_type == 'chroma':
-        chroma = librosa.feature.chroma_stft(y=audio, sr=sr)
-        return chroma
-    elif feature_type == 'spectral_centroid':
-        spectral_centroid = librosa.feature.spectral_centroid(y=audio, sr=sr)[0]
-        return spectral_centroid
-    else:
+    if feature_type not in FEATURE_TYPES:
         raise ValueError("Invalid feature type.")
+    return stft_features(librosa.stft(audio), sr, [feature_type], n_mfcc=n_mfcc)[feature_type]
 
 def generate_spectrogram(audio, sr, output_file=None):
     """Generates and saves a spectrogram."""
+    if output_file and available(Image):
+        # Saved spectrograms skip matplotlib (see spectrogram_image); it is only used for display
+        save_png(spectrogram_image(audio), output_file)
+        return
     X = librosa.stft(audio)
     Xdb = librosa.amplitude_to_db(abs(X))
     
     import matplotlib.pyplot as plt
+    from librosa import display
     plt.figure(figsize=(12, 4))
-    librosa.display.specshow(Xdb, sr=sr, x_axis='time', y_axis='hz')
+    display.specshow(Xdb, sr=sr, x_axis='time', y_axis='hz')
     plt.colorbar()
     plt.title('Spectrogram')
     if output_file:
@@ -108,21 +188,16 @@ def generate_spectrogram(audio, sr, output_file=None):
 
 def speech_to_text(audio_file):
     """Converts speech to text using SpeechRecognition (Sphinx)."""
-    if sr is None:
+    if not available(sr):
         print("SpeechRecognition library is not installed.")
         return None
 
-    r = sr.Recognizer()
-    with sr.AudioFile(audio_file) as source:
-        audio = r.record(source)
-
     try:
-        text = r.recognize_sphinx(audio)  # Use Sphinx
-        return text
-    except sr.UnknownValueError:
-        return "Sphinx could not understand audio"
+        # Segmented at pauses and recognised in parallel (see transcribe_file)
+        text = " ".join(text for _, _, text in transcribe_file(audio_file, engine='sphinx') if text)
     except sr.RequestError as e:
         return f"Sphinx error; {e}"
+    return text or "Sphinx could not understand audio"
 
 def generate_sine_wave(frequency, duration, sr=44100):
     """Generates a sine wave."""
@@ -130,16 +205,97 @@ def generate_sine_wave(frequency, duration, sr=44100):
     note = np.sin(2 * np.pi * frequency * t)
     return note
 
+@functools.lru_cache(maxsize=32)
+def reverb_impulse_response(sr, reverb_time=0.5, decay_rate=0.5, tail_tolerance=1e-8):
+    """Exponentially decaying impulse response, built once per (sr, reverb_time, decay_rate)."""
+    length = int(sr * reverb_time)
+    # Taps whose summed contribution stays below tail_tolerance (far under float32
+    # resolution) are dropped, so fast decays do not pay for reverb_time * sr taps
+    decay = abs(decay_rate)
+    if decay == 0:
+        length = min(length, 1)
+    elif decay < 1:
+        length = min(length, int(np.ceil(np.log(tail_tolerance * (1 - decay)) / np.log(decay))) + 1)
+    impulse_response = np.power(float(decay_rate), np.arange(length)).astype(np.float32)
+    impulse_response.flags.writeable = False  # Shared through the cache
+    return impulse_response
+
 def add_reverb(audio, sr, reverb_time=0.5, decay_rate=0.5):
   """Adds reverb to an audio signal."""
-  impulse_response = np.zeros(int(sr * reverb_time))
-  impulse_response[0] = 1.0
-  for i in range(1, len(impulse_response)):
-    impulse_response[i] = impulse_response[i-1] * decay_rate
-
-  reverbed_audio = scipy.signal.convolve(audio, impulse_response, mode='full')[:len(audio)]
+  impulse_response = reverb_impulse_response(sr, reverb_time, decay_rate)
+  reverbed_audio = scipy.signal.oaconvolve(audio, impulse_response, mode='full')[:len(audio)]
   return reverbed_audio
 
+# NumPy >= 2.0 can write FFT results into preallocated arrays
+FFT_OUT = np.lib.NumpyVersion(np.__version__) >= '2.0.0'
+
+@functools.lru_cache(maxsize=32)
+def partitioned_ir_spectra(sr, reverb_time, decay_rate, block_size):
+    """FFTs of the impulse response cut into block_size partitions (shape: partitions x bins)."""
+    impulse_response = reverb_impulse_response(sr, reverb_time, decay_rate)
+    partitions = max(1, -(-len(impulse_response) // block_size))
+    padded = np.zeros((partitions, block_size), dtype=np.float32)
+    padded.reshape(-1)[:len(impulse_response)] = impulse_response
+    spectra = np.fft.rfft(padded, n=2 * block_size, axis=1).astype(np.complex64)
+    spectra.flags.writeable = False
+    return spectra
+
+class ReverbEngine:
+    """Streaming reverb: uniformly partitioned overlap-save convolution with state across blocks."""
+    # Each call convolves one or more blocks of block_size samples against the cached IR
+    # spectra; the spectra of the last `partitions` input blocks are kept in a ring
+    # (frequency-domain delay line), so the cost per block is one FFT pair plus one
+    # multiply-accumulate per partition, independent of where the block falls in the stream.
+    def __init__(self, sr, reverb_time=0.5, decay_rate=0.5, block_size=1024):
+        self.block_size = block_size
+        self.spectra = partitioned_ir_spectra(sr, reverb_time, decay_rate, block_size)
+        partitions, bins = self.spectra.shape
+        self.delay_line = np.zeros((partitions, bins), dtype=np.complex64)
+        self.position = 0  # Slot of the newest input spectrum
+        self.window = np.zeros(2 * block_size, dtype=np.float32)  # Previous block + current block
+        self.accumulator = np.zeros(bins, dtype=np.complex64)
+        self.partial = np.zeros(bins, dtype=np.complex64)
+        self.output = np.zeros(2 * block_size, dtype=np.float32)
+
+    def reset(self):
+        self.delay_line.fill(0)
+        self.window.fill(0)
+        self.position = 0
+
+    def process_block(self, block, out=None):
+        # With `out` (and NumPy >= 2.0) no arrays are allocated per block
+        size = self.block_size
+        self.window[:size] = self.window[size:]
+        self.window[size:] = block
+        self.position = (self.position + 1) % len(self.delay_line)
+        if FFT_OUT:
+            np.fft.rfft(self.window, out=self.delay_line[self.position])
+        else:
+            self.delay_line[self.position] = np.fft.rfft(self.window)
+
+        # sum_p H[p] * X[newest - p], split into the two contiguous runs of the ring
+        position = self.position
+        np.einsum('pk,pk->k', self.delay_line[:position + 1], self.spectra[position::-1], out=self.accumulator)
+        if position + 1 < len(self.delay_line):
+            np.einsum('pk,pk->k', self.delay_line[position + 1:], self.spectra[:position:-1], out=self.partial)
+            self.accumulator += self.partial
+        if FFT_OUT:
+            np.fft.irfft(self.accumulator, n=2 * size, out=self.output)
+        else:
+            self.output[:] = np.fft.irfft(self.accumulator, n=2 * size)
+        if out is None:
+            return self.output[size:].copy()
+        np.copyto(out, self.output[size:])
+        return out
+
+    def process(self, audio):
+        if len(audio) % self.block_size:
+            raise ValueError(f"ReverbEngine expects a multiple of {self.block_size} samples, got {len(audio)}")
+        if len(audio) == self.block_size:
+            return self.process_block(audio)
+        return np.concatenate([self.process_block(audio[i:i + self.block_size])
+                               for i in range(0, len(audio), self.block_size)])
+
 def add_echo(audio, sr, delay=0.2, decay=0.6):
     """Adds echo to an audio signal."""
     delay_samples = int(delay * sr)
@@ -152,39 +308,889 @@ def add_distortion(audio, drive=5.0):
   distorted_audio = np.tanh(audio * drive)
   return distorted_audio
 
+# Streaming File Processing
+#
+# Long recordings are processed block by block: each block is handed to the in-memory
+# function together with `margin` samples of context on both sides, and only the samples
+# of the block itself are kept. For STFT-based processing the block starts and the margin
+# are multiples of the hop length and the margin covers a whole frame, so every kept sample
+# is built from exactly the frames the in-memory path would use. Statistics over the
+# whole file (loudest bin, mean spectrum) are collected in a first pass.
+
+DEFAULT_BLOCK_SIZE = 2 ** 18  # Samples per block (~6 s at 44.1 kHz)
+
+def to_mono(data):
+    """Downmixes a (frames, channels) block the way librosa.to_mono does."""
+    return np.mean(data, axis=1) if data.ndim > 1 else data
+
+def aligned(value, multiple):
+    """Rounds value up to a multiple."""
+    return -(-value // multiple) * multiple
+
+def read_blocks(input_file, block_size=DEFAULT_BLOCK_SIZE, margin=0, dtype='float32'):
+    """Yields (segment, lead, length): `length` new mono samples after `lead` samples of context."""
+    with sf.SoundFile(input_file) as f:
+        total = f.frames
+        for start in range(0, total, block_size):
+            begin = max(0, start - margin)
+            end = min(total, start + block_size + margin)
+            f.seek(begin)
+            segment = to_mono(f.read(end - begin, dtype=dtype, always_2d=True))
+            yield segment, start - begin, min(block_size, total - start)
+
+def interior_frames(lead, length, hop_length, final):
+    """STFT frames of a segment that belong to its block (frame i is centred on sample i * hop)."""
+    first = lead // hop_length
+    last = (lead + length) // hop_length + (1 if final else 0)
+    return slice(first, last)
+
+def read_mono(input_file, sr=None, dtype='float32'):
+    """Loads a short clip (e.g. a noise profile) as mono, resampled to sr if needed."""
+    data, file_sr = sf.read(input_file, dtype=dtype, always_2d=True)
+    data = to_mono(data)
+    if sr is not None and file_sr != sr:
+        data = librosa.resample(data, orig_sr=file_sr, target_sr=sr)
+    return data, file_sr if sr is None else sr
+
+def process_file(input_file, output_file, process, block_size=DEFAULT_BLOCK_SIZE, margin=0, align=1, subtype=None):
+    """Runs process(segment, sr) over a file block by block and writes the kept samples."""
+    block_size = aligned(block_size, align)
+    margin = aligned(margin, align)
+    info = sf.info(input_file)
+    with sf.SoundFile(output_file, 'w', samplerate=info.samplerate, channels=1, subtype=subtype) as out:
+        for segment, lead, length in read_blocks(input_file, block_size, margin):
+            out.write(process(segment, info.samplerate)[lead:lead + length])
+
+def stft_blocks(input_file, n_fft, hop_length, block_size=DEFAULT_BLOCK_SIZE):
+    """Yields the STFT frames of a file block by block, identical to one librosa.stft of the whole file."""
+    for segment, lead, length in read_blocks(input_file, aligned(block_size, hop_length), aligned(n_fft, hop_length)):
+        # With a right margin present the block cannot be the last one
+        frames = interior_frames(lead, length, hop_length, final=lead + length == len(segment))
+        yield librosa.stft(segment, n_fft=n_fft, hop_length=hop_length)[:, frames]
+
+def denoise_file(input_file, noise_file, output_file, method='spectral', block_size=DEFAULT_BLOCK_SIZE,
+                 subtype=None, **params):
+    """Spectral subtraction or Wiener filtering of a file of any length in constant memory."""
+    sr = sf.info(input_file).samplerate
+    noise, _ = read_mono(noise_file, sr)
+    if method == 'spectral':
+        n_fft, hop_length = params.pop('n_fft', 2048), params.pop('hop_length', 512)
+        # First pass: the loudest STFT magnitude of the whole file
+        reference = 0.0
+        for stft in stft_blocks(input_file, n_fft, hop_length, block_size):
+            if stft.size:
+                reference = max(reference, np.abs(stft).max())
+        mean_noise_db = noise_profile_db(noise, n_fft, hop_length)
+        process = lambda segment, sr: noise_reduction_spectral_subtraction(
+            segment, noise, sr, n_fft=n_fft, hop_length=hop_length, reference=reference,
+            mean_noise_db=mean_noise_db, **params)
+    elif method == 'wiener':
+        n_fft = params.pop('lFilterLength', 800)
+        hop_length = int(n_fft/2)
+        # First pass: the mean magnitude spectrum of the whole file (summed in float64)
+        total, frames = 0.0, 0
+        for stft in stft_blocks(input_file, n_fft, hop_length, block_size):
+            total = total + np.abs(stft).sum(axis=1, dtype=np.float64)
+            frames += stft.shape[1]
+        audio_psd = (total / max(frames, 1)).astype(np.float32)
+        process = lambda segment, sr: noise_reduction_wiener(segment, noise, sr, lFilterLength=n_fft,
+                                                              audio_psd=audio_psd, **params)
+    else:
+        raise ValueError("Invalid noise reduction method.")
+    process_file(input_file, output_file, process, block_size, margin=n_fft, align=hop_length, subtype=subtype)
+
+def apply_effect_file(input_file, output_file, effect, block_size=DEFAULT_BLOCK_SIZE, subtype=None, **params):
+    """Applies reverb, echo or distortion to a file of any length in constant memory."""
+    sr = sf.info(input_file).samplerate
+    if effect == 'reverb':
+        # Each output sample depends on the previous len(impulse response) - 1 input samples
+        margin = len(reverb_impulse_response(sr, params.get('reverb_time', 0.5), params.get('decay_rate', 0.5)))
+        process = lambda segment, sr: add_reverb(segment, sr, **params)
+    elif effect == 'echo':
+        margin = int(params.get('delay', 0.2) * sr)
+        process = lambda segment, sr: add_echo(segment, sr, **params)
+    elif effect == 'distortion':
+        margin = 0
+        process = lambda segment, sr: add_distortion(segment, **params)
+    else:
+        raise ValueError("Invalid effect.")
+    process_file(input_file, output_file, process, block_size, margin=margin, subtype=subtype)
+
+def extract_features_file(input_file, feature_type='mfcc', n_mfcc=13, n_fft=2048, hop_length=512,
+                          block_size=DEFAULT_BLOCK_SIZE, tuning=None):
+    """Extracts features from a file of any length; only the feature matrix is kept in memory."""
+    sr = sf.info(input_file).samplerate
+    if feature_type == 'mfcc':
+        # power_to_db clips at 80 dB below the loudest mel bin of the whole file: find it first
+        def mel_blocks():
+            for stft in stft_blocks(input_file, n_fft, hop_length, block_size):
+                yield librosa.feature.melspectrogram(S=np.abs(stft) ** 2, sr=sr, n_fft=n_fft)
+        top = max((mel.max() for mel in mel_blocks() if mel.size), default=0.0)
+        floor_db = librosa.power_to_db(np.array([top], dtype=np.float32), top_db=None)[0] - 80.0
+        blocks = [librosa.feature.mfcc(S=np.maximum(librosa.power_to_db(mel, top_db=None), floor_db), n_mfcc=n_mfcc)
+                  for mel in mel_blocks()]
+    elif feature_type == 'chroma':
+        # Tuning is estimated on the first block unless given, so chroma matches the
+        # in-memory path exactly only when `tuning` is passed
+        blocks = []
+        for stft in stft_blocks(input_file, n_fft, hop_length, block_size):
+            power = np.abs(stft) ** 2
+            if tuning is None:
+                tuning = librosa.estimate_tuning(S=power, sr=sr, n_fft=n_fft)
+            blocks.append(librosa.feature.chroma_stft(S=power, sr=sr, n_fft=n_fft, tuning=tuning))
+    elif feature_type == 'spectral_centroid':
+        blocks = [librosa.feature.spectral_centroid(S=np.abs(stft), sr=sr, n_fft=n_fft)[0]
+                  for stft in stft_blocks(input_file, n_fft, hop_length, block_size)]
+    else:
+        raise ValueError("Invalid feature type.")
+    return np.concatenate(blocks, axis=-1)
+
+
+# Batch Feature Extraction
+#
+# Features for a whole corpus are computed in a process pool, one STFT per clip, and
+# stored as .npy files in a FeatureStore. Each matrix is keyed by the SHA-256 of the
+# audio file plus the parameters that affect it, so a re-run only decodes files whose
+# content changed or that lack a requested feature. index.json remembers the hash of
+# every file by (size, mtime) so unchanged files are not even re-read.
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg', '.mp3', '.aiff', '.aif')
+
+# Parameters each feature depends on (sr=None means the file's own sample rate)
+FEATURE_PARAMS = {
+    'mfcc': ('sr', 'n_fft', 'hop_length', 'n_mfcc'),
+    'chroma': ('sr', 'n_fft', 'hop_length'),
+    'spectral_centroid': ('sr', 'n_fft', 'hop_length'),
+}
+
+def hash_file(input_file, chunk_size=1 << 20):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(input_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class FeatureStore:
+    """Directory of feature matrices, one .npy per (file hash, feature, parameters)."""
+    def __init__(self, root):
+        self.root = root
+        self.index_file = os.path.join(root, 'index.json')
+        os.makedirs(os.path.join(root, 'features'), exist_ok=True)
+
+    @staticmethod
+    def key(file_hash, feature_type, params):
+        relevant = {name: params.get(name) for name in FEATURE_PARAMS[feature_type]}
+        payload = json.dumps([file_hash, feature_type, relevant], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.root, 'features', key[:2], key + '.npy')
+
+    def has(self, key):
+        return os.path.exists(self.path(key))
+
+    def save(self, key, values):
+        # Written under a temporary name and renamed, so readers never see a partial file
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            np.save(f, values)
+        os.replace(temporary, path)
+
+    def load(self, key):
+        return np.load(self.path(key), mmap_mode='r')
+
+    def lookup(self, input_file, feature_type, params):
+        """Memory-mapped features of input_file, or None if they were never extracted."""
+        key = self.key(hash_file(input_file), feature_type, params)
+        return self.load(key) if self.has(key) else None
+
+    def load_index(self):
+        try:
+            with open(self.index_file) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save_index(self, index):
+        temporary = self.index_file + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(index, f)
+        os.replace(temporary, self.index_file)
+
+def list_audio_files(source):
+    """Audio files under a directory, matching a glob, or listed in a manifest (one per line)."""
+    if os.path.isdir(source):
+        return sorted(os.path.join(directory, name)
+                      for directory, _, names in os.walk(source)
+                      for name in names if name.lower().endswith(AUDIO_EXTENSIONS))
+    if not os.path.isfile(source):
+        return sorted(path for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+    if source.lower().endswith(AUDIO_EXTENSIONS):
+        return [source]
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source) as f:
+        lines = [line.strip() for line in f]
+    return [os.path.join(base, line) for line in lines if line and not line.startswith('#')]
+
+def extract_clip_features(input_file, store, feature_types, params, file_hash=None):
+    """Pool worker: hashes a clip if needed and stores every missing feature from one STFT."""
+    started = time.perf_counter()
+    if file_hash is None:
+        file_hash = hash_file(input_file)
+    keys = {feature_type: store.key(file_hash, feature_type, params) for feature_type in feature_types}
+    missing = [feature_type for feature_type in feature_types if not store.has(keys[feature_type])]
+    if missing:
+        audio, sr = read_mono(input_file, params.get('sr'))
+        stft = librosa.stft(audio, n_fft=params['n_fft'], hop_length=params['hop_length'])
+        features = stft_features(stft, sr, missing, n_mfcc=params['n_mfcc'], n_fft=params['n_fft'])
+        for feature_type, values in features.items():
+            store.save(keys[feature_type], values)
+    return file_hash, missing, time.perf_counter() - started
+
+def extract_features_batch(source, store_dir, feature_types=('mfcc',), sr=None, n_mfcc=13, n_fft=2048,
+                           hop_length=512, workers=None, index_interval=500):
+    """Extracts features for every file of a directory or manifest into a FeatureStore."""
+    for feature_type in feature_types:
+        if feature_type not in FEATURE_TYPES:
+            raise ValueError(f"Invalid feature type: {feature_type}")
+    params = {'sr': sr, 'n_fft': n_fft, 'hop_length': hop_length, 'n_mfcc': n_mfcc}
+    store = FeatureStore(store_dir)
+    index = store.load_index()
+    summary = {'files': 0, 'skipped': 0, 'extracted': 0, 'failed': 0, 'seconds': 0.0}
+    started = time.perf_counter()
+
+    pending = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        for input_file in list_audio_files(source):
+            summary['files'] += 1
+            try:
+                stat = os.stat(input_file)
+            except OSError as e:
+                print(f"Skipping {input_file}: {e}")
+                summary['failed'] += 1
+                continue
+            # The content hash is reused while size and modification time are unchanged
+            entry = index.get(os.path.abspath(input_file))
+            file_hash = entry['sha256'] if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns else None
+            if file_hash and all(store.has(store.key(file_hash, f, params)) for f in feature_types):
+                summary['skipped'] += 1
+                continue
+            future = pool.submit(extract_clip_features, input_file, store, tuple(feature_types), params, file_hash)
+            pending[future] = (input_file, stat)
+
+        try:
+            for done, future in enumerate(concurrent.futures.as_completed(pending), 1):
+                input_file, stat = pending[future]
+                try:
+                    file_hash, missing, seconds = future.result()
+                except Exception as e:
+                    print(f"Error extracting features from {input_file}: {e}")
+                    summary['failed'] += 1
+                    continue
+                index[os.path.abspath(input_file)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                                      'sha256': file_hash}
+                if missing:
+                    summary['extracted'] += 1
+                else:
+                    summary['skipped'] += 1  # Renamed or touched, but the content was already known
+                if done % index_interval == 0:
+                    store.save_index(index)
+        finally:
+            store.save_index(index)
+
+    summary['seconds'] = time.perf_counter() - started
+    return summary
+
+# Batch Processing
+#
+# A pipeline such as "denoise noise=noise.wav | echo delay=0.3 | flac" is applied to
+# every input file in a process pool sized to the cores. Each step streams file to file
+# (intermediates are float WAVs next to the output), so a job's memory is bounded by the
+# block size rather than the file length; jobs are only started while their estimated
+# working set fits in the memory budget. Outputs are written under a temporary name and
+# renamed when complete, so an existing output is always whole and re-runs skip it.
+
+BATCH_OPERATIONS = ('denoise', 'reverb', 'echo', 'distortion')
+@functools.lru_cache(maxsize=None)
+def output_formats():
+    return tuple(name.lower() for name in sf.available_formats())
+
+def parse_value(value):
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            pass
+    return value
+
+def parse_pipeline(pipeline):
+    """Parses "op key=value ... | op ... | format" into ([(op, params)], format or None)."""
+    steps, target_format = [], None
+    for index, step in enumerate(part.split() for part in pipeline.split('|')):
+        if not step:
+            raise ValueError("Empty pipeline step.")
+        name, params = step[0].lower(), {}
+        for argument in step[1:]:
+            key, separator, value = argument.partition('=')
+            if not separator:
+                raise ValueError(f"Expected key=value, got '{argument}' in step '{name}'.")
+            params[key] = parse_value(value)
+        if name in output_formats() and name not in BATCH_OPERATIONS:
+            if index != pipeline.count('|'):
+                raise ValueError(f"Output format '{name}' must be the last step.")
+            target_format = name
+        elif name in BATCH_OPERATIONS:
+            if name == 'denoise' and 'noise' not in params:
+                raise ValueError("denoise needs a noise=<file> parameter.")
+            steps.append((name, params))
+        else:
+            raise ValueError(f"Unknown pipeline step '{name}'.")
+    return steps, target_format
+
+def run_operation(name, input_file, output_file, params, subtype=None):
+    if name == 'denoise':
+        params = dict(params)
+        denoise_file(input_file, params.pop('noise'), output_file, subtype=subtype, **params)
+    else:
+        apply_effect_file(input_file, output_file, name, subtype=subtype, **params)
+
+def estimate_job_memory(input_file, steps, block_size=DEFAULT_BLOCK_SIZE):
+    """Rough peak bytes of one job: a float block with margins and its STFT working copies."""
+    info = sf.info(input_file)
+    samples = min(info.frames, block_size) * info.channels
+    # Decoded block, mono copy, complex STFT (~2x float32 per sample) and the processed output
+    return samples * 4 * (12 if steps else 2)
+
+def process_batch_file(input_file, output_file, steps, target_format=None, subtype=None):
+    """Pool worker: runs the pipeline on one file and returns (seconds, [(step, seconds)])."""
+    started = time.perf_counter()
+    directory, name = os.path.split(output_file)
+    os.makedirs(directory or '.', exist_ok=True)
+    base, extension = os.path.splitext(name)
+    # soundfile picks the container from the extension, so the temporary name keeps it
+    partial = os.path.join(directory, f".{base}.{os.getpid()}.partial{extension}")
+    intermediates = []
+    timings = []
+    try:
+        current = input_file
+        for index, (operation, params) in enumerate(steps):
+            if index == len(steps) - 1:
+                target, step_subtype = partial, subtype
+            else:
+                descriptor, target = tempfile.mkstemp(suffix='.wav', prefix=f".{base}.", dir=directory or '.')
+                os.close(descriptor)
+                intermediates.append(target)
+                step_subtype = 'FLOAT'
+            step_started = time.perf_counter()
+            run_operation(operation, current, target, params, subtype=step_subtype)
+            timings.append((operation, time.perf_counter() - step_started))
+            current = target
+        if not steps:
+            step_started = time.perf_counter()
+            if not convert_audio_format(input_file, partial, (target_format or extension[1:]).upper()):
+                raise RuntimeError("format conversion failed")
+            timings.append((target_format or extension[1:], time.perf_counter() - step_started))
+        os.replace(partial, output_file)
+    finally:
+        for path in intermediates + [partial]:
+            if os.path.exists(path):
+                os.remove(path)
+    return time.perf_counter() - started, timings
+
+def batch_output_path(input_file, input_root, output_dir, target_format=None):
+    relative = os.path.relpath(os.path.abspath(input_file), input_root)
+    if target_format:
+        relative = os.path.splitext(relative)[0] + '.' + target_format
+    return os.path.join(output_dir, relative)
+
+def process_batch(files, output_dir, pipeline, workers=None, max_memory=None, overwrite=False, subtype=None):
+    """Runs a pipeline over many files in parallel; returns per-file results and a summary."""
+    steps, target_format = parse_pipeline(pipeline)
+    if not files:
+        return [], {'files': 0, 'processed': 0, 'skipped': 0, 'failed': 0, 'seconds': 0.0}
+    workers = workers or os.cpu_count() or 1
+    input_root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+    results = []
+    summary = {'files': len(files), 'processed': 0, 'skipped': 0, 'failed': 0, 'seconds': 0.0}
+    started = time.perf_counter()
+
+    jobs = []
+    for input_file in files:
+        output_file = batch_output_path(input_file, input_root, output_dir, target_format)
+        if not overwrite and os.path.exists(output_file):
+            summary['skipped'] += 1
+            continue
+        try:
+            memory = estimate_job_memory(input_file, steps)
+        except Exception as e:
+            print(f"Skipping {input_file}: {e}")
+            summary['failed'] += 1
+            results.append({'input': input_file, 'output': output_file, 'error': str(e)})
+            continue
+        jobs.append((input_file, output_file, memory))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        in_use = 0
+        jobs.reverse()  # Popped from the end, so files run in input order
+        while jobs or pending:
+            # Start jobs while workers are free and the memory budget allows (always at least one)
+            while jobs and len(pending) < workers and (
+                    not pending or max_memory is None or in_use + jobs[-1][2] <= max_memory):
+                input_file, output_file, memory = jobs.pop()
+                future = pool.submit(process_batch_file, input_file, output_file, steps, target_format, subtype)
+                pending[future] = (input_file, output_file, memory)
+                in_use += memory
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                input_file, output_file, memory = pending.pop(future)
+                in_use -= memory
+                result = {'input': input_file, 'output': output_file}
+                try:
+                    result['seconds'], result['steps'] = future.result()
+                    summary['processed'] += 1
+                    steps_text = ', '.join(f"{step} {seconds:.2f} s" for step, seconds in result['steps'])
+                    print(f"[{summary['processed'] + summary['failed']}/{summary['files'] - summary['skipped']}] "
+                          f"{input_file}: {result['seconds']:.2f} s ({steps_text})")
+                except Exception as e:
+                    result['error'] = str(e)
+                    summary['failed'] += 1
+                    print(f"Error processing {input_file}: {e}")
+                results.append(result)
+
+    summary['seconds'] = time.perf_counter() - started
+    return results, summary
+
+# Spectrogram Export
+#
+# Spectrograms are rendered straight to PNG without matplotlib: STFT magnitudes are
+# max-pooled down to the requested image size while streaming through the file, turned
+# into dB relative to the loudest bin (as amplitude_to_db with top_db) and mapped through
+# a 256-entry colour lookup table. Only the pooled image is held in memory, so a preview
+# of an hour-long file costs one STFT pass. Full-resolution renders of long files can be
+# split into tiles; the loudest bin is then found in a first pass so all tiles share one
+# colour scale.
+
+# matplotlib's colormaps sampled at 17 evenly spaced points (interpolated to 256 entries)
+COLORMAPS = {
+    'magma': [(0, 0, 4), (10, 8, 34), (29, 17, 71), (54, 16, 107), (81, 18, 124), (106, 28, 129),
+              (131, 38, 129), (156, 46, 127), (183, 55, 121), (208, 65, 111), (231, 82, 99), (245, 107, 92),
+              (252, 137, 97), (254, 167, 114), (254, 196, 136), (253, 226, 163), (252, 253, 191)],
+    'viridis': [(68, 1, 84), (72, 24, 106), (71, 45, 123), (66, 64, 134), (59, 82, 139), (51, 99, 141),
+                (44, 114, 142), (38, 130, 142), (33, 145, 140), (31, 160, 136), (40, 174, 128), (63, 188, 115),
+                (94, 201, 98), (132, 212, 75), (173, 220, 48), (216, 226, 25), (253, 231, 37)],
+    'inferno': [(0, 0, 4), (11, 7, 36), (33, 12, 74), (61, 9, 101), (87, 16, 110), (113, 25, 110),
+                (138, 34, 106), (163, 44, 97), (188, 55, 84), (210, 70, 68), (228, 90, 49), (241, 115, 29),
+                (249, 142, 9), (252, 172, 17), (249, 203, 53), (242, 234, 105), (252, 255, 164)],
+    'gray': [(0, 0, 0), (255, 255, 255)],
+}
+
+@functools.lru_cache(maxsize=None)
+def colormap_lut(name='magma'):
+    """256 x 3 uint8 colour lookup table."""
+    if name not in COLORMAPS:
+        raise ValueError(f"Unknown colormap '{name}' (choose from {', '.join(COLORMAPS)}).")
+    points = np.array(COLORMAPS[name], dtype=np.float64)
+    positions = np.linspace(0, 1, len(points))
+    levels = np.linspace(0, 1, 256)
+    lut = np.stack([np.interp(levels, positions, points[:, channel]) for channel in range(3)], axis=1)
+    lut = np.round(lut).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+def pool_starts(length, size=None):
+    """First index of each of `size` nearly equal groups of `length` items (no pooling if size >= length)."""
+    if size is None or size >= length:
+        return np.arange(length)
+    # Item i lands in group i * size // length, so group j starts at ceil(j * length / size)
+    return -(-np.arange(size) * length // size)
+
+def magnitude_to_image(magnitude, peak, top_db=80.0, cmap='magma'):
+    """Maps a (bins, frames) magnitude array to an RGB image with low frequencies at the bottom."""
+    floor_db = 20 * np.log10(max(peak, 1e-5)) - top_db
+    levels = (20 * np.log10(np.maximum(magnitude, 1e-5)) - floor_db) * (255 / top_db)
+    index = np.clip(levels, 0, 255).astype(np.uint8)
+    return Image.fromarray(colormap_lut(cmap)[index[::-1]])
+
+def save_png(image, output_file):
+    temporary = f"{output_file}.{os.getpid()}.partial"
+    image.save(temporary, format='PNG')
+    os.replace(temporary, output_file)
+
+def spectrogram_image(audio, n_fft=2048, hop_length=512, width=None, height=None, top_db=80.0, cmap='magma'):
+    """Renders an in-memory signal's spectrogram as a PIL image."""
+    if not available(Image):
+        raise RuntimeError("Pillow is required for spectrogram export.")
+    magnitude = np.abs(librosa.stft(audio, n_fft=n_fft, hop_length=hop_length))
+    pooled = np.maximum.reduceat(magnitude, pool_starts(magnitude.shape[0], height), axis=0)
+    pooled = np.maximum.reduceat(pooled, pool_starts(pooled.shape[1], width), axis=1)
+    return magnitude_to_image(pooled, magnitude.max(), top_db, cmap)
+
+def spectrogram_columns(input_file, n_fft=2048, hop_length=512, width=None, height=None,
+                        block_size=DEFAULT_BLOCK_SIZE):
+    """Yields a file's magnitude spectrogram, max-pooled to width x height, a few columns at a time."""
+    total = 1 + sf.info(input_file).frames // hop_length  # Frames of a centred STFT
+    rows = pool_starts(1 + n_fft // 2, height)
+    pooling = width is not None and width < total
+    first_frame = 0
+    carry, carry_column = None, None  # Last column of a block may continue in the next one
+    for stft in stft_blocks(input_file, n_fft, hop_length, block_size):
+        if not stft.shape[1]:
+            continue
+        frames = np.arange(first_frame, first_frame + stft.shape[1])
+        first_frame += stft.shape[1]
+        columns = frames * width // total if pooling else frames
+        starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+        pooled = np.maximum.reduceat(np.maximum.reduceat(np.abs(stft), rows, axis=0), starts, axis=1)
+        if carry is not None:
+            if columns[0] == carry_column:
+                np.maximum(pooled[:, 0], carry, out=pooled[:, 0])
+            else:
+                yield carry[:, None]
+        if pooled.shape[1] > 1:
+            yield pooled[:, :-1]
+        carry, carry_column = pooled[:, -1], columns[-1]
+    if carry is not None:
+        yield carry[:, None]
+
+def spectrogram_file(input_file, output_file, width=None, height=None, tile_width=None, n_fft=2048, hop_length=512,
+                     top_db=80.0, cmap='magma', block_size=DEFAULT_BLOCK_SIZE):
+    """Renders a file's spectrogram to a PNG, or with tile_width to a directory of numbered PNG tiles."""
+    if not available(Image):
+        raise RuntimeError("Pillow is required for spectrogram export.")
+    columns = lambda: spectrogram_columns(input_file, n_fft, hop_length, width, height, block_size)
+    if not tile_width:
+        # Max pooling keeps the loudest bin, so the pooled image gives the peak directly
+        pooled = np.concatenate(list(columns()), axis=1)
+        save_png(magnitude_to_image(pooled, pooled.max(), top_db, cmap), output_file)
+        return [output_file]
+
+    peak = max(block.max() for block in columns())
+    # Tiles are written to a scratch directory that is renamed into place when complete
+    partial = f"{output_file}.{os.getpid()}.partial"
+    os.makedirs(partial, exist_ok=True)
+    names = []
+    def write_tile(tile):
+        names.append(f"{len(names):04d}.png")
+        magnitude_to_image(tile, peak, top_db, cmap).save(os.path.join(partial, names[-1]), format='PNG')
+    pending = []
+    pending_width = 0
+    for block in columns():
+        pending.append(block)
+        pending_width += block.shape[1]
+        if pending_width >= tile_width:
+            joined = np.concatenate(pending, axis=1)
+            for start in range(0, joined.shape[1] - tile_width + 1, tile_width):
+                write_tile(joined[:, start:start + tile_width])
+            remainder = joined[:, joined.shape[1] // tile_width * tile_width:]
+            pending, pending_width = [remainder], remainder.shape[1]
+    if pending_width:
+        write_tile(np.concatenate(pending, axis=1))
+    if os.path.isdir(output_file):
+        shutil.rmtree(output_file)
+    os.replace(partial, output_file)
+    return [os.path.join(output_file, name) for name in names]
+
+def render_spectrograms(files, output_dir, workers=None, overwrite=False, **params):
+    """Renders spectrograms of many files in a process pool; returns (rendered, skipped, failed)."""
+    input_root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files]) if files else ''
+    rendered, skipped, failed = 0, 0, 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        for input_file in files:
+            output_file = batch_output_path(input_file, input_root, output_dir, 'png')
+            if params.get('tile_width'):
+                output_file = os.path.splitext(output_file)[0]  # Directory of tiles
+            if not overwrite and os.path.exists(output_file):
+                skipped += 1
+                continue
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            pending[pool.submit(spectrogram_file, input_file, output_file, **params)] = input_file
+        for future in concurrent.futures.as_completed(pending):
+            try:
+                future.result()
+                rendered += 1
+            except Exception as e:
+                print(f"Error rendering spectrogram of {pending[future]}: {e}")
+                failed += 1
+    return rendered, skipped, failed
+
+# Chunked Speech Recognition
+#
+# Long recordings are cut into utterances at pauses (the split_on_silence approach of
+# to_do_list_application.py, done with NumPy on 10 ms frame levels streamed from the file)
+# and each utterance is recognised in a process pool. Workers read only their own
+# segment, so memory stays flat however long the recording is. Results are yielded in
+# timeline order as soon as every earlier segment is done, so a transcript can be written
+# while later segments are still being recognised.
+
+def frame_levels(input_file, frame_ms=10, block_size=DEFAULT_BLOCK_SIZE):
+    """Mean power per frame of a file, in dBFS, and the frame length in samples."""
+    frame_length = max(1, int(sf.info(input_file).samplerate * frame_ms / 1000))
+    levels = []
+    for segment, _, _ in read_blocks(input_file, aligned(block_size, frame_length)):
+        padded = np.zeros(aligned(len(segment), frame_length), dtype=np.float32)
+        padded[:len(segment)] = segment
+        power = np.mean(np.square(padded.reshape(-1, frame_length), dtype=np.float64), axis=1)
+        levels.append(10 * np.log10(np.maximum(power, 1e-10)))
+    return (np.concatenate(levels) if levels else np.zeros(0)), frame_length
+
+def split_on_silence(input_file, min_silence_len=500, silence_thresh=None, keep_silence=200, max_segment_len=30000,
+                     frame_ms=10):
+    """(start, end) sample ranges of the non-silent parts of a file, lengths in ms like pydub's.
+
+    silence_thresh is in dBFS; by default it is 16 dB below the file's average level.
+    Parts longer than max_segment_len are cut into equal pieces of at most that length.
+    """
+    levels, frame_length = frame_levels(input_file, frame_ms)
+    total = sf.info(input_file).frames
+    if not len(levels):
+        return []
+    if silence_thresh is None:
+        silence_thresh = 10 * np.log10(max(np.mean(10 ** (levels / 10)), 1e-10)) - 16
+    silent = np.r_[True, levels < silence_thresh, True]
+
+    # Runs of silent frames long enough to separate utterances
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))  # Alternating speech starts and ends
+    starts, ends = edges[0::2], edges[1::2]
+    min_gap = max(1, int(round(min_silence_len / frame_ms)))
+    keep = np.r_[True, starts[1:] - ends[:-1] >= min_gap]  # Merge speech separated by short pauses
+    starts = starts[keep]
+    ends = np.r_[ends[:-1][keep[1:]], ends[-1:]] if len(ends) else ends
+
+    padding = int(keep_silence * frame_length / frame_ms)
+    max_length = int(max_segment_len * frame_length / frame_ms) if max_segment_len else 0
+    segments = []
+    for start, end in zip(starts * frame_length, np.minimum(ends * frame_length, total)):
+        start, end = max(0, start - padding), min(total, end + padding)
+        pieces = -(-(end - start) // max_length) if max_length else 1
+        bounds = np.linspace(start, end, pieces + 1).astype(int)
+        segments.extend(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+    return segments
+
+def recognize_segment(input_file, start, end, engine='sphinx', language='en-US'):
+    """Pool worker: runs an offline SpeechRecognition engine on one segment of a file."""
+    with sf.SoundFile(input_file) as f:
+        f.seek(start)
+        samples = to_mono(f.read(end - start, dtype='float32', always_2d=True))
+        sample_rate = f.samplerate
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes()
+    recognizer = sr.Recognizer()
+    audio = sr.AudioData(pcm, sample_rate, 2)
+    try:
+        if engine == 'sphinx':
+            return recognizer.recognize_sphinx(audio, language=language)
+        return getattr(recognizer, f"recognize_{engine}")(audio)
+    except sr.UnknownValueError:
+        return ""
+
+def transcribe_file(input_file, engine='sphinx', language='en-US', workers=None, **silence):
+    """Yields (start seconds, end seconds, text) per segment, in order, as recognition finishes."""
+    if not available(sr):
+        raise RuntimeError("SpeechRecognition is required for transcription.")
+    sample_rate = sf.info(input_file).samplerate
+    segments = split_on_silence(input_file, **silence)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(recognize_segment, input_file, start, end, engine, language) for start, end in segments]
+        # Results come back in any order; each is released once all earlier ones are in
+        for (start, end), future in zip(segments, futures):
+            try:
+                text = future.result().strip()
+            except sr.RequestError as e:
+                if engine == 'sphinx':
+                    # Missing PocketSphinx or language model: no segment can succeed
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                # An online engine's request failed: lose this segment, not the file
+                print(f"Error transcribing {format_timestamp(start / sample_rate)}-"
+                      f"{format_timestamp(end / sample_rate)}: {e}")
+                text = ""
+            yield start / sample_rate, end / sample_rate, text
+
+def format_timestamp(seconds):
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes // 60):02d}:{int(minutes % 60):02d}:{seconds:05.2f}"
+
 # Real-Time Audio Processing (PyAudio)
+#
+# Effects are stateful blocks in a chain. Every buffer is allocated when the chain is
+# built, so processing a block inside the audio callback allocates nothing; delay lines
+# live in ring buffers, so delays longer than one block keep working across blocks.
+# Blocks are (frames, channels) float32 arrays.
+
+class RingBuffer:
+    """Fixed-size circular buffer of (frames, channels) samples."""
+    def __init__(self, capacity, channels=1):
+        self.data = np.zeros((capacity, channels), dtype=np.float32)
+        self.capacity = capacity
+        self.write_position = 0
+
+    def reset(self):
+        self.data.fill(0)
+        self.write_position = 0
+
+    def write(self, block):
+        start = self.write_position
+        first = min(len(block), self.capacity - start)
+        self.data[start:start + first] = block[:first]
+        self.data[:len(block) - first] = block[first:]
+        self.write_position = (start + len(block)) % self.capacity
+
+    def read(self, delay, out):
+        # Copies the len(out) samples that started `delay` samples before the last write
+        start = (self.write_position - len(out) - delay) % self.capacity
+        first = min(len(out), self.capacity - start)
+        out[:first] = self.data[start:start + first]
+        out[first:] = self.data[:len(out) - first]
+        return out
+
+class EchoEffect:
+    """Feed-forward echo (same as add_echo) over a delay line of any length."""
+    def __init__(self, rate, block_size, channels=1, delay=0.2, decay=0.6):
+        self.delay_samples = int(delay * rate)
+        self.decay = decay
+        self.line = RingBuffer(self.delay_samples + block_size, channels)
+        self.delayed = np.zeros((block_size, channels), dtype=np.float32)
+
+    def reset(self):
+        self.line.reset()
+
+    def process(self, block, out):
+        self.line.write(block)
+        delayed = self.line.read(self.delay_samples, self.delayed[:len(block)])
+        np.multiply(delayed, self.decay, out=delayed)
+        np.add(block, delayed, out=out)
+        return out
+
+class ReverbEffect:
+    """ReverbEngine per channel."""
+    def __init__(self, rate, block_size, channels=1, reverb_time=0.5, decay_rate=0.5):
+        self.engines = [ReverbEngine(rate, reverb_time, decay_rate, block_size) for _ in range(channels)]
+
+    def reset(self):
+        for engine in self.engines:
+            engine.reset()
+
+    def process(self, block, out):
+        for channel, engine in enumerate(self.engines):
+            engine.process_block(block[:, channel], out=out[:, channel])
+        return out
+
+class DistortionEffect:
+    """tanh soft clipping (same as add_distortion)."""
+    def __init__(self, rate, block_size, channels=1, drive=5.0):
+        self.drive = drive
+
+    def reset(self):
+        pass
+
+    def process(self, block, out):
+        np.multiply(block, self.drive, out=out)
+        np.tanh(out, out=out)
+        return out
+
+EFFECTS = {'reverb': ReverbEffect, 'echo': EchoEffect, 'distortion': DistortionEffect}
+
+class EffectChain:
+    """Runs effects in order, ping-ponging between two preallocated buffers."""
+    def __init__(self, effects, rate, block_size, channels=1):
+        # effects: [(name, params)], e.g. [('echo', {'delay': 0.5}), ('reverb', {})]
+        self.effects = [EFFECTS[name](rate, block_size, channels, **params)
+                        for name, params in effects if name in EFFECTS]
+        self.buffers = [np.zeros((block_size, channels), dtype=np.float32) for _ in range(2)]
+
+    def reset(self):
+        for effect in self.effects:
+            effect.reset()
+
+    def process(self, block, out):
+        source = block
+        for index, effect in enumerate(self.effects):
+            target = out if index == len(self.effects) - 1 else self.buffers[index % 2]
+            source = effect.process(source, target)
+        if source is not out:
+            np.copyto(out, source)
+        np.clip(out, -1, 1, out=out)  # Keep the output within the valid range [-1, 1]
+        return out
 
 class RealTimeProcessor:
-    def __init__(self, chunk=1024, format=pyaudio.paFloat32, channels=1, rate=44100):
+    def __init__(self, chunk=1024, format=None, channels=1, rate=44100):
         self.chunk = chunk
-        self.format = format
+        self.format = format  # paFloat32 unless given, resolved when the stream opens
         self.channels = channels
         self.rate = rate
         self.p = None
         self.stream = None
         self.running = False
-        self.queue = queue.Queue()
-        self.effect = None  # Store the chosen effect
-        self.effect_params = {} # Store effect parameters
+        self.chain = EffectChain([], rate, chunk, channels)
+        self.output = np.zeros((chunk, channels), dtype=np.float32)
+        self.reset_stats()
 
     def set_effect(self, effect_name, effect_params):
-         self.effect = effect_name
-         self.effect_params = effect_params
+        self.set_effects([(effect_name, effect_params)])
+
+    def set_effects(self, effects):
+        # The chain is built outside the callback and swapped in with one assignment
+        self.chain = EffectChain(effects, self.rate, self.chunk, self.channels)
+
+    def reset_stats(self):
+        self.blocks = 0
+        self.input_overflows = 0
+        self.output_underflows = 0
+        self.deadline_misses = 0  # Blocks that took longer than chunk / rate to process
+        self.processing_time = 0.0
+        self.max_processing_time = 0.0
+        self.latency = 0.0  # Input ADC to output DAC time of the last block
+        self.max_latency = 0.0
+
+    def stats(self):
+        budget = self.chunk / self.rate
+        return {
+            'blocks': self.blocks,
+            'xruns': self.input_overflows + self.output_underflows,
+            'input_overflows': self.input_overflows,
+            'output_underflows': self.output_underflows,
+            'deadline_misses': self.deadline_misses,
+            'budget_ms': budget * 1000,
+            'mean_processing_ms': self.processing_time / self.blocks * 1000 if self.blocks else 0.0,
+            'max_processing_ms': self.max_processing_time * 1000,
+            'latency_ms': self.latency * 1000,
+            'max_latency_ms': self.max_latency * 1000,
+        }
+
+    def process_block(self, block):
+        # Runs the chain on one (chunk, channels) block and updates the counters
+        started = time.perf_counter()
+        self.chain.process(block, self.output)
+        elapsed = time.perf_counter() - started
+        self.blocks += 1
+        self.processing_time += elapsed
+        if elapsed > self.max_processing_time:
+            self.max_processing_time = elapsed
+        if elapsed > self.chunk / self.rate:
+            self.deadline_misses += 1
+        return self.output
 
     def start(self):
-        if pyaudio is None:
+        if not available(pyaudio):
             print("PyAudio is not available. Real-time processing cannot start.")
             return
-        
+
+        self.reset_stats()
+        self.chain.reset()
         self.p = pyaudio.PyAudio()
-        self.stream = self.p.open(format=self.format,
+        self.stream = self.p.open(format=self.format if self.format is not None else pyaudio.paFloat32,
                                 channels=self.channels,
                                 rate=self.rate,
                                 input=True,
                                 output=True,
+                                frames_per_buffer=self.chunk,
                                 stream_callback=self.callback)
         self.running = True
-        threading.Thread(target=self.process_audio, daemon=True).start()
 
     def stop(self):
         if self.stream:
@@ -195,297 +1201,402 @@ class RealTimeProcessor:
             self.p.terminate()
 
     def callback(self, in_data, frame_count, time_info, status):
+        # Processing happens here, in the audio thread; the returned buffer is what plays
         try:
-            data = np.frombuffer(in_data, dtype=np.float32)
-            self.queue.put(data)
-            return (in_data, pyaudio.paContinue)  # Pass-through initially
+            if status & pyaudio.paInputOverflow:
+                self.input_overflows += 1
+            if status & pyaudio.paOutputUnderflow:
+                self.output_underflows += 1
+            if time_info:
+                self.latency = time_info.get('output_buffer_dac_time', 0) - time_info.get('input_buffer_adc_time', 0)
+                self.max_latency = max(self.max_latency, self.latency)
+            block = np.frombuffer(in_data, dtype=np.float32).reshape(frame_count, self.channels)
+            return (self.process_block(block).tobytes(), pyaudio.paContinue)
         except Exception as e:
             print(f"Callback error: {e}")
             return (None, pyaudio.paAbort)
 
-    def process_audio(self):
-        while self.running:
-            try:
-                data = self.queue.get(timeout=0.1) # Non-blocking get with timeout
-
-                if self.effect == 'reverb':
-                    processed_data = add_reverb(data, self.rate, reverb_time=self.effect_params.get('reverb_time', 0.5), decay_rate=self.effect_params.get('decay_rate', 0.5))
-                elif self.effect == 'echo':
-                    processed_data = add_echo(data, self.rate, delay=self.effect_params.get('delay', 0.2), decay=self.effect_params.get('decay', 0.6))
-                elif self.effect == 'distortion':
-                     processed_data = add_distortion(data, drive=self.effect_params.get('drive', 5.0))
-                else:
-                    processed_data = data # No effect
-
-                # Ensure output data is within the valid range [-1, 1]
-                processed_data = np.clip(processed_data, -1, 1).astype(np.float32)
-
-                # Stream the processed audio back
-                self.stream.write(processed_data.tobytes())
-
-            except queue.Empty:
-                pass # No data available yet
-
-            except Exception as e:
-                print(f"Processing error: {e}")
-                break
+    def run_offline(self, input_file, output_file):
+        """Drives the effect chain from a file instead of the sound card (no audio hardware needed)."""
+        self.reset_stats()
+        self.chain.reset()
+        with sf.SoundFile(input_file) as source:
+            if source.channels != self.channels or source.samplerate != self.rate:
+                raise ValueError(f"Expected {self.channels} channel(s) at {self.rate} Hz, "
+                                 f"got {source.channels} at {source.samplerate} Hz")
+            with sf.SoundFile(output_file, 'w', samplerate=self.rate, channels=self.channels, subtype='FLOAT') as target:
+                block = np.zeros((self.chunk, self.channels), dtype=np.float32)
+                while True:
+                    frames = source.read(out=block)
+                    if len(frames) == 0:
+                        break
+                    if len(frames) < self.chunk:
+                        block[len(frames):] = 0  # Last block is zero padded, as a sound card would
+                    target.write(self.process_block(block)[:len(frames)])
+        return self.stats()
 
 # GUI (Tkinter)
 
-if GUI_ENABLED:
-    class AudioProcessorGUI:
-        def __init__(self, master):
-            self.master = master
-            master.title("Advanced Audio Processor")
-
-            self.input_file = tk.StringVar()
-            self.output_file = tk.StringVar()
-            self.noise_file = tk.StringVar()
-            self.selected_effect = tk.StringVar(value="None")
-            self.realtime_processor = RealTimeProcessor()
-
-            # Input File Selection
-            ttk.Label(master, text="Input File:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-            ttk.Entry(master, textvariable=self.input_file, width=50).grid(row=0, column=1, padx=5, pady=5)
-            ttk.Button(master, text="Browse", command=self.browse_input_file).grid(row=0, column=2, padx=5, pady=5)
-
-            # Output File Selection
-            ttk.Label(master, text="Output File:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
-            ttk.Entry(master, textvariable=self.output_file, width=50).grid(row=1, column=1, padx=5, pady=5)
-            ttk.Button(master, text="Browse", command=self.browse_output_file).grid(row=1, column=2, padx=5, pady=5)
-
-            # Noise File Selection (for noise reduction)
-            ttk.Label(master, text="Noise File:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
-            ttk.Entry(master, textvariable=self.noise_file, width=50).grid(row=2, column=1, padx=5, pady=5)
-            ttk.Button(master, text="Browse", command=self.browse_noise_file).grid(row=2, column=2, padx=5, pady=5)
-
-            # Audio Processing Buttons
-            ttk.Button(master, text="Noise Reduction (Spectral)", command=self.process_noise_reduction_spectral).grid(row=3, column=0, columnspan=3, pady=5)
-            ttk.Button(master, text="Noise Reduction (Wiener)", command=self.process_noise_reduction_wiener).grid(row=4, column=0, columnspan=3, pady=5)
-            ttk.Button(master, text="Convert to WAV", command=self.convert_to_wav).grid(row=5, column=0, columnspan=3, pady=5)
-            ttk.Button(master, text="Extract MFCC Features", command=self.extract_mfcc).grid(row=6, column=0, columnspan=3, pady=5)
-            ttk.Button(master, text="Generate Spectrogram", command=self.generate_spectrogram_gui).grid(row=7, column=0, columnspan=3, pady=5)
-            ttk.Button(master, text="Speech to Text", command=self.speech_to_text_gui).grid(row=8, column=0, columnspan=3, pady=5)
-
-            # Audio Synthesis
-            ttk.Button(master, text="Generate Sine Wave", command=self.generate_sine_wave_gui).grid(row=9, column=0, columnspan=3, pady=5)
-
-            # Real-time Audio Processing
-            ttk.Label(master, text="Real-Time Audio Effects:").grid(row=10, column=0, sticky=tk.W, padx=5, pady=5)
-            effects = ["None", "Reverb", "Echo", "Distortion"]
-            self.effect_dropdown = ttk.Combobox(master, textvariable=self.selected_effect, values=effects)
-            self.effect_dropdown.grid(row=10, column=1, padx=5, pady=5)
-            self.effect_dropdown.bind("<<ComboboxSelected>>", self.update_effect_params)
-
-            self.reverb_time_label = ttk.Label(master, text="Reverb Time:")
-            self.reverb_time_entry = ttk.Entry(master, width=10)
-            self.decay_rate_label = ttk.Label(master, text="Decay Rate:")
-            self.decay_rate_entry = ttk.Entry(master, width=10)
-            self.delay_label = ttk.Label(master, text="Delay:")
-            self.delay_entry = ttk.Entry(master, width=10)
-            self.decay_label = ttk.Label(master, text="Decay:")
-            self.decay_entry = ttk.Entry(master, width=10)
-            self.drive_label = ttk.Label(master, text="Drive:")
-            self.drive_entry = ttk.Entry(master, width=10)
-
-            ttk.Button(master, text="Start Real-time Processing", command=self.start_realtime).grid(row=11, column=0, columnspan=3, pady=5)
-            ttk.Button(master, text="Stop Real-time Processing", command=self.stop_realtime).grid(row=12, column=0, columnspan=3, pady=5)
-
-        def browse_input_file(self):
-            filename = filedialog.askopenfilename()
-            self.input_file.set(filename)
-
-        def browse_output_file(self):
-            filename = filedialog.asksaveasfilename(defaultextension=".wav")
-            self.output_file.set(filename)
-
-        def browse_noise_file(self):
-            filename = filedialog.askopenfilename()
-            self.noise_file.set(filename)
-
-        def process_noise_reduction_spectral(self):
-            input_file = self.input_file.get()
-            noise_file = self.noise_file.get()
-            output_file = self.output_file.get()
-            if not (input_file and noise_file and output_file):
-                print("Please select input, noise, and output files.")
-                return
-
-            try:
-                audio, sr = librosa.load(input_file)
-                noise, _ = librosa.load(noise_file, sr=sr)
-                reduced_audio = noise_reduction_spectral_subtraction(audio, noise, sr)
-                sf.write(output_file, reduced_audio, sr)
-                print("Spectral Subtraction Noise Reduction Complete.")
-            except Exception as e:
-                print(f"Error during spectral subtraction: {e}")
+class AudioProcessorGUI:
+    def __init__(self, master):
+        self.master = master
+        master.title("Advanced Audio Processor")
+
+        self.input_file = tk.StringVar()
+        self.output_file = tk.StringVar()
+        self.noise_file = tk.StringVar()
+        self.selected_effect = tk.StringVar(value="None")
+        self.realtime_processor = RealTimeProcessor()
+
+        # Input File Selection
+        ttk.Label(master, text="Input File:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        ttk.Entry(master, textvariable=self.input_file, width=50).grid(row=0, column=1, padx=5, pady=5)
+        ttk.Button(master, text="Browse", command=self.browse_input_file).grid(row=0, column=2, padx=5, pady=5)
+
+        # Output File Selection
+        ttk.Label(master, text="Output File:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        ttk.Entry(master, textvariable=self.output_file, width=50).grid(row=1, column=1, padx=5, pady=5)
+        ttk.Button(master, text="Browse", command=self.browse_output_file).grid(row=1, column=2, padx=5, pady=5)
+
+        # Noise File Selection (for noise reduction)
+        ttk.Label(master, text="Noise File:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
+        ttk.Entry(master, textvariable=self.noise_file, width=50).grid(row=2, column=1, padx=5, pady=5)
+        ttk.Button(master, text="Browse", command=self.browse_noise_file).grid(row=2, column=2, padx=5, pady=5)
+
+        # Audio Processing Buttons
+        ttk.Button(master, text="Noise Reduction (Spectral)", command=self.process_noise_reduction_spectral).grid(row=3, column=0, columnspan=3, pady=5)
+        ttk.Button(master, text="Noise Reduction (Wiener)", command=self.process_noise_reduction_wiener).grid(row=4, column=0, columnspan=3, pady=5)
+        ttk.Button(master, text="Convert to WAV", command=self.convert_to_wav).grid(row=5, column=0, columnspan=3, pady=5)
+        ttk.Button(master, text="Extract MFCC Features", command=self.extract_mfcc).grid(row=6, column=0, columnspan=3, pady=5)
+        ttk.Button(master, text="Generate Spectrogram", command=self.generate_spectrogram_gui).grid(row=7, column=0, columnspan=3, pady=5)
+        ttk.Button(master, text="Speech to Text", command=self.speech_to_text_gui).grid(row=8, column=0, columnspan=3, pady=5)
+
+        # Audio Synthesis
+        ttk.Button(master, text="Generate Sine Wave", command=self.generate_sine_wave_gui).grid(row=9, column=0, columnspan=3, pady=5)
+
+        # Real-time Audio Processing
+        ttk.Label(master, text="Real-Time Audio Effects:").grid(row=10, column=0, sticky=tk.W, padx=5, pady=5)
+        effects = ["None", "Reverb", "Echo", "Distortion"]
+        self.effect_dropdown = ttk.Combobox(master, textvariable=self.selected_effect, values=effects)
+        self.effect_dropdown.grid(row=10, column=1, padx=5, pady=5)
+        self.effect_dropdown.bind("<<ComboboxSelected>>", self.update_effect_params)
+
+        self.reverb_time_label = ttk.Label(master, text="Reverb Time:")
+        self.reverb_time_entry = ttk.Entry(master, width=10)
+        self.decay_rate_label = ttk.Label(master, text="Decay Rate:")
+        self.decay_rate_entry = ttk.Entry(master, width=10)
+        self.delay_label = ttk.Label(master, text="Delay:")
+        self.delay_entry = ttk.Entry(master, width=10)
+        self.decay_label = ttk.Label(master, text="Decay:")
+        self.decay_entry = ttk.Entry(master, width=10)
+        self.drive_label = ttk.Label(master, text="Drive:")
+        self.drive_entry = ttk.Entry(master, width=10)
+
+        ttk.Button(master, text="Start Real-time Processing", command=self.start_realtime).grid(row=11, column=0, columnspan=3, pady=5)
+        ttk.Button(master, text="Stop Real-time Processing", command=self.stop_realtime).grid(row=12, column=0, columnspan=3, pady=5)
+
+    def browse_input_file(self):
+        filename = filedialog.askopenfilename()
+        self.input_file.set(filename)
+
+    def browse_output_file(self):
+        filename = filedialog.asksaveasfilename(defaultextension=".wav")
+        self.output_file.set(filename)
+
+    def browse_noise_file(self):
+        filename = filedialog.askopenfilename()
+        self.noise_file.set(filename)
+
+    def process_noise_reduction_spectral(self):
+        input_file = self.input_file.get()
+        noise_file = self.noise_file.get()
+        output_file = self.output_file.get()
+        if not (input_file and noise_file and output_file):
+            print("Please select input, noise, and output files.")
+            return
 
-        def process_noise_reduction_wiener(self):
-            input_file = self.input_file.get()
-            noise_file = self.noise_file.get()
-            output_file = self.output_file.get()
-            if not (input_file and noise_file and output_file):
-                print("Please select input, noise, and output files.")
-                return
+        try:
+            denoise_file(input_file, noise_file, output_file, method='spectral')
+            print("Spectral Subtraction Noise Reduction Complete.")
+        except Exception as e:
+            print(f"Error during spectral subtraction: {e}")
+
+    def process_noise_reduction_wiener(self):
+        input_file = self.input_file.get()
+        noise_file = self.noise_file.get()
+        output_file = self.output_file.get()
+        if not (input_file and noise_file and output_file):
+            print("Please select input, noise, and output files.")
+            return
 
-            try:
-                audio, sr = librosa.load(input_file)
-                noise, _ = librosa.load(noise_file, sr=sr)
-                reduced_audio = noise_reduction_wiener(audio, noise, sr)
-                sf.write(output_file, reduced_audio, sr)
-                print("Wiener Filter Noise Reduction Complete.")
-            except Exception as e:
-                print(f"Error during Wiener filtering: {e}")
+        try:
+            denoise_file(input_file, noise_file, output_file, method='wiener')
+            print("Wiener Filter Noise Reduction Complete.")
+        except Exception as e:
+            print(f"Error during Wiener filtering: {e}")
 
-        def convert_to_wav(self):
-            input_file = self.input_file.get()
-            output_file = self.output_file.get()
-            if not (input_file and output_file):
-                print("Please select input and output files.")
-                return
+    def convert_to_wav(self):
+        input_file = self.input_file.get()
+        output_file = self.output_file.get()
+        if not (input_file and output_file):
+            print("Please select input and output files.")
+            return
 
-            if convert_audio_format(input_file, output_file, 'WAV'):
-                print("Audio format conversion to WAV complete.")
-            else:
-                print("Audio format conversion failed.")
+        if convert_audio_format(input_file, output_file, 'WAV'):
+            print("Audio format conversion to WAV complete.")
+        else:
+            print("Audio format conversion failed.")
 
-        def extract_mfcc(self):
-            input_file = self.input_file.get()
-            if not input_file:
-                print("Please select an input file.")
-                return
+    def extract_mfcc(self):
+        input_file = self.input_file.get()
+        if not input_file:
+            print("Please select an input file.")
+            return
 
-            try:
-                audio, sr = librosa.load(input_file)
-                mfccs = extract_features(audio, sr, feature_type='mfcc')
-                print("MFCC Feature Extraction Complete.")
-                print("MFCC shape:", mfccs.shape)
-            except Exception as e:
-                print(f"Error during MFCC extraction: {e}")
+        try:
+            mfccs = extract_features_file(input_file, feature_type='mfcc')
+            print("MFCC Feature Extraction Complete.")
+            print("MFCC shape:", mfccs.shape)
+        except Exception as e:
+            print(f"Error during MFCC extraction: {e}")
 
-        def generate_spectrogram_gui(self):
-            input_file = self.input_file.get()
-            output_file = self.output_file.get()
-            if not (input_file and output_file):
-                print("Please select input and output files.")
-                return
+    def generate_spectrogram_gui(self):
+        input_file = self.input_file.get()
+        output_file = self.output_file.get()
+        if not (input_file and output_file):
+            print("Please select input and output files.")
+            return
 
-            try:
+        try:
+            if available(Image):
+                spectrogram_file(input_file, output_file)
+            else:
                 audio, sr = librosa.load(input_file)
                 generate_spectrogram(audio, sr, output_file)
-                print("Spectrogram generation complete.")
-            except Exception as e:
-                print(f"Error during spectrogram generation: {e}")
+            print("Spectrogram generation complete.")
+        except Exception as e:
+            print(f"Error during spectrogram generation: {e}")
 
-        def speech_to_text_gui(self):
-            input_file = self.input_file.get()
-            if not input_file:
-                print("Please select an input file.")
-                return
+    def speech_to_text_gui(self):
+        input_file = self.input_file.get()
+        if not input_file:
+            print("Please select an input file.")
+            return
 
-            text = speech_to_text(input_file)
-            if text:
-                print("Speech to Text Output:", text)
-            else:
-                print("Speech to Text Failed.")
+        text = speech_to_text(input_file)
+        if text:
+            print("Speech to Text Output:", text)
+        else:
+            print("Speech to Text Failed.")
 
-        def generate_sine_wave_gui(self):
-            output_file = self.output_file.get()
-            if not output_file:
-                print("Please select an output file.")
-                return
+    def generate_sine_wave_gui(self):
+        output_file = self.output_file.get()
+        if not output_file:
+            print("Please select an output file.")
+            return
 
-            try:
-                frequency = 440  # A4 note
-                duration = 5      # seconds
-                sr = 44100
+        try:
+            frequency = 440  # A4 note
+            duration = 5      # seconds
+            sr = 44100
 
-                sine_wave = generate_sine_wave(frequency, duration, sr)
-                sf.write(output_file, sine_wave, sr)
-                print("Sine wave generation complete.")
-            except Exception as e:
-                print(f"Error during sine wave generation: {e}")
-
-        def start_realtime(self):
-            selected_effect = self.selected_effect.get()
-            effect_params = self.get_effect_params() # Retrieve effect parameters
-
-            self.realtime_processor.set_effect(selected_effect.lower(), effect_params)
-            self.realtime_processor.start()
-            print("Real-time processing started.")
-
-        def stop_realtime(self):
-            self.realtime_processor.stop()
-            print("Real-time processing stopped.")
-
-        def update_effect_params(self, event=None):
-            selected_effect = self.selected_effect.get()
-
-            # Hide existing parameter widgets
-            self.hide_effect_params()
-
-            # Show parameter widgets for the selected effect
-            if selected_effect == "Reverb":
-                self.reverb_time_label.grid(row=13, column=0, sticky=tk.W, padx=5, pady=5)
-                self.reverb_time_entry.grid(row=13, column=1, padx=5, pady=5)
-                self.decay_rate_label.grid(row=14, column=0, sticky=tk.W, padx=5, pady=5)
-                self.decay_rate_entry.grid(row=14, column=1, padx=5, pady=5)
-            elif selected_effect == "Echo":
-                self.delay_label.grid(row=13, column=0, sticky=tk.W, padx=5, pady=5)
-                self.delay_entry.grid(row=13, column=1, padx=5, pady=5)
-                self.decay_label.grid(row=14, column=0, sticky=tk.W, padx=5, pady=5)
-                self.decay_entry.grid(row=14, column=1, padx=5, pady=5)
-            elif selected_effect == "Distortion":
-                self.drive_label.grid(row=13, column=0, sticky=tk.W, padx=5, pady=5)
-                self.drive_entry.grid(row=13, column=1, padx=5, pady=5)
-
-        def hide_effect_params(self):
-            self.reverb_time_label.grid_forget()
-            self.reverb_time_entry.grid_forget()
-            self.decay_rate_label.grid_forget()
-            self.decay_rate_entry.grid_forget()
-            self.delay_label.grid_forget()
-            self.delay_entry.grid_forget()
-            self.decay_label.grid_forget()
-            self.decay_entry.grid_forget()
-            self.drive_label.grid_forget()
-            self.drive_entry.grid_forget()
-
-        def get_effect_params(self):
-            effect_params = {}
-            selected_effect = self.selected_effect.get()
-
-            if selected_effect == "Reverb":
-                try:
-                    effect_params['reverb_time'] = float(self.reverb_time_entry.get()) if self.reverb_time_entry.get() else 0.5
-                    effect_params['decay_rate'] = float(self.decay_rate_entry.get()) if self.decay_rate_entry.get() else 0.5
-                except ValueError:
-                    print("Invalid Reverb parameters. Using defaults.")
-                    effect_params['reverb_time'] = 0.5
-                    effect_params['decay_rate'] = 0.5
-            elif selected_effect == "Echo":
-                try:
-                    effect_params['delay'] = float(self.delay_entry.get()) if self.delay_entry.get() else 0.2
-                    effect_params['decay'] = float(self.decay_entry.get()) if self.decay_entry.get() else 0.6
-                except ValueError:
-                    print("Invalid Echo parameters. Using defaults.")
-                    effect_params['delay'] = 0.2
-                    effect_params['decay'] = 0.6
-            elif selected_effect == "Distortion":
-                try:
-                    effect_params['drive'] = float(self.drive_entry.get()) if self.drive_entry.get() else 5.0
-                except ValueError:
-                    print("Invalid Distortion parameters. Using defaults.")
-                    effect_params['drive'] = 5.0
+            sine_wave = generate_sine_wave(frequency, duration, sr)
+            sf.write(output_file, sine_wave, sr)
+            print("Sine wave generation complete.")
+        except Exception as e:
+            print(f"Error during sine wave generation: {e}")
+
+    def start_realtime(self):
+        selected_effect = self.selected_effect.get()
+        effect_params = self.get_effect_params() # Retrieve effect parameters
+
+        self.realtime_processor.set_effect(selected_effect.lower(), effect_params)
+        self.realtime_processor.start()
+        print("Real-time processing started.")
+
+    def stop_realtime(self):
+        self.realtime_processor.stop()
+        stats = self.realtime_processor.stats()
+        print(f"Real-time processing stopped. {stats['blocks']} blocks, {stats['xruns']} xruns, "
+              f"{stats['deadline_misses']} missed deadlines, processing {stats['mean_processing_ms']:.2f} ms mean / "
+              f"{stats['max_processing_ms']:.2f} ms max of {stats['budget_ms']:.2f} ms, latency {stats['latency_ms']:.1f} ms")
+
+    def update_effect_params(self, event=None):
+        selected_effect = self.selected_effect.get()
+
+        # Hide existing parameter widgets
+        self.hide_effect_params()
+
+        # Show parameter widgets for the selected effect
+        if selected_effect == "Reverb":
+            self.reverb_time_label.grid(row=13, column=0, sticky=tk.W, padx=5, pady=5)
+            self.reverb_time_entry.grid(row=13, column=1, padx=5, pady=5)
+            self.decay_rate_label.grid(row=14, column=0, sticky=tk.W, padx=5, pady=5)
+            self.decay_rate_entry.grid(row=14, column=1, padx=5, pady=5)
+        elif selected_effect == "Echo":
+            self.delay_label.grid(row=13, column=0, sticky=tk.W, padx=5, pady=5)
+            self.delay_entry.grid(row=13, column=1, padx=5, pady=5)
+            self.decay_label.grid(row=14, column=0, sticky=tk.W, padx=5, pady=5)
+            self.decay_entry.grid(row=14, column=1, padx=5, pady=5)
+        elif selected_effect == "Distortion":
+            self.drive_label.grid(row=13, column=0, sticky=tk.W, padx=5, pady=5)
+            self.drive_entry.grid(row=13, column=1, padx=5, pady=5)
+
+    def hide_effect_params(self):
+        self.reverb_time_label.grid_forget()
+        self.reverb_time_entry.grid_forget()
+        self.decay_rate_label.grid_forget()
+        self.decay_rate_entry.grid_forget()
+        self.delay_label.grid_forget()
+        self.delay_entry.grid_forget()
+        self.decay_label.grid_forget()
+        self.decay_entry.grid_forget()
+        self.drive_label.grid_forget()
+        self.drive_entry.grid_forget()
+
+    def get_effect_params(self):
+        effect_params = {}
+        selected_effect = self.selected_effect.get()
+
+        if selected_effect == "Reverb":
+            try:
+                effect_params['reverb_time'] = float(self.reverb_time_entry.get()) if self.reverb_time_entry.get() else 0.5
+                effect_params['decay_rate'] = float(self.decay_rate_entry.get()) if self.decay_rate_entry.get() else 0.5
+            except ValueError:
+                print("Invalid Reverb parameters. Using defaults.")
+                effect_params['reverb_time'] = 0.5
+                effect_params['decay_rate'] = 0.5
+        elif selected_effect == "Echo":
+            try:
+                effect_params['delay'] = float(self.delay_entry.get()) if self.delay_entry.get() else 0.2
+                effect_params['decay'] = float(self.decay_entry.get()) if self.decay_entry.get() else 0.6
+            except ValueError:
+                print("Invalid Echo parameters. Using defaults.")
+                effect_params['delay'] = 0.2
+                effect_params['decay'] = 0.6
+        elif selected_effect == "Distortion":
+            try:
+                effect_params['drive'] = float(self.drive_entry.get()) if self.drive_entry.get() else 5.0
+            except ValueError:
+                print("Invalid Distortion parameters. Using defaults.")
+                effect_params['drive'] = 5.0
 
-            return effect_params
+        return effect_params
 
 # Main Execution
 
-if __name__ == "__main__":
-    if GUI_ENABLED:
+def main():
+    parser = argparse.ArgumentParser(description="Audio processing toolkit (starts the GUI when no command is given)")
+    subparsers = parser.add_subparsers(dest="command")
+
+    features = subparsers.add_parser("features", help="Extract features for a directory or manifest of clips")
+    features.add_argument("source", help="Directory to scan for audio files, or a manifest with one path per line")
+    features.add_argument("-o", "--store", default="features", help="Feature store directory")
+    features.add_argument("-f", "--features", default="mfcc",
+                          help=f"Comma separated features ({', '.join(FEATURE_TYPES)})")
+    features.add_argument("--sr", type=int, default=None, help="Resample clips to this rate (default: native)")
+    features.add_argument("--n-mfcc", type=int, default=13, help="Number of MFCCs")
+    features.add_argument("--n-fft", type=int, default=2048, help="STFT frame length")
+    features.add_argument("--hop-length", type=int, default=512, help="STFT hop length")
+    features.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+
+    batch = subparsers.add_parser("batch", help="Run a processing pipeline over many files in parallel")
+    batch.add_argument("source", help="Directory, glob pattern (quote it) or manifest with one path per line")
+    batch.add_argument("pipeline", help='Steps separated by "|", e.g. "denoise noise=noise.wav | echo delay=0.3 | flac"')
+    batch.add_argument("-o", "--output-dir", default="processed", help="Output directory (input layout is kept)")
+    batch.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    batch.add_argument("--max-memory", type=float, default=None,
+                       help="Memory budget in MB for concurrently decoded files (default: unlimited)")
+    batch.add_argument("--subtype", default=None, help="Output sample format, e.g. PCM_24 or FLOAT")
+    batch.add_argument("--overwrite", action="store_true", help="Reprocess files whose output already exists")
+    batch.add_argument("--report", help="Write per-file timings to this CSV file")
+
+    spectrogram = subparsers.add_parser("spectrogram", help="Render spectrogram PNGs for many files in parallel")
+    spectrogram.add_argument("source", help="Directory, glob pattern (quote it) or manifest with one path per line")
+    spectrogram.add_argument("-o", "--output-dir", default="spectrograms", help="Output directory (input layout is kept)")
+    spectrogram.add_argument("--width", type=int, default=None, help="Image width in pixels (default: one per frame)")
+    spectrogram.add_argument("--height", type=int, default=None, help="Image height in pixels (default: one per bin)")
+    spectrogram.add_argument("--tile-width", type=int, default=None,
+                             help="Split each spectrogram into tiles this wide, written to a directory per file")
+    spectrogram.add_argument("--cmap", default="magma", choices=sorted(COLORMAPS), help="Colormap")
+    spectrogram.add_argument("--top-db", type=float, default=80.0, help="Dynamic range shown, in dB")
+    spectrogram.add_argument("--n-fft", type=int, default=2048, help="STFT frame length")
+    spectrogram.add_argument("--hop-length", type=int, default=512, help="STFT hop length")
+    spectrogram.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    spectrogram.add_argument("--overwrite", action="store_true", help="Re-render files whose output already exists")
+
+    transcribe = subparsers.add_parser("transcribe", help="Transcribe a recording in parallel, segmented at pauses")
+    transcribe.add_argument("input", help="Audio file")
+    transcribe.add_argument("-o", "--output", help="Also write the timestamped transcript to this file")
+    transcribe.add_argument("--engine", default="sphinx", help="Offline SpeechRecognition engine (sphinx, vosk, whisper)")
+    transcribe.add_argument("--language", default="en-US", help="Language for the sphinx engine")
+    transcribe.add_argument("--min-silence", type=int, default=500, help="Pause length (ms) that ends a segment")
+    transcribe.add_argument("--silence-thresh", type=float, default=None,
+                            help="Silence level in dBFS (default: 16 dB below the average level)")
+    transcribe.add_argument("--keep-silence", type=int, default=200, help="Silence (ms) kept around each segment")
+    transcribe.add_argument("--max-segment", type=int, default=30000, help="Longest segment (ms) sent to the engine")
+    transcribe.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if args.command == "transcribe":
+        if not available(sr):
+            parser.error("SpeechRecognition is required for transcription (pip install SpeechRecognition).")
+        output = open(args.output, 'w') if args.output else None
+        try:
+            for start, end, text in transcribe_file(args.input, args.engine, args.language, workers=args.workers,
+                                                    min_silence_len=args.min_silence,
+                                                    silence_thresh=args.silence_thresh,
+                                                    keep_silence=args.keep_silence,
+                                                    max_segment_len=args.max_segment):
+                line = f"[{format_timestamp(start)} --> {format_timestamp(end)}] {text}"
+                print(line, flush=True)
+                if output:
+                    output.write(line + "\n")
+                    output.flush()
+        except sr.RequestError as e:
+            parser.error(f"{args.engine} error; {e}")
+        finally:
+            if output:
+                output.close()
+    elif args.command == "spectrogram":
+        if not available(Image):
+            parser.error("Pillow is required for spectrogram export (pip install Pillow).")
+        started = time.perf_counter()
+        rendered, skipped, failed = render_spectrograms(
+            list_audio_files(args.source), args.output_dir, workers=args.workers, overwrite=args.overwrite,
+            width=args.width, height=args.height, tile_width=args.tile_width, n_fft=args.n_fft,
+            hop_length=args.hop_length, top_db=args.top_db, cmap=args.cmap)
+        print(f"{rendered} rendered, {skipped} already done, {failed} failed in {time.perf_counter() - started:.1f} s")
+    elif args.command == "batch":
+        max_memory = int(args.max_memory * 2 ** 20) if args.max_memory else None
+        try:
+            results, summary = process_batch(list_audio_files(args.source), args.output_dir, args.pipeline,
+                                             workers=args.workers, max_memory=max_memory,
+                                             overwrite=args.overwrite, subtype=args.subtype)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.report:
+            with open(args.report, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['input', 'output', 'seconds', 'steps', 'error'])
+                for result in results:
+                    steps_text = ';'.join(f"{step}={seconds:.3f}" for step, seconds in result.get('steps', []))
+                    seconds = f"{result['seconds']:.3f}" if 'seconds' in result else ''
+                    writer.writerow([result['input'], result['output'], seconds, steps_text, result.get('error', '')])
+        print(f"{summary['files']} files: {summary['processed']} processed, {summary['skipped']} already done, "
+              f"{summary['failed']} failed in {summary['seconds']:.1f} s")
+    elif args.command == "features":
+        feature_types = [f.strip() for f in args.features.split(',') if f.strip()]
+        summary = extract_features_batch(args.source, args.store, feature_types, sr=args.sr, n_mfcc=args.n_mfcc,
+                                         n_fft=args.n_fft, hop_length=args.hop_length, workers=args.workers)
+        print(f"{summary['files']} files: {summary['extracted']} extracted, {summary['skipped']} unchanged, "
+              f"{summary['failed']} failed in {summary['seconds']:.1f} s")
+    elif available(tk):
         root = tk.Tk()
         gui = AudioProcessorGUI(root)
         root.mainloop()
     else:
-        print("GUI is disabled. Please install Tkinter to enable the GUI.")
\ No newline at end of file
+        print("GUI is disabled. Please install Tkinter to enable the GUI.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,185 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import librosa
+import numpy as np
+import scipy.signal
+
+from audio_processor import DEFERRED_IMPORTS, ReverbEngine, noise_reduction_spectral_subtraction, noise_reduction_wiener, reverb_impulse_response
+
+
+def legacy_spectral_subtraction(audio, noise_clip, sr, prop_decrease=1.0):
+    # The frame-by-frame implementation this benchmark compares against (magnitude-only istft)
+    noise_stft = librosa.stft(noise_clip)
+    noise_stft_db = librosa.amplitude_to_db(np.abs(noise_stft), ref=np.max)
+    mean_noise_db = np.mean(noise_stft_db, axis=1)
+
+    audio_stft = librosa.stft(audio)
+    audio_stft_db = librosa.amplitude_to_db(np.abs(audio_stft), ref=np.max)
+
+    reduced_stft_db = np.zeros_like(audio_stft_db)
+    for i in range(audio_stft_db.shape[1]):
+        reduced_stft_db[:, i] = np.maximum(audio_stft_db[:, i] - prop_decrease * mean_noise_db, -80)
+
+    reduced_stft = librosa.db_to_amplitude(reduced_stft_db)
+    return librosa.istft(reduced_stft)
+
+
+def legacy_wiener(audio, noise_clip, sr, lFilterLength=800):
+    win = int(lFilterLength/2)
+    noise_psd = np.abs(librosa.stft(noise_clip, n_fft=lFilterLength, hop_length=win)).mean(axis=1)
+    audio_psd = np.abs(librosa.stft(audio, n_fft=lFilterLength, hop_length=win)).mean(axis=1)
+    wiener_filter = audio_psd / (audio_psd + noise_psd)
+    audio_stft = librosa.stft(audio, n_fft=lFilterLength, hop_length=win)
+    return librosa.istft(audio_stft * wiener_filter[:, None])
+
+
+def legacy_reverb(audio, sr, reverb_time=0.5, decay_rate=0.5):
+    # Rebuilds the IR with a Python loop and convolves directly, on every call
+    impulse_response = np.zeros(int(sr * reverb_time))
+    impulse_response[0] = 1.0
+    for i in range(1, len(impulse_response)):
+        impulse_response[i] = impulse_response[i-1] * decay_rate
+    return scipy.signal.convolve(audio, impulse_response, mode='full')[:len(audio)]
+
+
+def make_signal(seconds, sr, noise_level, seed=0):
+    # Gated chords (a stand-in for speech/music) plus stationary noise; returns (clean, noisy, noise clip)
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sr), dtype=np.float32) / sr
+    clean = np.zeros_like(t)
+    for frequency in (220.0, 330.0, 440.0, 880.0):
+        clean += np.sin(2 * np.pi * frequency * t, dtype=np.float32) / 4
+    clean *= (np.sin(2 * np.pi * 0.5 * t) > 0).astype(np.float32)
+    noisy = clean + noise_level * rng.standard_normal(len(t)).astype(np.float32)
+    noise_clip = noise_level * rng.standard_normal(2 * sr).astype(np.float32)
+    return clean, noisy, noise_clip
+
+
+def snr_db(clean, output):
+    # Output levels differ between implementations, so scale the output optimally first
+    n = min(len(clean), len(output))
+    clean, output = clean[:n].astype(np.float64), output[:n].astype(np.float64)
+    alpha = np.dot(output, clean) / max(np.dot(output, output), 1e-12)
+    error = clean - alpha * output
+    return 10 * np.log10(np.dot(clean, clean) / max(np.dot(error, error), 1e-12))
+
+
+def time_per_block(process, audio, chunk):
+    blocks = len(audio) // chunk
+    start = time.perf_counter()
+    for i in range(blocks):
+        process(audio[i * chunk:(i + 1) * chunk])
+    return (time.perf_counter() - start) / blocks
+
+
+def bench_reverb(args):
+    # Real-time budget: one chunk of audio must be processed in less than chunk / rate seconds
+    rate, chunk = 44100, args.chunk
+    budget = chunk / rate
+    audio = np.random.default_rng(0).standard_normal(rate * 5).astype(np.float32)
+    print(f"\nReverb, {chunk}-sample chunks at {rate} Hz (callback budget {budget * 1000:.1f} ms)")
+    print(f"{'Path':<20}{'Reverb s':>9}{'Decay':>8}{'Taps':>8}{'ms/chunk':>10}{'Budget %':>10}")
+    for reverb_time, decay_rate in [(0.5, 0.5), (2.0, 0.9999)]:
+        legacy = lambda block: legacy_reverb(block, rate, reverb_time, decay_rate)
+        engine = ReverbEngine(rate, reverb_time, decay_rate, block_size=chunk)
+        taps = len(reverb_impulse_response(rate, reverb_time, decay_rate))
+        for name, process, run in (("reverb (legacy)", legacy, audio[:rate]), ("reverb", engine.process, audio)):
+            seconds = time_per_block(process, run, chunk)
+            print(f"{name:<20}{reverb_time:>9.1f}{decay_rate:>8}{taps if process is not legacy else int(rate * reverb_time):>8}"
+                  f"{seconds * 1000:>10.3f}{seconds / budget * 100:>10.1f}")
+
+
+def bench_denoise(args):
+    runs = [
+        ("spectral (legacy)", legacy_spectral_subtraction, args.legacy_minutes),
+        ("spectral", noise_reduction_spectral_subtraction, args.minutes),
+        ("wiener (legacy)", legacy_wiener, args.legacy_minutes),
+        ("wiener", noise_reduction_wiener, args.minutes),
+    ]
+    print(f"{'Path':<20}{'Minutes':>8}{'Seconds':>9}{'x realtime':>12}{'s per hour':>12}{'SNR dB':>8}")
+    signals = {}
+    for name, function, minutes in runs:
+        if minutes not in signals:
+            signals[minutes] = make_signal(minutes * 60, args.sr, args.noise)
+        clean, noisy, noise_clip = signals[minutes]
+        start = time.perf_counter()
+        output = function(noisy, noise_clip, args.sr)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<20}{minutes:>8.1f}{elapsed:>9.2f}{minutes * 60 / elapsed:>12.0f}"
+              f"{elapsed * 60 / minutes:>12.1f}{snr_db(clean, output):>8.1f}")
+    clean, noisy, _ = signals[args.minutes]
+    print(f"Input SNR: {snr_db(clean, noisy):.1f} dB")
+
+
+def import_times(code):
+    # Runs `code` in a fresh interpreter under -X importtime: {module: (self us, cumulative us)}
+    directory = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=directory,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        own, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def bench_startup(args):
+    # Cold start of `import audio_processor`: fails (exit status 1) above --startup-budget
+    runs = [import_times("import audio_processor") for _ in range(args.startup_runs)]
+    best = min(runs, key=lambda times: times["audio_processor"][1])
+    total_ms = best["audio_processor"][1] / 1000
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    help_seconds = []
+    for _ in range(args.startup_runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "audio_processor.py", "--help"], cwd=directory, capture_output=True, check=True)
+        help_seconds.append(time.perf_counter() - start)
+
+    print(f"\nStartup (best of {args.startup_runs}, budget {args.startup_budget:.0f} ms)")
+    print(f"import audio_processor: {total_ms:.1f} ms")
+    print(f"audio_processor.py --help: {min(help_seconds) * 1000:.1f} ms (including interpreter start)")
+    print(f"{'Slowest imports':<40}{'Self ms':>10}{'Cumulative ms':>15}")
+    for module, (own, cumulative) in sorted(best.items(), key=lambda item: -item[1][0])[:10]:
+        print(f"{module:<40}{own / 1000:>10.1f}{cumulative / 1000:>15.1f}")
+
+    # Deferred modules showing up here means something imports them eagerly again
+    leaked = sorted({lazy._module_name for lazy in DEFERRED_IMPORTS.values()
+                     if any(module == lazy._module_name or module.startswith(lazy._module_name + ".") for module in best)})
+    failures = []
+    if leaked:
+        failures.append(f"deferred modules imported at startup: {', '.join(leaked)}")
+    if total_ms > args.startup_budget:
+        failures.append(f"import took {total_ms:.1f} ms, budget is {args.startup_budget:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark audio_processor: noise reduction, real-time reverb and startup time")
+    parser.add_argument("-s", "--suites", default="denoise,reverb", help="Comma separated suites to run")
+    parser.add_argument("-m", "--minutes", type=float, default=10.0, help="Length of the synthetic recording")
+    parser.add_argument("--legacy-minutes", type=float, default=2.0, help="Length used for the old implementations (they need ~4x the memory)")
+    parser.add_argument("--sr", type=int, default=22050, help="Sample rate")
+    parser.add_argument("--noise", type=float, default=0.1, help="Noise standard deviation")
+    parser.add_argument("--chunk", type=int, default=1024, help="Real-time chunk size for the reverb suite")
+    parser.add_argument("--startup-budget", type=float, default=300.0, help="Cold import budget in ms for the startup suite")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Interpreter starts per measurement (best is kept)")
+    args = parser.parse_args()
+
+    suites = {"denoise": bench_denoise, "reverb": bench_reverb, "startup": bench_startup}
+    for name in [s.strip() for s in args.suites.split(",") if s.strip()]:
+        suites[name](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import nltk
 import requests
-from bs4 import BeautifulSoup
+from html_extract import parse_html
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
@@ -113,7 +113,7 @@ def get_alexa_rank(domain):
     try:
         response = requests.get(url, timeout=5)
         response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = parse_html(response.content)
         rank_element = soup.find("div", class_="rank-global")
 
         if rank_element:
@@ -0,0 +1,222 @@
+import html.parser
+
+from bs4 import BeautifulSoup
+
+# Optional fast backends; the module falls back to BeautifulSoup/html.parser without them
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Backends in order of preference. "sax" never builds a tree: it walks parser events
+# (lxml's target interface when available, html.parser otherwise) and only keeps
+# <a href>, <form> and <input>. It can extract pages but cannot answer find() queries.
+BACKENDS = ("selectolax", "lxml", "sax", "bs4")
+
+
+def available_backends():
+    available = []
+    if LexborHTMLParser is not None:
+        available.append("selectolax")
+    if lxml is not None:
+        available.append("lxml")
+    available += ["sax", "bs4"]
+    return available
+
+
+def resolve_backend(backend="auto", dom=False):
+    # "auto" picks the fastest installed backend; dom=True excludes "sax"
+    available = [b for b in available_backends() if not (dom and b == "sax")]
+    if backend == "auto":
+        return available[0]
+    if backend not in available:
+        raise ValueError(f"HTML backend '{backend}' is not available (installed: {', '.join(available)})")
+    return backend
+
+
+def new_form(attrs):
+    return {
+        "action": attrs.get("action"),
+        "method": (attrs.get("method") or "get").lower(),
+        "inputs": []
+    }
+
+
+def new_input(attrs):
+    return {
+        "type": attrs.get("type", "text"),
+        "name": attrs.get("name"),
+        "value": attrs.get("value", "")
+    }
+
+
+class PageEvents:
+    # Event handler shared by both SAX parsers: collects forms, their inputs and link targets
+    def __init__(self):
+        self.forms = []
+        self.links = []
+        self.open_forms = []  # Forms whose end tag has not been seen yet
+
+    def start(self, tag, attrs):
+        if tag == "a":
+            if attrs.get("href") is not None:
+                self.links.append(attrs["href"])
+        elif tag == "form":
+            form = new_form(attrs)
+            self.forms.append(form)
+            self.open_forms.append(form)
+        elif tag == "input" and self.open_forms:
+            self.open_forms[-1]["inputs"].append(new_input(attrs))
+
+    def end(self, tag):
+        if tag == "form" and self.open_forms:
+            self.open_forms.pop()
+
+    def data(self, data):
+        pass
+
+    def close(self):
+        return self.forms, self.links
+
+
+class StdlibPageParser(html.parser.HTMLParser):
+    def __init__(self, events):
+        super().__init__(convert_charrefs=True)
+        self.events = events
+
+    def handle_starttag(self, tag, attrs):
+        self.events.start(tag, {name: value if value is not None else "" for name, value in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        self.events.end(tag)
+
+
+def decode(body):
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return body
+
+
+def extract_page(body, backend="auto"):
+    # Returns (forms, links): forms as {"action", "method", "inputs": [{"type", "name", "value"}]},
+    # links as raw href values in document order
+    backend = resolve_backend(backend)
+    if not body:
+        return [], []
+
+    if backend == "sax":
+        events = PageEvents()
+        if lxml is not None:
+            parser = lxml.etree.HTMLParser(target=events)
+            parser.feed(body)
+            return parser.close()
+        parser = StdlibPageParser(events)
+        parser.feed(decode(body))
+        parser.close()
+        return events.close()
+
+    if backend == "selectolax":
+        tree = LexborHTMLParser(body)
+        forms = []
+        for form in tree.css("form"):
+            form_details = new_form(form.attributes)
+            form_details["inputs"] = [new_input(field.attributes) for field in form.css("input")]
+            forms.append(form_details)
+        links = [a.attributes["href"] for a in tree.css("a[href]")]
+        return forms, [href if href is not None else "" for href in links]
+
+    if backend == "lxml":
+        try:
+            root = lxml.html.fromstring(body)
+        except lxml.etree.ParserError:  # Document is empty
+            return [], []
+        forms = []
+        for form in root.iter("form"):
+            form_details = new_form(form.attrib)
+            form_details["inputs"] = [new_input(field.attrib) for field in form.iter("input")]
+            forms.append(form_details)
+        return forms, [a.get("href") for a in root.iter("a") if a.get("href") is not None]
+
+    soup = BeautifulSoup(body, "html.parser")
+    forms = []
+    for form in soup.find_all("form"):
+        form_details = new_form(form.attrs)
+        form_details["inputs"] = [new_input(field.attrs) for field in form.find_all("input")]
+        forms.append(form_details)
+    return forms, [a.attrs["href"] for a in soup.find_all("a", href=True)]
+
+
+class Element:
+    # Backend-neutral wrapper offering the small part of the BeautifulSoup API the scrapers use
+    def __init__(self, node, backend):
+        self.node = node
+        self.backend = backend
+
+    @property
+    def text(self):
+        if self.backend == "selectolax":
+            return self.node.text(deep=True)
+        if self.backend == "lxml":
+            return self.node.text_content()
+        return self.node.text
+
+    def get_text(self, strip=False):
+        return self.text.strip() if strip else self.text
+
+    def get(self, attribute, default=None):
+        if self.backend == "selectolax":
+            attributes = self.node.attributes
+            if attribute not in attributes:
+                return default
+            return attributes[attribute] if attributes[attribute] is not None else ""
+        if self.backend == "lxml":
+            return self.node.get(attribute, default)
+        return self.node.attrs.get(attribute, default)
+
+    def find(self, tag, class_=None, id=None):
+        # Like BeautifulSoup.find(tag, class_=..., id=...): first descendant or None
+        if self.backend == "selectolax":
+            selector = tag
+            if id is not None:
+                selector += f'[id="{id}"]'
+            if class_ is not None:
+                selector += f'[class~="{class_}"]'
+            node = self.node.css_first(selector)
+        elif self.backend == "lxml":
+            conditions = ""
+            if id is not None:
+                conditions += "[@id=$id]"
+            if class_ is not None:
+                conditions += "[contains(concat(' ', normalize-space(@class), ' '), concat(' ', $cls, ' '))]"
+            nodes = self.node.xpath(f".//{tag}{conditions}", id=id or "", cls=class_ or "")
+            node = nodes[0] if nodes else None
+        else:
+            attrs = {}
+            if id is not None:
+                attrs["id"] = id
+            if class_ is not None:
+                attrs["class_"] = class_
+            node = self.node.find(tag, **attrs)
+        return Element(node, self.backend) if node is not None else None
+
+
+def parse_html(body, backend="auto"):
+    # DOM for find() queries; drop-in for BeautifulSoup(body, 'html.parser') at the call sites
+    backend = resolve_backend(backend, dom=True)
+    if backend == "selectolax":
+        return Element(LexborHTMLParser(body).root, backend)
+    if backend == "lxml":
+        try:
+            return Element(lxml.html.document_fromstring(body), backend)
+        except lxml.etree.ParserError:  # Document is empty
+            return Element(lxml.html.document_fromstring("<html></html>"), backend)
+    return Element(BeautifulSoup(body, "html.parser"), backend)
@@ -0,0 +1,60 @@
+import argparse
+import random
+import time
+
+from html_extract import available_backends, extract_page
+
+
+def make_page(index, links, forms, filler):
+    # Synthetic page shaped like a typical CMS page: nav links, nested layout divs, a few forms
+    rng = random.Random(index)
+    parts = ["<!DOCTYPE html><html><head><title>Page %d</title>"
+             "<script>var x = '<a href=\"/not-a-link\">';</script></head><body>" % index]
+    parts.append("<nav>" + "".join('<a href="/page/%d">Page %d</a>' % (rng.randrange(10000), i)
+                                   for i in range(links)) + "</nav>")
+    for i in range(filler):
+        parts.append('<div class="row"><div class="col"><p>Lorem ipsum <b>dolor</b> sit amet, '
+                     '<span class="meta">item %d</span> consectetur &amp; adipiscing.</p></div></div>' % i)
+    for i in range(forms):
+        parts.append('<form action="/submit/%d" method="%s"><label>Name</label><input name="name">'
+                     '<input type="hidden" name="token" value="%08x"><select name="s"><option>1</option></select>'
+                     '<input type="submit" value="Go"></form>' % (i, rng.choice(["get", "post"]), rng.getrandbits(32)))
+    parts.append("</body></html>")
+    return "".join(parts).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark html_extract backends on form and link extraction")
+    parser.add_argument("-n", "--pages", type=int, default=500, help="Number of distinct pages to parse")
+    parser.add_argument("--links", type=int, default=60, help="Links per page")
+    parser.add_argument("--forms", type=int, default=3, help="Forms per page")
+    parser.add_argument("--filler", type=int, default=200, help="Layout blocks per page")
+    parser.add_argument("-b", "--backends", default=",".join(available_backends()), help="Comma separated backends to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend; the best one is reported")
+    args = parser.parse_args()
+
+    pages = [make_page(i, args.links, args.forms, args.filler) for i in range(args.pages)]
+    total_bytes = sum(len(page) for page in pages)
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    # The slowest backend (BeautifulSoup/html.parser, what the scripts used before) is the reference
+    expected = [extract_page(page, "bs4") for page in pages]
+
+    print(f"{len(pages)} pages, {total_bytes / len(pages) / 1024:.1f} KiB each")
+    print(f"{'Backend':<12}{'Seconds':>10}{'Pages/s':>10}{'MB/s':>8}{'Speedup':>9}{'Matches':>9}")
+    baseline = None
+    for backend in sorted(backends, key=lambda b: b != "bs4"):
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = [extract_page(page, backend) for page in pages]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        if backend == "bs4":
+            baseline = best
+        speedup = f"{baseline / best:.1f}x" if baseline else "-"
+        matches = "yes" if results == expected else "NO"
+        print(f"{backend:<12}{best:>10.2f}{len(pages) / best:>10.0f}{total_bytes / best / 1e6:>8.1f}{speedup:>9}{matches:>9}")
+
+
+if __name__ == "__main__":
+    main()
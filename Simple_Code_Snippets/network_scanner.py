@@ -1,7 +1,6 @@
 import scapy.all as scapy
 import nmap
 import socket
-import subprocess
 import threading
 import queue
 import ipaddress
@@ -10,6 +9,23 @@ import random
 import os
 import sys
 import argparse
+import itertools
+import multiprocessing
+import re
+import asyncio
+import bisect
+import csv
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+from rate_limit import HostRateLimiter
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows
 
 try:
     import tkinter as tk
@@ -21,10 +37,347 @@ except ImportError:
     tk = None
 
 
+class RttEstimator:
+    # RFC 6298 style SRTT/RTTVAR for one host; the retransmission timeout and the number
+    # of retries both follow what has actually been observed on the wire. The RTO can
+    # grow past the initial timeout for slow hosts, up to RFC 6298's 60 s ceiling.
+    def __init__(self, initial_timeout, min_timeout=0.05, max_timeout=60.0):
+        self.min_timeout = min_timeout
+        self.max_timeout = max(max_timeout, initial_timeout)
+        self.srtt = None
+        self.rttvar = None
+        self.rto = initial_timeout
+        self.drops = 0  # Probes that timed out but were answered on retry
+
+    def sample(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.rto = max(self.min_timeout, min(self.max_timeout, self.srtt + max(4 * self.rttvar, 0.01)))
+
+    def backoff(self, attempt):
+        # Timeout for a retransmission: doubled per attempt (RFC 6298 5.5), but only for this
+        # probe, so filtered ports cannot inflate the RTO every other probe uses
+        return min(self.max_timeout, self.rto * 2 ** attempt)
+
+    def retries(self, max_retries):
+        # Unknown hosts get one retry; stable links none, jittery or lossy links more
+        if self.srtt is None:
+            return min(1, max_retries)
+        jitter = self.rttvar / self.srtt if self.srtt > 0 else 0
+        retries = 0 if jitter < 0.25 else 1 if jitter < 1 else 2
+        if self.drops:
+            retries += 1
+        return min(retries, max_retries)
+
+
+class CongestionWindow:
+    # AIMD limit on probes in flight: starts wide open, grows on answers and is halved
+    # (at most once per round trip) when drops are detected
+    def __init__(self, maximum, minimum=16):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.cwnd = float(self.maximum)
+        self.ssthresh = float(self.maximum)
+        self.in_flight = 0
+        self.last_decrease = 0.0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.cwnd))
+            self.in_flight += 1
+
+    async def release(self):
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def on_answer(self):
+        if self.cwnd < self.ssthresh:
+            self.cwnd += 1
+        else:
+            self.cwnd += 1 / self.cwnd
+        self.cwnd = min(self.cwnd, self.maximum)
+
+    def on_drop(self, rtt):
+        now = time.monotonic()
+        if now - self.last_decrease < max(rtt, 0.01):
+            return
+        self.ssthresh = max(self.minimum, self.cwnd / 2)
+        self.cwnd = self.ssthresh
+        self.last_decrease = now
+
+
+class ScanStateStore:
+    # SQLite checkpoint store keyed by (target, host, port, phase).
+    # Host-level rows use port -1, phase-level markers use host '*'.
+    def __init__(self, path="scan_state.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS scans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                finished_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS scan_state (
+                target TEXT NOT NULL,
+                host TEXT NOT NULL,
+                port INTEGER NOT NULL,
+                phase TEXT NOT NULL,
+                state TEXT NOT NULL,
+                data TEXT,
+                scan_id INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                changed_at REAL NOT NULL,
+                PRIMARY KEY (target, host, port, phase)
+            );
+        """)
+        self.conn.commit()
+
+    def begin_scan(self, target, resume=False):
+        # Returns (scan_id, resumed); resuming picks the newest unfinished scan of this target
+        if resume:
+            row = self.conn.execute(
+                "SELECT id FROM scans WHERE target = ? AND finished_at IS NULL ORDER BY id DESC LIMIT 1",
+                (target,)).fetchone()
+            if row:
+                return row['id'], True
+        cursor = self.conn.execute("INSERT INTO scans (target, started_at) VALUES (?, ?)",
+                                   (target, time.time()))
+        self.conn.commit()
+        return cursor.lastrowid, False
+
+    def finish_scan(self, scan_id):
+        self.conn.execute("UPDATE scans SET finished_at = ? WHERE id = ?", (time.time(), scan_id))
+        self.conn.commit()
+
+    def completed_scan(self, target, scan_id=None):
+        # The newest finished scan of this target, or a specific one
+        if scan_id is not None:
+            return self.conn.execute(
+                "SELECT * FROM scans WHERE target = ? AND id = ? AND finished_at IS NOT NULL",
+                (target, scan_id)).fetchone()
+        return self.conn.execute(
+            "SELECT * FROM scans WHERE target = ? AND finished_at IS NOT NULL ORDER BY id DESC LIMIT 1",
+            (target,)).fetchone()
+
+    def get(self, target, host, port, phase):
+        row = self.conn.execute(
+            "SELECT * FROM scan_state WHERE target = ? AND host = ? AND port = ? AND phase = ?",
+            (target, host, port, phase)).fetchone()
+        return self._decode(row) if row else None
+
+    def rows(self, target, phase, host=None):
+        if host is None:
+            cursor = self.conn.execute(
+                "SELECT * FROM scan_state WHERE target = ? AND phase = ? ORDER BY host, port",
+                (target, phase))
+        else:
+            cursor = self.conn.execute(
+                "SELECT * FROM scan_state WHERE target = ? AND phase = ? AND host = ? ORDER BY port",
+                (target, phase, host))
+        return [self._decode(row) for row in cursor]
+
+    def record(self, scan_id, target, host, port, phase, state, data=None):
+        # Upsert a result; changed_at only moves when the state or data actually differ.
+        # Returns True if the row is new or changed.
+        encoded = json.dumps(data) if data is not None else None
+        now = time.time()
+        previous = self.conn.execute(
+            "SELECT state, data, changed_at FROM scan_state WHERE target = ? AND host = ? AND port = ? AND phase = ?",
+            (target, host, port, phase)).fetchone()
+        changed = previous is None or (previous['state'], previous['data']) != (state, encoded)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO scan_state "
+            "(target, host, port, phase, state, data, scan_id, updated_at, changed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (target, host, port, phase, state, encoded, scan_id, now,
+             now if changed else previous['changed_at']))
+        return changed
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def _decode(self, row):
+        row = dict(row)
+        row['data'] = json.loads(row['data']) if row['data'] is not None else None
+        return row
+
+
+class ScanStats:
+    # Throughput counters and per-phase latency histograms, safe to update from worker threads
+    bucket_bounds_ms = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+    phases = ['discovery', 'ports', 'services', 'vulns', 'topology']
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.counters = {'probes': 0, 'open': 0, 'timeouts': 0, 'errors': 0, 'retries': 0, 'drops': 0}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.phase_durations = {}  # {phase: seconds}
+        self.histograms = {}  # {phase: [count per bucket, last bucket is overflow]}
+
+    def incr(self, counter, amount=1):
+        with self.lock:
+            self.counters[counter] += amount
+
+    def probe_started(self, count=1):
+        with self.lock:
+            self.counters['probes'] += count
+            self.in_flight += count
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def probe_finished(self, count=1):
+        with self.lock:
+            self.in_flight -= count
+
+    def observe(self, phase, seconds):
+        index = bisect.bisect_left(self.bucket_bounds_ms, seconds * 1000)
+        with self.lock:
+            histogram = self.histograms.setdefault(phase, [0] * (len(self.bucket_bounds_ms) + 1))
+            histogram[index] += 1
+
+    @contextmanager
+    def phase(self, phase):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phase_durations[phase] = self.phase_durations.get(phase, 0) + time.monotonic() - start
+
+    def merge(self, other):
+        # Fold in ScanStats.as_dict() output from another process (sharded sweeps)
+        with self.lock:
+            for name, value in other['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            self.peak_in_flight = max(self.peak_in_flight, other['peak_in_flight'])
+            for phase, seconds in other['phase_seconds'].items():
+                self.phase_durations[phase] = max(self.phase_durations.get(phase, 0), seconds)
+            for phase, counts in other['latency_histograms'].items():
+                histogram = self.histograms.setdefault(phase, [0] * (len(self.bucket_bounds_ms) + 1))
+                for index, count in enumerate(counts):
+                    histogram[index] += count
+
+    def probes_per_second(self):
+        port_time = self.phase_durations.get('ports') or (time.monotonic() - self.started)
+        return self.counters['probes'] / port_time if port_time > 0 else 0.0
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'counters': dict(self.counters),
+                'probes_per_second': round(self.probes_per_second(), 1),
+                'in_flight': self.in_flight,
+                'peak_in_flight': self.peak_in_flight,
+                'phase_seconds': {k: round(v, 3) for k, v in self.phase_durations.items()},
+                'latency_buckets_ms': [str(b) for b in self.bucket_bounds_ms] + ['inf'],
+                'latency_histograms': {k: list(v) for k, v in self.histograms.items()},
+            }
+
+    def format(self):
+        stats = self.as_dict()
+        lines = ["Scan Statistics", "---------------"]
+        for name, value in stats['counters'].items():
+            lines.append(f"{name.capitalize()}: {value}")
+        lines.append(f"Probes/sec: {stats['probes_per_second']}")
+        lines.append(f"Peak In-Flight Sockets: {stats['peak_in_flight']}")
+        for phase in self.phases:
+            if phase not in stats['phase_seconds'] and phase not in stats['latency_histograms']:
+                continue
+            lines.append(f"{phase.capitalize()}: {stats['phase_seconds'].get(phase, 0)}s")
+            histogram = stats['latency_histograms'].get(phase)
+            if histogram:
+                for bound, count in zip(stats['latency_buckets_ms'], histogram):
+                    if count:
+                        lines.append(f"  <= {bound} ms: {count}")
+        return "\n".join(lines)
+
+
+class JsonLinesSink:
+    # Appends one JSON object per event; line buffered so `tail -f` sees progress live
+    def __init__(self, path):
+        self.file = open(path, 'a', buffering=1)
+
+    def write(self, event):
+        self.file.write(json.dumps(event) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class CsvSink:
+    fields = ['time', 'type', 'target', 'host', 'port', 'data']
+
+    def __init__(self, path):
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'a', newline='', buffering=1)
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fields)
+        if new_file:
+            self.writer.writeheader()
+
+    def write(self, event):
+        row = dict(event)
+        row['data'] = json.dumps(row['data']) if row['data'] is not None else ''
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class SqliteSink:
+    def __init__(self, path, commit_every=500):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS scan_events "
+            "(time REAL, type TEXT, target TEXT, host TEXT, port INTEGER, data TEXT)")
+        self.commit_every = commit_every
+        self.pending = 0
+
+    def write(self, event):
+        self.conn.execute(
+            "INSERT INTO scan_events (time, type, target, host, port, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (event['time'], event['type'], event['target'], event['host'], event['port'],
+             json.dumps(event['data']) if event['data'] is not None else None))
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.conn.commit()
+            self.pending = 0
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def make_event_sink(path):
+    # Picks the sink from the file extension: .csv, .db/.sqlite/.sqlite3, anything else is JSON Lines
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return CsvSink(path)
+    if extension in ('.db', '.sqlite', '.sqlite3'):
+        return SqliteSink(path)
+    return JsonLinesSink(path)
+
+
 class NetworkScanner:
     def __init__(self, target_network=None, port_range=None, interface=None,
                  enable_vuln_scan=False, enable_ids_evasion=False, scan_type='tcp',
-                 report_format='text', output_file=None):
+                 report_format='text', output_file=None, max_concurrency=5000,
+                 host_rate_limit=None, timeout=1.0, max_retries=2, state_store=None, resume=False,
+                 since=None, nmap_workers=4, nmap_hosts_per_run=64):
 
         self.target_network = target_network
         self.port_range = port_range or "1-1024"  # Default port range
@@ -40,6 +393,29 @@ class NetworkScanner:
         self.vulnerabilities = {}  # {host: {port: [vulns]}}
         self.scan_results = {}  # combined scan results
         self.gui_enabled = False # Flag to control GUI elements
+        self.max_concurrency = max_concurrency  # Sockets in flight for the async TCP engine
+        self.host_rate_limit = host_rate_limit  # Max probes per second per host (None = unlimited)
+        self.timeout = timeout  # Initial connect timeout in seconds, adapted per host
+        self.min_timeout = 0.05
+        self.max_retries = max_retries  # Upper bound on retransmissions per probe
+        self.rtt_estimators = {}  # {host: RttEstimator} used to adapt timeouts and retries
+        self.syn_block_size = 1024  # Ports per batched SYN send/receive round
+        self.packet_sender = scapy.sr  # Swappable for a loopback/namespace stand-in
+        self.state_store = state_store  # Optional ScanStateStore for checkpoint/resume
+        self.resume = resume  # Continue the newest unfinished scan of this target
+        self.since = since  # 'last' or a scan id: only re-probe what changed since then
+        self.scan_id = None
+        self.delta_since = None  # finished_at of the --since baseline scan
+        self.checkpoint_batch_size = 16  # Hosts port-scanned between checkpoints
+        self.nmap_workers = nmap_workers  # Parallel nmap processes for service/vuln detection
+        self.nmap_hosts_per_run = nmap_hosts_per_run  # Hosts handed to a single nmap invocation
+        self.ping_concurrency = 256  # Pings in flight while mapping topology
+        self.ping_rtts = {}  # {host: rtt_ms or None}, cached per scan
+        self.topology = {}  # {host: [reachable host]}, see build_topology()
+        self.event_sinks = []  # Objects with write(event) or plain callables
+        self.event_lock = threading.Lock()
+        self.stats = ScanStats()
+        self.show_stats = False  # Dump ScanStats at the end of run_scan
 
         self.nm = nmap.PortScanner()
 
@@ -71,7 +447,111 @@ class NetworkScanner:
     def set_gui_enabled(self, gui_enabled):
         self.gui_enabled = gui_enabled
 
+    def set_max_concurrency(self, max_concurrency):
+        self.max_concurrency = max_concurrency
+
+    def set_host_rate_limit(self, host_rate_limit):
+        self.host_rate_limit = host_rate_limit
+
+    def set_timeout(self, timeout):
+        self.timeout = timeout
+
+    def set_state_store(self, state_store):
+        self.state_store = state_store
+
+    def add_sink(self, sink):
+        self.event_sinks.append(sink)
+
+    def remove_sink(self, sink):
+        if sink in self.event_sinks:
+            self.event_sinks.remove(sink)
+
+    def emit(self, event_type, host=None, port=None, data=None):
+        # Event types: scan_started, host_up, port_open, service, vuln, scan_finished
+        if not self.event_sinks:
+            return
+        event = {'time': time.time(), 'type': event_type, 'target': self.target_network,
+                 'host': host, 'port': port, 'data': data}
+        with self.event_lock:
+            for sink in self.event_sinks:
+                if hasattr(sink, 'write'):
+                    sink.write(event)
+                else:
+                    sink(event)
+
+    def iter_events(self):
+        # Runs the scan in a worker thread and yields events as they are found
+        events = queue.Queue()
+        finished = object()
+        self.add_sink(events.put)
+
+        def worker():
+            try:
+                self.run_scan()
+            finally:
+                events.put(finished)
+
+        threading.Thread(target=worker, daemon=True).start()
+        try:
+            while True:
+                event = events.get()
+                if event is finished:
+                    return
+                yield event
+        finally:
+            self.remove_sink(events.put)
+
+    def record_state(self, host, port, phase, state, data=None):
+        if self.state_store is not None:
+            self.state_store.record(self.scan_id, self.target_network, host, port, phase, state, data)
+
+    def commit_checkpoint(self):
+        if self.state_store is not None:
+            self.state_store.commit()
+
+    def load_checkpoint(self, host, port, phase):
+        # Stored row for work that does not need redoing: either finished earlier in this
+        # (resumed) scan, or an open port whose state has not changed since the --since baseline
+        if self.state_store is None:
+            return None
+        row = self.state_store.get(self.target_network, host, port, phase)
+        if row is None:
+            return None
+        if row['scan_id'] == self.scan_id:
+            return row
+        if self.delta_since is not None and port >= 0:
+            port_row = self.state_store.get(self.target_network, host, port, 'ports')
+            if port_row and port_row['state'] == 'open' and port_row['changed_at'] <= self.delta_since:
+                self.record_state(host, port, phase, row['state'], row['data'])
+                return row
+        return None
+
+    def parse_port_range(self):
+        # Accepts "1-1024", "80" or a comma separated mix such as "22,80,8000-8100"
+        ports = []
+        for part in str(self.port_range).split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if '-' in part:
+                start_port, end_port = [int(p) for p in part.split('-', 1)]
+                ports.extend(range(start_port, end_port + 1))
+            else:
+                ports.append(int(part))
+        return ports
+
     def discover_hosts(self):
+        if self.load_checkpoint('*', -1, 'discovery') is not None:
+            self.active_hosts = [row['host'] for row in self.state_store.rows(self.target_network, 'discovery')
+                                 if row['host'] != '*' and row['state'] == 'up']
+            if self.gui_enabled:
+                self.update_log("Loaded active hosts from checkpoint:\n" + "\n".join(self.active_hosts))
+            else:
+                print("Loaded active hosts from checkpoint:", self.active_hosts)
+            for host in self.active_hosts:
+                self.emit('host_up', host)
+            return
+
         try:
             arp_request = scapy.ARP(pdst=self.target_network)
             broadcast = scapy.Ether(dst="ff:ff:ff:ff:ff:ff")
@@ -84,6 +564,17 @@ class NetworkScanner:
                 self.update_log("Discovered active hosts:\n" + "\n".join(self.active_hosts))
             else:
                 print("Discovered active hosts:", self.active_hosts)
+            for host in self.active_hosts:
+                self.emit('host_up', host)
+
+            if self.state_store is not None:
+                for row in self.state_store.rows(self.target_network, 'discovery'):
+                    if row['host'] != '*' and row['host'] not in self.active_hosts:
+                        self.record_state(row['host'], -1, 'discovery', 'down')
+                for host in self.active_hosts:
+                    self.record_state(host, -1, 'discovery', 'up')
+                self.record_state('*', -1, 'discovery', 'done')
+                self.commit_checkpoint()
 
         except Exception as e:
             if self.gui_enabled:
@@ -94,29 +585,41 @@ class NetworkScanner:
 
 
     def scan_port(self, host, port, results_queue):
+        start = time.monotonic()
+        self.stats.probe_started()
         try:
             if self.scan_type == 'tcp':
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(1)  # Reduce timeout for responsiveness
+                sock.settimeout(self.host_timeout(host))
                 result = sock.connect_ex((host, port))
                 if result == 0:
                     results_queue.put((host, port, "tcp"))
+                    self.emit('port_open', host, port, {'protocol': 'tcp'})
                 sock.close()
             elif self.scan_type == 'udp':
                 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                sock.settimeout(1)
-                sock.sendto(b'A', (host, port))
+                sock.settimeout(self.host_timeout(host))
+                sock.connect((host, port))  # Connected, so ICMP port unreachable is reported back
+                sock.send(b'A')
                 try:
-                    sock.recvfrom(1024)
+                    sock.recv(1024)
+                    self.rtt_estimator(host).sample(time.monotonic() - start)
                     results_queue.put((host, port, "udp"))  # Open or filtered
+                    self.emit('port_open', host, port, {'protocol': 'udp'})
                 except socket.timeout:
-                    pass  # Assume filtered (UDP is connectionless)
+                    self.stats.incr('timeouts')  # Assume filtered (UDP is connectionless)
+                except ConnectionRefusedError:
+                    # ICMP port unreachable: closed. Not an RTT sample, since the kernel
+                    # answers far sooner than a UDP service would
+                    pass
                 sock.close()
             elif self.scan_type == 'icmp':
                 icmp_request = scapy.IP(dst=host) / scapy.ICMP()
-                reply = scapy.sr1(icmp_request, timeout=1, verbose=False)
+                reply = scapy.sr1(icmp_request, timeout=self.host_timeout(host), verbose=False)
                 if reply:
+                    self.rtt_estimator(host).sample(time.monotonic() - start)
                     results_queue.put((host, port, "icmp"))
+                    self.emit('port_open', host, port, {'protocol': 'icmp'})
             else:
                 if self.gui_enabled:
                    self.update_log("Invalid scan type specified")
@@ -133,6 +636,230 @@ class NetworkScanner:
                  self.update_log(f"Error connecting to {host}:{port}: {e}")
             else:
                 print(f"Error connecting to {host}:{port}: {e}")
+            self.stats.incr('errors')
+        finally:
+            self.stats.probe_finished()
+            self.stats.observe('ports', time.monotonic() - start)
+
+    def effective_concurrency(self):
+        # Never ask for more sockets than the process is allowed to open
+        concurrency = max(1, int(self.max_concurrency))
+        if resource is not None:
+            soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+            if soft_limit != resource.RLIM_INFINITY:
+                concurrency = min(concurrency, max(1, soft_limit - 64))
+        return concurrency
+
+    def rtt_estimator(self, host):
+        if host not in self.rtt_estimators:
+            self.rtt_estimators[host] = RttEstimator(self.timeout, self.min_timeout)
+        return self.rtt_estimators[host]
+
+    def host_timeout(self, host):
+        # Retransmission timeout derived from this host's SRTT/RTTVAR
+        return self.rtt_estimator(host).rto
+
+    def host_retries(self, host):
+        return self.rtt_estimator(host).retries(self.max_retries)
+
+    async def async_tcp_probe(self, host, port, limiter, window=None):
+        estimator = self.rtt_estimator(host)
+        attempt = 0
+        while True:
+            await limiter.acquire(host)
+            start = time.monotonic()
+            self.stats.probe_started()
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port),
+                                                        timeout=estimator.backoff(attempt))
+                is_open = True
+            except asyncio.TimeoutError:
+                self.stats.incr('timeouts')
+                if attempt < estimator.retries(self.max_retries):
+                    attempt += 1
+                    self.stats.incr('retries')
+                    continue
+                # Not a drop: silence is what filtered ports look like, and backing off
+                # for them would let one firewalled host throttle the whole sweep
+                return False  # Filtered, or every retransmission was lost
+            except ConnectionRefusedError:
+                is_open = False  # A RST is still a round trip worth measuring
+            except OSError:
+                self.stats.observe('ports', time.monotonic() - start)
+                return False
+            finally:
+                self.stats.probe_finished()
+
+            rtt = time.monotonic() - start
+            estimator.sample(rtt)
+            self.stats.observe('ports', rtt)
+            if window is not None:
+                window.on_answer()
+                if attempt:
+                    # Answered only on a retransmission: the earlier probe was dropped
+                    estimator.drops += 1
+                    self.stats.incr('drops')
+                    window.on_drop(estimator.srtt)
+            if not is_open:
+                return False
+            self.stats.incr('open')
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            return True
+
+    async def async_tcp_scan(self, hosts, ports):
+        # Congestion-controlled window bounded by effective_concurrency(): tasks are created
+        # lazily so memory stays flat no matter how many (host, port) pairs are queued
+        window = CongestionWindow(self.effective_concurrency())
+        limiter = HostRateLimiter(self.host_rate_limit)
+        open_ports = {host: [] for host in hosts}
+        pending = set()
+
+        async def probe(host, port):
+            try:
+                if await self.async_tcp_probe(host, port, limiter, window):
+                    open_ports[host].append(port)
+                    self.emit('port_open', host, port, {'protocol': 'tcp'})
+            finally:
+                await window.release()
+
+        # Interleave hosts so the per-host rate cap does not serialize the sweep
+        for port in ports:
+            for host in hosts:
+                await window.acquire()
+                task = asyncio.ensure_future(probe(host, port))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                if self.enable_ids_evasion:
+                    await asyncio.sleep(random.uniform(0.01, 0.05))  # Small delay
+
+        if pending:
+            await asyncio.gather(*pending)
+        for host in open_ports:
+            open_ports[host].sort()
+        return open_ports
+
+    def build_syn_packets(self, hosts, ports, sport):
+        # One SYN per (host, port); a fixed source port lets replies be matched without per-probe state
+        return [scapy.IP(dst=host) / scapy.TCP(sport=sport, dport=port, flags='S',
+                                               seq=random.getrandbits(32))
+                for host in hosts for port in ports]
+
+    def match_syn_replies(self, answered, probes):
+        # Map replies back by (ip, sport, dport): SYN/ACK means open, RST means closed
+        states = {}
+        for _, received in answered:
+            if not received.haslayer(scapy.TCP):
+                continue
+            key = (received[scapy.IP].src, received[scapy.TCP].dport, received[scapy.TCP].sport)
+            if key not in probes:
+                continue
+            flags = int(received[scapy.TCP].flags)
+            if flags & 0x12 == 0x12:
+                states[key] = 'open'
+            elif flags & 0x04:
+                states.setdefault(key, 'closed')
+        return states
+
+    def syn_scan(self, hosts, ports):
+        # Half-open scan: whole port blocks go out through one batched send/receive loop
+        l3socket = scapy.conf.L3socket
+        if any(ipaddress.ip_address(host).is_loopback for host in hosts):
+            scapy.conf.L3socket = scapy.L3RawSocket  # Linux drops raw L2 frames on lo
+        try:
+            return self.syn_scan_blocks(hosts, ports)
+        finally:
+            scapy.conf.L3socket = l3socket  # The setting is process-wide; leave it as found
+
+    def syn_scan_blocks(self, hosts, ports):
+        open_ports = {host: [] for host in hosts}
+        sport = random.randint(32768, 60999)
+        inter = 0.01 if self.enable_ids_evasion else 0
+        for i in range(0, len(ports), self.syn_block_size):
+            block = ports[i:i + self.syn_block_size]
+            probes = {(host, sport, port) for host in hosts for port in block}
+            packets = self.build_syn_packets(hosts, block, sport)
+            states = {}
+            # Unanswered probes are resent, up to the largest retry budget among these hosts
+            for attempt in range(max(self.host_retries(host) for host in hosts) + 1):
+                if attempt:
+                    self.stats.incr('retries', len(packets))
+                start = time.monotonic()
+                self.stats.probe_started(len(packets))
+                try:
+                    answered, _ = self.packet_sender(packets, timeout=max(self.host_timeout(host) for host in hosts),
+                                                     inter=inter, verbose=False)
+                finally:
+                    self.stats.probe_finished(len(packets))
+                self.stats.observe('ports', time.monotonic() - start)
+                for sent, received in answered:
+                    if hasattr(sent, 'sent_time') and hasattr(received, 'time') and sent.sent_time:
+                        self.rtt_estimator(sent[scapy.IP].dst).sample(max(0.0, received.time - sent.sent_time))
+                new_states = self.match_syn_replies(answered, probes)
+                if attempt:
+                    self.stats.incr('drops', len(set(new_states) - set(states)))
+                for key, state in new_states.items():
+                    states.setdefault(key, state)
+                packets = [packet for packet in packets
+                           if (packet[scapy.IP].dst, sport, packet[scapy.TCP].dport) not in states]
+                if not packets:
+                    break
+            self.stats.incr('timeouts', len(probes) - len(states))
+            for (host, _, port), state in states.items():
+                if state == 'open':
+                    self.stats.incr('open')
+                    open_ports[host].append(port)
+                    self.emit('port_open', host, port, {'protocol': 'tcp', 'method': 'syn'})
+        for host in open_ports:
+            open_ports[host].sort()
+        return open_ports
+
+    def scan_hosts(self, hosts, ports):
+        if self.scan_type == 'tcp':
+            return asyncio.run(self.async_tcp_scan(hosts, ports))
+
+        if self.scan_type == 'syn':
+            try:
+                return self.syn_scan(hosts, ports)
+            except Exception as e:
+                if self.gui_enabled:
+                    self.update_log(f"Error during SYN scan: {e}")
+                else:
+                    print(f"Error during SYN scan: {e}")
+                return {host: [] for host in hosts}
+
+        num_threads = 32  # Bounded pool for the UDP/ICMP probes
+        results_queue = queue.Queue()
+        open_ports = {host: [] for host in hosts}
+
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            for host in hosts:
+                for port in ports:
+                    executor.submit(self.scan_port, host, port, results_queue)
+
+                    if self.enable_ids_evasion:
+                        time.sleep(random.uniform(0.01, 0.05))  # Small delay
+
+        while not results_queue.empty():
+            host, port, protocol = results_queue.get()
+            open_ports[host].append(port)
+        return open_ports
+
+    def checkpoint_ports(self, hosts):
+        if self.state_store is None:
+            return
+        for host in hosts:
+            found = set(self.open_ports.get(host, []))
+            for row in self.state_store.rows(self.target_network, 'ports', host):
+                if row['port'] >= 0 and row['state'] == 'open' and row['port'] not in found:
+                    self.record_state(host, row['port'], 'ports', 'closed')
+            for port in found:
+                self.record_state(host, port, 'ports', 'open')
+            self.record_state(host, -1, 'ports', 'done')
+        self.commit_checkpoint()
 
     def identify_open_ports(self):
         if not self.active_hosts:
@@ -142,29 +869,32 @@ class NetworkScanner:
                 print("No active hosts found. Run host discovery first.")
             return
 
-        num_threads = 32  # Increased for faster scanning
-        results_queue = queue.Queue()
-        threads = []
-
-        for host in self.active_hosts:
-            self.open_ports[host] = []
-            ports = [int(p) for p in self.port_range.split('-')]
-            start_port, end_port = ports[0], ports[1]
-            for port in range(start_port, end_port + 1):
-                thread = threading.Thread(target=self.scan_port, args=(host, port, results_queue))
-                threads.append(thread)
-                thread.daemon = True  # Allow main thread to exit even if this thread is running
-                thread.start()
+        ports = self.parse_port_range()
 
-                if self.enable_ids_evasion:
-                    time.sleep(random.uniform(0.01, 0.05))  # Small delay
+        if self.scan_type == 'syn' and hasattr(os, 'geteuid') and os.geteuid() != 0:
+            if self.gui_enabled:
+                self.update_log("SYN scan requires root privileges. Falling back to TCP connect scan.")
+            else:
+                print("SYN scan requires root privileges. Falling back to TCP connect scan.")
+            self.scan_type = 'tcp'
 
-        for thread in threads:
-            thread.join()  # Wait for all threads to complete
+        pending_hosts = []
+        for host in self.active_hosts:
+            if self.load_checkpoint(host, -1, 'ports') is not None:
+                self.open_ports[host] = [row['port'] for row in self.state_store.rows(self.target_network, 'ports', host)
+                                         if row['port'] >= 0 and row['state'] == 'open']
+                for port in self.open_ports[host]:
+                    self.emit('port_open', host, port, {'protocol': self.scan_type, 'checkpoint': True})
+            else:
+                pending_hosts.append(host)
 
-        while not results_queue.empty():
-            host, port, protocol = results_queue.get()
-            self.open_ports[host].append(port)
+        # Without a state store everything goes in one batch; with one, checkpoint every few hosts
+        batch_size = self.checkpoint_batch_size if self.state_store is not None else len(pending_hosts)
+        for i in range(0, len(pending_hosts), max(1, batch_size)):
+            batch = pending_hosts[i:i + max(1, batch_size)]
+            results = self.scan_hosts(batch, ports)
+            self.open_ports.update(results)
+            self.checkpoint_ports(batch)
 
         if self.gui_enabled:
             for host, ports in self.open_ports.items():
@@ -174,6 +904,76 @@ class NetworkScanner:
                 print(f"Open ports on {host}: {ports}")
 
 
+    def plan_nmap_batches(self, pairs):
+        # Group (host, port) pairs into a few large nmap runs. Hosts are sorted by their
+        # open-port set so hosts that look alike share a run and the port union stays small.
+        host_ports = {}
+        for host, port in pairs:
+            host_ports.setdefault(host, set()).add(port)
+        hosts = sorted(host_ports, key=lambda h: (sorted(host_ports[h]), h))
+        batches = []
+        for i in range(0, len(hosts), max(1, self.nmap_hosts_per_run)):
+            batch_hosts = hosts[i:i + max(1, self.nmap_hosts_per_run)]
+            batch_ports = sorted(set().union(*(host_ports[h] for h in batch_hosts)))
+            batches.append((batch_hosts, batch_ports))
+        return batches
+
+    def run_nmap_batch(self, hosts, ports, arguments):
+        # Each worker gets its own PortScanner; python-nmap parses the run's XML once
+        nm = nmap.PortScanner()
+        nm.scan(' '.join(hosts), ports=','.join(map(str, ports)), arguments=f"{arguments} -Pn -n")
+        results = {}
+        for host in hosts:
+            try:
+                results[host] = nm[host].get('tcp', {}) if host in nm.all_hosts() else {}
+            except KeyError:
+                results[host] = {}
+        return results
+
+    def timed_nmap_batch(self, hosts, ports, arguments, phase):
+        start = time.monotonic()
+        try:
+            return self.run_nmap_batch(hosts, ports, arguments)
+        finally:
+            self.stats.observe(phase, time.monotonic() - start)
+
+    def run_nmap_batches(self, pairs, arguments, phase='services'):
+        # Yields (host, {port: nmap port info}) for the requested pairs as batches finish
+        wanted = {}
+        for host, port in pairs:
+            wanted.setdefault(host, set()).add(port)
+        batches = self.plan_nmap_batches(pairs)
+        if not batches:
+            return
+
+        with ThreadPoolExecutor(max_workers=max(1, self.nmap_workers)) as executor:
+            futures = {executor.submit(self.timed_nmap_batch, hosts, ports, arguments, phase): hosts
+                       for hosts, ports in batches}
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    self.stats.incr('errors')
+                    if self.gui_enabled:
+                        self.update_log(f"Error running nmap on {', '.join(futures[future])}: {e}")
+                    else:
+                        print(f"Error running nmap on {', '.join(futures[future])}: {e}")
+                    continue
+                for host, port_info in results.items():
+                    yield host, {port: port_info.get(port, {}) for port in sorted(wanted[host])}
+
+    def record_vulnerabilities(self, host, port, info):
+        if 'script' in info:
+            self.vulnerabilities[host][port] = list(info['script'].keys())
+            if self.gui_enabled:
+               self.update_log(f"Vulnerabilities found on {host}:{port}: {self.vulnerabilities[host][port]}")
+            else:
+               print(f"Vulnerabilities found on {host}:{port}: {self.vulnerabilities[host][port]}")
+        else:
+            self.vulnerabilities[host][port] = []
+        self.record_state(host, port, 'vuln', 'done', self.vulnerabilities[host][port])
+        self.emit('vuln', host, port, self.vulnerabilities[host][port])
+
     def perform_service_detection(self):
         if not self.active_hosts:
             if self.gui_enabled:
@@ -182,30 +982,39 @@ class NetworkScanner:
                 print("No active hosts found. Run host discovery first.")
             return
 
+        pending = []
         for host in self.active_hosts:
             if host not in self.open_ports or not self.open_ports[host]:
                 continue
 
             self.service_versions[host] = {}
-            try:
-                self.nm.scan(host, ports=','.join(map(str, self.open_ports[host])), arguments='-sV')  # Service version detection
-                for port in self.open_ports[host]:
-                    try:
-                        service = self.nm[host]['tcp'][port]['name'] if 'tcp' in self.nm[host] and port in self.nm[host]['tcp'] else "Unknown"
-                        version = self.nm[host]['tcp'][port]['version'] if 'tcp' in self.nm[host] and port in self.nm[host]['tcp'] and 'version' in self.nm[host]['tcp'][port] else "Unknown"
-                        self.service_versions[host][port] = f"{service} {version}"
-                        if self.gui_enabled:
-                            self.update_log(f"Service on {host}:{port}: {service} {version}")
-                        else:
-                            print(f"Service on {host}:{port}: {service} {version}")
-                    except KeyError:
-                        self.service_versions[host][port] = "Unknown"
-
-            except Exception as e:
-                if self.gui_enabled:
-                    self.update_log(f"Error performing service detection on {host}: {e}")
+            for port in self.open_ports[host]:
+                row = self.load_checkpoint(host, port, 'service')
+                if row is not None:
+                    self.service_versions[host][port] = row['data']
+                    self.emit('service', host, port, row['data'])
                 else:
-                    print(f"Error performing service detection on {host}: {e}")
+                    pending.append((host, port))
+
+        # With vuln scanning on, -sV and the vuln scripts share one pass over the ports
+        arguments = '-sV --script vuln' if self.enable_vuln_scan else '-sV'
+        for host, port_results in self.run_nmap_batches(pending, arguments):
+            for port, info in port_results.items():
+                service = info.get('name') or "Unknown"
+                version = info.get('version') or "Unknown"
+                self.service_versions[host][port] = f"{service} {version}" if info else "Unknown"
+                if info:
+                    if self.gui_enabled:
+                        self.update_log(f"Service on {host}:{port}: {service} {version}")
+                    else:
+                        print(f"Service on {host}:{port}: {service} {version}")
+                self.record_state(host, port, 'service', 'done', self.service_versions[host][port])
+                self.emit('service', host, port, self.service_versions[host][port])
+
+                if self.enable_vuln_scan and info:
+                    self.vulnerabilities.setdefault(host, {})
+                    self.record_vulnerabilities(host, port, info)
+            self.commit_checkpoint()
 
     def conduct_vulnerability_scanning(self):
         if not self.active_hosts:
@@ -222,31 +1031,26 @@ class NetworkScanner:
                 print("Vulnerability scanning is disabled.")
             return
 
+        pending = []
         for host in self.active_hosts:
             if host not in self.open_ports or not self.open_ports[host]:
                 continue
 
-            self.vulnerabilities[host] = {}
+            self.vulnerabilities.setdefault(host, {})
             for port in self.open_ports[host]:
-                try:
-                    nmap_args = '-sV --script vuln'  # Vulnerability scanning script
-                    self.nm.scan(host, ports=str(port), arguments=nmap_args)
-
-                    if 'script' in self.nm[host]['tcp'][port]:
-                        vuln_info = self.nm[host]['tcp'][port]['script']
-                        self.vulnerabilities[host][port] = list(vuln_info.keys())
-                        if self.gui_enabled:
-                           self.update_log(f"Vulnerabilities found on {host}:{port}: {self.vulnerabilities[host][port]}")
-                        else:
-                           print(f"Vulnerabilities found on {host}:{port}: {self.vulnerabilities[host][port]}")
-                    else:
-                        self.vulnerabilities[host][port] = []
+                if port in self.vulnerabilities[host]:
+                    continue  # Already covered by the combined service detection pass
+                row = self.load_checkpoint(host, port, 'vuln')
+                if row is not None:
+                    self.vulnerabilities[host][port] = row['data']
+                    self.emit('vuln', host, port, row['data'])
+                else:
+                    pending.append((host, port))
 
-                except Exception as e:
-                    if self.gui_enabled:
-                       self.update_log(f"Error during vulnerability scanning on {host}:{port}: {e}")
-                    else:
-                        print(f"Error during vulnerability scanning on {host}:{port}: {e}")
+        for host, port_results in self.run_nmap_batches(pending, '-sV --script vuln', phase='vulns'):
+            for port, info in port_results.items():
+                self.record_vulnerabilities(host, port, info)
+            self.commit_checkpoint()
 
     def evade_ids(self):
         # Simple rate limiting and source port randomization
@@ -258,6 +1062,48 @@ class NetworkScanner:
         else:
             print("IDS evasion techniques enabled (rate limiting, source port randomization).")
 
+    async def async_ping(self, host, semaphore):
+        # One ICMP echo through the system ping; returns the RTT in ms or None if unreachable
+        async with semaphore:
+            rtt = await self.ping_once(host)
+            if rtt is not None:
+                self.stats.observe('topology', rtt / 1000)
+            return rtt
+
+    async def ping_once(self, host):
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'ping', '-c', '1', '-W', str(max(1, int(round(self.timeout)))), host,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+        except OSError:
+            return None
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout=self.timeout + 2)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return None
+        if process.returncode != 0:
+            return None
+        match = re.search(r'time[=<]\s*([\d.]+)\s*ms', stdout.decode(errors='ignore'))
+        return float(match.group(1)) if match else 0.0
+
+    async def async_reachability(self, hosts):
+        semaphore = asyncio.Semaphore(self.ping_concurrency)
+        rtts = await asyncio.gather(*(self.async_ping(host, semaphore) for host in hosts))
+        return dict(zip(hosts, rtts))
+
+    def build_topology(self, rtts):
+        # Full mesh of the hosts that answered a ping, not observed adjacency: every probe
+        # leaves from this machine, so it says nothing about links between two hosts. The
+        # measured RTT belongs to each host (ping_rtts), not to an edge.
+        reachable = sorted(host for host in self.active_hosts if rtts.get(host) is not None)
+        topology = {host: [] for host in self.active_hosts}
+        for host, other_host in itertools.combinations(reachable, 2):
+            topology[host].append(other_host)
+            topology[other_host].append(host)
+        return topology
+
     def create_network_topology_map(self):
         # This is a placeholder.  Creating a detailed topology map is complex.
         # Requires traceroute-like functionality, OS fingerprinting, etc.
@@ -270,33 +1116,26 @@ class NetworkScanner:
                 print("No active hosts found. Run host discovery first.")
             return
 
-        topology = {}
-        for host in self.active_hosts:
-            topology[host] = []
-            for other_host in self.active_hosts:
-                if host != other_host:
-                    try:
-                        # Check connectivity using ping (ICMP)
-                        ping_result = subprocess.run(['ping', '-c', '1', other_host],
-                                                      capture_output=True, text=True, timeout=2)
-                        if ping_result.returncode == 0:
-                            topology[host].append(other_host)
-                    except subprocess.TimeoutExpired:
-                        pass # Host not reachable
-                    except Exception as e:
-                        if self.gui_enabled:
-                            self.update_log(f"Error creating topology map: {e}")
-                        else:
-                            print(f"Error creating topology map: {e}")
+        # Reachability is cached for the scan, so only hosts not seen yet get pinged
+        unprobed = [host for host in self.active_hosts if host not in self.ping_rtts]
+        if unprobed:
+            try:
+                self.ping_rtts.update(asyncio.run(self.async_reachability(unprobed)))
+            except Exception as e:
+                if self.gui_enabled:
+                    self.update_log(f"Error creating topology map: {e}")
+                else:
+                    print(f"Error creating topology map: {e}")
 
+        self.topology = self.build_topology(self.ping_rtts)
 
         if self.gui_enabled:
             self.update_log("Network Topology:")
-            for host, neighbors in topology.items():
+            for host, neighbors in self.topology.items():
                 self.update_log(f"{host} is connected to: {neighbors}")
         else:
             print("Network Topology:")
-            for host, neighbors in topology.items():
+            for host, neighbors in self.topology.items():
                 print(f"{host} is connected to: {neighbors}")
 
     def generate_report(self):
@@ -306,6 +1145,8 @@ class NetworkScanner:
           self.scan_results[host]['open_ports'] = self.open_ports.get(host, [])
           self.scan_results[host]['service_versions'] = self.service_versions.get(host, {})
           self.scan_results[host]['vulnerabilities'] = self.vulnerabilities.get(host, {})
+          self.scan_results[host]['rtt_ms'] = self.ping_rtts.get(host)
+          self.scan_results[host]['neighbors'] = self.topology.get(host, [])
 
 
         if self.report_format == 'text':
@@ -326,6 +1167,9 @@ class NetworkScanner:
                     report += "  Vulnerabilities:\n"
                     for port, vulns in self.scan_results[host]['vulnerabilities'].items():
                         report += f"    - {port}: {vulns}\n"
+                    if self.scan_results[host]['rtt_ms'] is not None:
+                        report += f"  RTT: {self.scan_results[host]['rtt_ms']} ms\n"
+                    report += f"  Connected To: {self.scan_results[host]['neighbors']}\n"
             return report
 
         elif self.report_format == 'json':
@@ -361,22 +1205,78 @@ class NetworkScanner:
             print(report)
 
     def run_scan(self):
+        if not self.scan_network():
+            return
+        report = self.generate_report()
+        self.save_report(report)
+        self.finish_scan()
+
+    def scan_network(self):
+        # Runs every scan phase; returns False when there is nothing to scan
         if not self.target_network:
             if self.gui_enabled:
                 self.update_log("Target network is not set.")
             else:
                 print("Target network is not set.")
-            return
+            return False
+
+        self.ping_rtts = {}
+        self.topology = {}
+        self.stats = ScanStats()
+        if self.state_store is not None:
+            self.begin_state_tracking()
 
+        self.emit('scan_started', data={'scan_type': self.scan_type, 'port_range': self.port_range})
         if self.enable_ids_evasion:
             self.evade_ids()
-        self.discover_hosts()
-        self.identify_open_ports()
-        self.perform_service_detection()
-        self.conduct_vulnerability_scanning()
-        self.create_network_topology_map()
-        report = self.generate_report()
-        self.save_report(report)
+        with self.stats.phase('discovery'):
+            self.discover_hosts()
+        with self.stats.phase('ports'):
+            self.identify_open_ports()
+        with self.stats.phase('services'):
+            self.perform_service_detection()
+        with self.stats.phase('vulns'):
+            self.conduct_vulnerability_scanning()
+        with self.stats.phase('topology'):
+            self.create_network_topology_map()
+        return True
+
+    def finish_scan(self):
+        self.emit('scan_finished', data={'hosts': len(self.active_hosts),
+                                         'open_ports': sum(len(p) for p in self.open_ports.values())})
+        if self.show_stats:
+            if self.gui_enabled:
+                self.update_log(self.stats.format())
+            else:
+                print(self.stats.format())
+
+        if self.state_store is not None:
+            self.state_store.finish_scan(self.scan_id)
+
+    def begin_state_tracking(self):
+        self.scan_id, resumed = self.state_store.begin_scan(self.target_network, resume=self.resume)
+        if resumed:
+            message = f"Resuming scan #{self.scan_id} from {self.state_store.path}"
+        else:
+            message = f"Started scan #{self.scan_id} (state in {self.state_store.path})"
+        if self.gui_enabled:
+            self.update_log(message)
+        else:
+            print(message)
+
+        self.delta_since = None
+        if self.since:
+            baseline_id = None if str(self.since).lower() == 'last' else int(self.since)
+            baseline = self.state_store.completed_scan(self.target_network, baseline_id)
+            if baseline is not None and baseline['id'] != self.scan_id:
+                self.delta_since = baseline['finished_at']
+                message = f"Delta mode: only re-probing services changed since scan #{baseline['id']}"
+            else:
+                message = "No completed baseline scan found. Running a full scan."
+            if self.gui_enabled:
+                self.update_log(message)
+            else:
+                print(message)
 
 
     def update_log(self, message):
@@ -386,6 +1286,116 @@ class NetworkScanner:
             self.log_text.config(state=tk.DISABLED) # Disable editing
             self.log_text.see(tk.END) # Scroll to end
 
+def plan_shards(networks, shard_prefix=24):
+    # Deterministic shard list: overlapping inputs are collapsed, ranges bigger than
+    # shard_prefix are split, and shards come out in address order so the same inputs
+    # always produce the same shards
+    parsed = [ipaddress.ip_network(network.strip(), strict=False) for network in networks if network.strip()]
+    shards = []
+    for version in (4, 6):
+        for network in ipaddress.collapse_addresses(n for n in parsed if n.version == version):
+            if network.prefixlen < shard_prefix:
+                shards.extend(network.subnets(new_prefix=shard_prefix))
+            else:
+                shards.append(network)
+    return [str(shard) for shard in shards]
+
+
+def shard_result_path(shard_dir, shard):
+    return os.path.join(shard_dir, shard.replace('/', '_').replace(':', '-') + '.json')
+
+
+def scan_shard(job):
+    # Worker entry point: scans one shard with the fast engines and saves its results
+    # atomically, so an interrupted sweep can be resumed shard by shard
+    shard, scanner_kwargs, shard_dir = job
+    scanner = NetworkScanner(target_network=shard, **scanner_kwargs)
+    scanner.scan_network()
+    result = {
+        'shard': shard,
+        'active_hosts': scanner.active_hosts,
+        'open_ports': scanner.open_ports,
+        'service_versions': scanner.service_versions,
+        'vulnerabilities': scanner.vulnerabilities,
+        'ping_rtts': scanner.ping_rtts,
+        'stats': scanner.stats.as_dict(),
+    }
+    path = shard_result_path(shard_dir, shard)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(result, f)
+    os.replace(path + '.tmp', path)
+    return result
+
+
+class ShardedScanCoordinator:
+    # Splits large sweeps into shards and scans them on a multiprocessing pool.
+    # Results are merged into a single NetworkScanner, which produces the report.
+    def __init__(self, networks, processes=None, shard_prefix=24, shard_dir="scan_shards",
+                 resume=False, **scanner_kwargs):
+        self.networks = networks
+        self.processes = processes or os.cpu_count() or 1
+        self.shard_prefix = shard_prefix
+        self.shard_dir = shard_dir
+        self.resume = resume
+        self.scanner_kwargs = scanner_kwargs
+        self.merged = NetworkScanner(target_network=", ".join(networks), **scanner_kwargs)
+
+    def merge_shard_result(self, result):
+        merged = self.merged
+        for host in result['active_hosts']:
+            merged.active_hosts.append(host)
+            merged.emit('host_up', host)
+        for host, ports in result['open_ports'].items():
+            merged.open_ports[host] = ports
+            for port in ports:
+                merged.emit('port_open', host, port, {'protocol': merged.scan_type, 'shard': result['shard']})
+        # JSON turns port keys into strings; restore them
+        for host, services in result['service_versions'].items():
+            merged.service_versions[host] = {int(port): service for port, service in services.items()}
+            for port, service in merged.service_versions[host].items():
+                merged.emit('service', host, port, service)
+        for host, vulns in result['vulnerabilities'].items():
+            merged.vulnerabilities[host] = {int(port): found for port, found in vulns.items()}
+            for port, found in merged.vulnerabilities[host].items():
+                merged.emit('vuln', host, port, found)
+        merged.ping_rtts.update(result['ping_rtts'])
+        merged.stats.merge(result['stats'])
+
+    def run(self):
+        os.makedirs(self.shard_dir, exist_ok=True)
+        shards = plan_shards(self.networks, self.shard_prefix)
+        pending = []
+        finished = []
+        for shard in shards:
+            path = shard_result_path(self.shard_dir, shard)
+            if self.resume and os.path.exists(path):
+                finished.append(path)
+            else:
+                pending.append(shard)
+
+        print(f"{len(shards)} shards planned, {len(finished)} loaded from {self.shard_dir}, "
+              f"{len(pending)} to scan on {self.processes} processes")
+
+        # Sinks see scan_started first; resumed shards are replayed after it like fresh ones
+        self.merged.emit('scan_started', data={'scan_type': self.merged.scan_type, 'shards': len(shards)})
+        for path in finished:
+            with open(path) as f:
+                self.merge_shard_result(json.load(f))
+        if pending:
+            jobs = [(shard, self.scanner_kwargs, self.shard_dir) for shard in pending]
+            with multiprocessing.Pool(processes=min(self.processes, len(jobs))) as pool:
+                for done, result in enumerate(pool.imap_unordered(scan_shard, jobs), 1):
+                    self.merge_shard_result(result)
+                    print(f"Shard {result['shard']} finished ({done}/{len(jobs)})")
+
+        self.merged.active_hosts.sort(key=ipaddress.ip_address)
+        self.merged.topology = self.merged.build_topology(self.merged.ping_rtts)
+        report = self.merged.generate_report()
+        self.merged.save_report(report)
+        self.merged.finish_scan()
+        return self.merged
+
+
 class NetworkScannerGUI:
     def __init__(self, master):
         self.master = master
@@ -425,7 +1435,7 @@ class NetworkScannerGUI:
         # Scan Type
         self.scan_type_label = ttk.Label(master, text="Scan Type:")
         self.scan_type_label.grid(row=3, column=0, sticky=tk.W)
-        self.scan_type_combo = ttk.Combobox(master, values=['TCP', 'UDP', 'ICMP'])
+        self.scan_type_combo = ttk.Combobox(master, values=['TCP', 'SYN', 'UDP', 'ICMP'])
         self.scan_type_combo.grid(row=3, column=1, sticky=tk.W)
         self.scan_type_combo.set("TCP")
 
@@ -519,10 +1529,25 @@ if __name__ == "__main__":
     parser.add_argument("-i", "--interface", dest="interface", help="Network interface to use (e.g., eth0)")
     parser.add_argument("-v", "--vuln", dest="enable_vuln_scan", action="store_true", help="Enable vulnerability scanning")
     parser.add_argument("-e", "--evade", dest="enable_ids_evasion", action="store_true", help="Enable IDS evasion techniques")
-    parser.add_argument("-s", "--scan_type", dest="scan_type", help="Scan type (TCP, UDP, ICMP)", default="tcp")
+    parser.add_argument("-s", "--scan_type", dest="scan_type", help="Scan type (TCP, SYN, UDP, ICMP)", default="tcp")
     parser.add_argument("-r", "--report_format", dest="report_format", help="Report format (text, json)", default="text")
     parser.add_argument("-o", "--output", dest="output_file", help="Output file for the report")
     parser.add_argument("-g", "--gui", dest="enable_gui", action="store_true", help="Enable graphical user interface")
+    parser.add_argument("-c", "--concurrency", dest="max_concurrency", type=int, default=5000, help="Maximum TCP connects in flight (default 5000)")
+    parser.add_argument("--rate", dest="host_rate_limit", type=float, help="Maximum probes per second per host")
+    parser.add_argument("--timeout", dest="timeout", type=float, default=1.0, help="Initial probe timeout in seconds (adapted per host from SRTT/RTTVAR)")
+    parser.add_argument("--retries", dest="max_retries", type=int, default=2, help="Maximum retransmissions per probe (actual count adapts per host)")
+    parser.add_argument("--nmap-workers", dest="nmap_workers", type=int, default=4, help="Parallel nmap processes for service/vulnerability detection")
+    parser.add_argument("--nmap-batch", dest="nmap_hosts_per_run", type=int, default=64, help="Hosts per nmap invocation")
+    parser.add_argument("--stats", dest="show_stats", action="store_true", help="Print probe throughput, timeouts and per-phase latency histograms after the scan")
+    parser.add_argument("--events", dest="event_files", action="append", help="Stream events to a file as they are found (.jsonl, .csv or .db); may be repeated")
+    parser.add_argument("--state-db", dest="state_db", help="SQLite file used to checkpoint scan state (default scan_state.db with --resume/--since)")
+    parser.add_argument("--resume", dest="resume", action="store_true", help="Resume the last unfinished scan of this target")
+    parser.add_argument("--targets-file", dest="targets_file", help="File with one network/CIDR per line; implies a sharded sweep")
+    parser.add_argument("--processes", dest="processes", type=int, help="Worker processes for a sharded sweep (default: CPU count)")
+    parser.add_argument("--shard-prefix", dest="shard_prefix", type=int, default=24, help="Prefix length of each shard in a sharded sweep (default /24)")
+    parser.add_argument("--shard-dir", dest="shard_dir", default="scan_shards", help="Directory for per-shard results; reused by --resume")
+    parser.add_argument("--since", dest="since", nargs="?", const="last", help="Delta mode: only re-probe services/vulns on ports changed since the last (or given) completed scan id")
 
 
     args = parser.parse_args()
@@ -532,7 +1557,48 @@ if __name__ == "__main__":
         root = tk.Tk()
         gui = NetworkScannerGUI(root)
         root.mainloop()
+    elif args.targets_file or (args.processes and args.processes > 1):
+        if args.state_db or args.since:
+            # Shards checkpoint to --shard-dir instead; --resume works through that
+            parser.error("--state-db and --since are not supported by sharded sweeps (--targets-file/--processes)")
+        networks = [args.target_network] if args.target_network else []
+        if args.targets_file:
+            with open(args.targets_file) as f:
+                networks.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+        coordinator = ShardedScanCoordinator(
+            networks,
+            processes=args.processes,
+            shard_prefix=args.shard_prefix,
+            shard_dir=args.shard_dir,
+            resume=args.resume,
+            port_range=args.port_range,
+            interface=args.interface,
+            enable_vuln_scan=args.enable_vuln_scan,
+            enable_ids_evasion=args.enable_ids_evasion,
+            scan_type=args.scan_type,
+            report_format=args.report_format,
+            output_file=args.output_file,
+            max_concurrency=args.max_concurrency,
+            host_rate_limit=args.host_rate_limit,
+            timeout=args.timeout,
+            max_retries=args.max_retries,
+            nmap_workers=args.nmap_workers,
+            nmap_hosts_per_run=args.nmap_hosts_per_run
+        )
+        coordinator.merged.show_stats = args.show_stats
+        event_sinks = [make_event_sink(path) for path in args.event_files or []]
+        for sink in event_sinks:
+            coordinator.merged.add_sink(sink)
+        try:
+            coordinator.run()
+        finally:
+            for sink in event_sinks:
+                sink.close()
     else:
+        state_store = None
+        if args.state_db or args.resume or args.since:
+            state_store = ScanStateStore(args.state_db or "scan_state.db")
+
         scanner = NetworkScanner(
             target_network=args.target_network,
             port_range=args.port_range,
@@ -541,6 +1607,25 @@ if __name__ == "__main__":
             enable_ids_evasion=args.enable_ids_evasion,
             scan_type=args.scan_type,
             report_format=args.report_format,
-            output_file=args.output_file
+            output_file=args.output_file,
+            max_concurrency=args.max_concurrency,
+            host_rate_limit=args.host_rate_limit,
+            timeout=args.timeout,
+            max_retries=args.max_retries,
+            state_store=state_store,
+            resume=args.resume,
+            since=args.since,
+            nmap_workers=args.nmap_workers,
+            nmap_hosts_per_run=args.nmap_hosts_per_run
         )
-        scanner.run_scan()
\ No newline at end of file
+        scanner.show_stats = args.show_stats
+        event_sinks = [make_event_sink(path) for path in args.event_files or []]
+        for sink in event_sinks:
+            scanner.add_sink(sink)
+        try:
+            scanner.run_scan()
+        finally:
+            for sink in event_sinks:
+                sink.close()
+            if state_store is not None:
+                state_store.close()
\ No newline at end of file
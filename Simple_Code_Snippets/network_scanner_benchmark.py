@@ -0,0 +1,103 @@
+import argparse
+import os
+import random
+import socket
+import threading
+import time
+
+from network_scanner import NetworkScanner
+
+
+def open_listeners(protocol, host, ports, count):
+    # Bind `count` random ports out of `ports`; these are the ground truth the scanners must find
+    sockets = []
+    candidates = list(ports)
+    random.shuffle(candidates)
+    for port in candidates:
+        if len(sockets) == count:
+            break
+        sock_type = socket.SOCK_STREAM if protocol == 'tcp' else socket.SOCK_DGRAM
+        sock = socket.socket(socket.AF_INET, sock_type)
+        try:
+            sock.bind((host, port))
+        except OSError:
+            sock.close()
+            continue
+        if protocol == 'tcp':
+            sock.listen(128)
+        else:
+            threading.Thread(target=echo_udp, args=(sock,), daemon=True).start()
+        sockets.append(sock)
+    return sockets
+
+
+def echo_udp(sock):
+    # UDP probes only count as open when something answers
+    while True:
+        try:
+            data, address = sock.recvfrom(1024)
+            sock.sendto(data, address)
+        except OSError:
+            return
+
+
+def run_engine(engine, host, ports, expected, args):
+    scanner = NetworkScanner(target_network=host, scan_type=engine, max_concurrency=args.concurrency,
+                             timeout=args.timeout)
+    start = time.monotonic()
+    with scanner.stats.phase('ports'):
+        found = set(scanner.scan_hosts([host], ports).get(host, []))
+    elapsed = time.monotonic() - start
+
+    true_positives = len(found & expected)
+    precision = true_positives / len(found) if found else 1.0
+    recall = true_positives / len(expected) if expected else 1.0
+    stats = scanner.stats.as_dict()
+    return {
+        'engine': engine,
+        'probes': stats['counters']['probes'],
+        'seconds': elapsed,
+        'probes_per_second': stats['counters']['probes'] / elapsed if elapsed > 0 else 0.0,
+        'peak_in_flight': stats['peak_in_flight'],
+        'timeouts': stats['counters']['timeouts'],
+        'precision': precision,
+        'recall': recall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NetworkScanner port-scan engines against local listeners")
+    parser.add_argument("--host", default="127.0.0.1", help="Loopback (or namespace) address to bind listeners on")
+    parser.add_argument("-p", "--ports", default="20000-29999", help="Port range to scan")
+    parser.add_argument("-n", "--listeners", type=int, default=50, help="Number of open ports to plant")
+    parser.add_argument("-e", "--engines", default="tcp,syn,udp", help="Comma separated engines to run")
+    parser.add_argument("-c", "--concurrency", type=int, default=5000, help="Sockets in flight for the TCP engine")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Probe timeout in seconds")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per engine")
+    args = parser.parse_args()
+
+    ports = NetworkScanner(port_range=args.ports).parse_port_range()
+    results = []
+    for engine in [e.strip().lower() for e in args.engines.split(',') if e.strip()]:
+        if engine == 'syn' and hasattr(os, 'geteuid') and os.geteuid() != 0:
+            print("Skipping syn engine: raw sockets need root.")
+            continue
+
+        listeners = open_listeners('udp' if engine == 'udp' else 'tcp', args.host, ports, args.listeners)
+        expected = {sock.getsockname()[1] for sock in listeners}
+        try:
+            for _ in range(args.repeat):
+                results.append(run_engine(engine, args.host, ports, expected, args))
+        finally:
+            for sock in listeners:
+                sock.close()
+
+    print(f"{'Engine':<8}{'Probes':>10}{'Seconds':>10}{'Probes/s':>12}{'Peak':>8}{'Timeouts':>10}{'Precision':>11}{'Recall':>8}")
+    for result in results:
+        print(f"{result['engine']:<8}{result['probes']:>10}{result['seconds']:>10.2f}"
+              f"{result['probes_per_second']:>12.0f}{result['peak_in_flight']:>8}{result['timeouts']:>10}"
+              f"{result['precision']:>11.3f}{result['recall']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
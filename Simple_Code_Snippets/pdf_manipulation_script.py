@@ -1,23 +1,24 @@
 import os
 import sys
-import io
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
-from PIL import Image, ImageTk
+from PIL import ImageTk
 import PyPDF2
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.colors import HexColor
 from reportlab.lib.units import inch
 from pdfminer.high_level import extract_text, extract_pages
 from pdfminer.image import ImageWriter
 from pdfminer.layout import LTImage
 import fitz  # PyMuPDF
-import pytesseract
 from wand.image import Image as WandImage
 from pathlib import Path
 import re
 import datetime
+import queue
+import threading
+
+import pdf_operations
 
 class PDFManipulatorGUI:
     def __init__(self, root):
@@ -46,6 +47,7 @@ class PDFManipulatorGUI:
         # Common Components
         self.create_browse_button()
         self.create_output_path_selection()
+        self.create_progress_bar()
 
     def create_browse_button(self):
         browse_frame = ttk.Frame(self.root)
@@ -87,6 +89,63 @@ class PDFManipulatorGUI:
         output_browse_button = ttk.Button(output_frame, text="Browse", command=self.browse_output_path)
         output_browse_button.pack(side=tk.LEFT, padx=5)
 
+    def create_progress_bar(self):
+        progress_frame = ttk.Frame(self.root)
+        progress_frame.pack(pady=5)
+
+        self.progress_bar = ttk.Progressbar(progress_frame, length=400, mode="determinate")
+        self.progress_bar.pack(side=tk.LEFT, padx=5)
+
+        self.status_label = ttk.Label(progress_frame, text="Ready", width=30)
+        self.status_label.pack(side=tk.LEFT, padx=5)
+
+        self.events = queue.Queue()
+        self.busy = False
+
+    def run_operation(self, description, operation, success_message, *args, **kwargs):
+        # pdf_operations calls run on a worker thread so the window stays responsive; progress
+        # and the outcome come back through a queue that the Tk loop polls (Tk is not thread-safe)
+        if self.busy:
+            messagebox.showwarning("Busy", "Another operation is still running.")
+            return
+        self.busy = True
+        self.progress_bar["value"] = 0
+        self.status_label.config(text=f"{description}...")
+
+        def progress(done, total):
+            self.events.put(("progress", done, total))
+
+        def work():
+            try:
+                result = operation(*args, progress=progress, **kwargs)
+                self.events.put(("done", success_message(result)))
+            except Exception as e:
+                self.events.put(("error", f"Error {description.lower()}: {e}"))
+
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(100, self.poll_events)
+
+    def poll_events(self):
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress":
+                _, done, total = event
+                self.progress_bar["maximum"] = total
+                self.progress_bar["value"] = done
+                self.status_label.config(text=f"{done}/{total}")
+                continue
+            self.busy = False
+            self.status_label.config(text="Ready")
+            if event[0] == "done":
+                messagebox.showinfo("Success", event[1])
+            else:
+                messagebox.showerror("Error", event[1])
+            return
+        self.root.after(100, self.poll_events)
+
     def browse_output_path(self):
         self.output_path = filedialog.askdirectory()
         self.output_path_entry.insert(0, self.output_path)
@@ -107,18 +166,9 @@ class PDFManipulatorGUI:
             messagebox.showerror("Error", "No output path selected.")
             return
 
-        try:
-            merger = PyPDF2.PdfMerger()
-            for pdf_file in self.pdf_files:
-                merger.append(pdf_file)
-
-            output_filename = os.path.join(self.output_path, "merged.pdf")
-            merger.write(output_filename)
-            merger.close()
-
-            messagebox.showinfo("Success", f"PDFs merged successfully to {output_filename}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error merging PDFs: {e}")
+        output_filename = os.path.join(self.output_path, "merged.pdf")
+        self.run_operation("Merging PDFs", pdf_operations.merge_pdfs, lambda result: f"PDFs merged successfully to {result}",
+                           list(self.pdf_files), output_filename)
 
     def create_split_tab(self):
         split_tab = ttk.Frame(self.notebook)
@@ -148,36 +198,13 @@ class PDFManipulatorGUI:
 
         try:
             split_page = int(self.split_page_entry.get())
-            pdf_file = self.pdf_files[0]
-            reader = PyPDF2.PdfReader(pdf_file)
-
-            if split_page >= len(reader.pages):
-                messagebox.showerror("Error", "Split page number is out of range.")
-                return
-
-            output_filename1 = os.path.join(self.output_path, "split_part1.pdf")
-            output_filename2 = os.path.join(self.output_path, "split_part2.pdf")
-
-            writer1 = PyPDF2.PdfWriter()
-            writer2 = PyPDF2.PdfWriter()
-
-            for i in range(split_page):
-                writer1.add_page(reader.pages[i])
-
-            for i in range(split_page, len(reader.pages)):
-                writer2.add_page(reader.pages[i])
-
-            with open(output_filename1, "wb") as f:
-                writer1.write(f)
-            with open(output_filename2, "wb") as f:
-                writer2.write(f)
-
-            messagebox.showinfo("Success", f"PDF split successfully into {output_filename1} and {output_filename2}")
-
         except ValueError:
             messagebox.showerror("Error", "Invalid split page number.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error splitting PDF: {e}")
+            return
+
+        self.run_operation("Splitting PDF", pdf_operations.split_pdf,
+                           lambda result: f"PDF split successfully into {result[0]} and {result[1]}",
+                           self.pdf_files[0], split_page, self.output_path)
 
     def create_rotate_tab(self):
         rotate_tab = ttk.Frame(self.notebook)
@@ -208,24 +235,13 @@ class PDFManipulatorGUI:
 
         try:
             rotation_angle = int(self.rotate_angle_entry.get())
-            pdf_file = self.pdf_files[0]
-            reader = PyPDF2.PdfReader(pdf_file)
-            writer = PyPDF2.PdfWriter()
-
-            for page in reader.pages:
-                page.rotate(rotation_angle)
-                writer.add_page(page)
-
-            output_filename = os.path.join(self.output_path, "rotated.pdf")
-            with open(output_filename, "wb") as f:
-                writer.write(f)
-
-            messagebox.showinfo("Success", f"Pages rotated successfully to {output_filename}")
-
         except ValueError:
             messagebox.showerror("Error", "Invalid rotation angle.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error rotating pages: {e}")
+            return
+
+        output_filename = os.path.join(self.output_path, "rotated.pdf")
+        self.run_operation("Rotating pages", pdf_operations.rotate_pages, lambda result: f"Pages rotated successfully to {result}",
+                           self.pdf_files[0], rotation_angle, output_filename)
 
     def create_watermark_tab(self):
         watermark_tab = ttk.Frame(self.notebook)
@@ -291,57 +307,21 @@ class PDFManipulatorGUI:
             messagebox.showerror("Error", "No output path selected.")
             return
 
-        try:
-            pdf_file = self.pdf_files[0]
-            output_filename = os.path.join(self.output_path, "watermarked.pdf")
-            reader = PyPDF2.PdfReader(pdf_file)
-            writer = PyPDF2.PdfWriter()
-
-            if self.watermark_type.get() == "text":
-                watermark_text = self.watermark_text_entry.get()
-                if not watermark_text:
-                    messagebox.showerror("Error", "Please enter watermark text.")
-                    return
-
-                packet = io.BytesIO()
-                can = canvas.Canvas(packet, pagesize=letter)
-                can.setFont('Helvetica', 60)
-                can.setFillColor(HexColor("#AAAAAA"))
-                can.saveState()
-                can.translate(letter[0]/2, letter[1]/2)
-                can.rotate(45)
-                can.drawCentredString(0, 0, watermark_text)
-                can.restoreState()
-                can.save()
-                packet.seek(0)
-
-                watermark = PyPDF2.PdfReader(packet).pages[0]
-            else:  # Image Watermark
-                image_path = self.watermark_image_path.get()
-                if not image_path or not os.path.exists(image_path):
-                    messagebox.showerror("Error", "Invalid watermark image path.")
-                    return
-
-                img = Image.open(image_path)
-                img_width, img_height = img.size
-                packet = io.BytesIO()
-                can = canvas.Canvas(packet, pagesize=letter)
-                can.drawImage(image_path, letter[0]/2 - img_width/2, letter[1]/2 - img_height/2, width=img_width, height=img_height)
-                can.save()
-                packet.seek(0)
-                watermark = PyPDF2.PdfReader(packet).pages[0]
-
-            for page in reader.pages:
-                page.merge_page(watermark)
-                writer.add_page(page)
-
-            with open(output_filename, "wb") as f:
-                writer.write(f)
-
-            messagebox.showinfo("Success", f"Watermark added successfully to {output_filename}")
+        text, image = None, None
+        if self.watermark_type.get() == "text":
+            text = self.watermark_text_entry.get()
+            if not text:
+                messagebox.showerror("Error", "Please enter watermark text.")
+                return
+        else:  # Image Watermark
+            image = self.watermark_image_path.get()
+            if not image or not os.path.exists(image):
+                messagebox.showerror("Error", "Invalid watermark image path.")
+                return
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Error adding watermark: {e}")
+        output_filename = os.path.join(self.output_path, "watermarked.pdf")
+        self.run_operation("Adding watermark", pdf_operations.add_watermark, lambda result: f"Watermark added successfully to {result}",
+                           self.pdf_files[0], output_filename, text=text, image=image)
 
     def create_encrypt_decrypt_tab(self):
         encrypt_decrypt_tab = ttk.Frame(self.notebook)
@@ -519,25 +499,9 @@ class PDFManipulatorGUI:
             messagebox.showerror("Error", f"Error extracting images: {e}")
 
     def extract_text_with_ocr(self, pdf_file):
-        try:
-            doc = fitz.open(pdf_file)
-            full_text = ""
-
-            for page_index in range(len(doc)):
-                page = doc.load_page(page_index)
-                pix = page.get_pixmap()
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                text = pytesseract.image_to_string(img)
-                full_text += text
-
-            output_filename = os.path.join(self.output_path, "ocr_extracted_text.txt")
-            with open(output_filename, "w", encoding="utf-8") as f:
-                f.write(full_text)
-
-            messagebox.showinfo("Success", f"Text extracted with OCR successfully to {output_filename}")
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Error extracting text with OCR: {e}")
+        output_filename = os.path.join(self.output_path, "ocr_extracted_text.txt")
+        self.run_operation("Extracting text with OCR", pdf_operations.extract_text_with_ocr,
+                           lambda result: f"Text extracted with OCR successfully to {result}", pdf_file, output_filename)
 
     def create_convert_tab(self):
         convert_tab = ttk.Frame(self.notebook)
@@ -591,19 +555,9 @@ class PDFManipulatorGUI:
             messagebox.showerror("Error", f"Error converting PDF to text: {e}")
 
     def convert_to_images(self, pdf_file):
-        try:
-            doc = fitz.open(pdf_file)
-            image_dir = os.path.join(self.output_path, "converted_images")
-            os.makedirs(image_dir, exist_ok=True)
-
-            for page_index in range(len(doc)):
-                page = doc.load_page(page_index)
-                pix = page.get_pixmap()
-                image_filename = os.path.join(image_dir, f"page_{page_index + 1}.png")
-                pix.save(image_filename)
-            messagebox.showinfo("Success", f"PDF converted to images successfully to {image_dir}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Error converting PDF to images: {e}")
+        image_dir = os.path.join(self.output_path, "converted_images")
+        self.run_operation("Converting PDF to images", pdf_operations.convert_to_images,
+                           lambda result: f"PDF converted to images successfully to {image_dir}", pdf_file, image_dir)
 
     def create_create_tab(self):
         create_tab = ttk.Frame(self.notebook)
@@ -0,0 +1,300 @@
+import argparse
+import concurrent.futures
+import io
+import multiprocessing
+import os
+import sys
+
+import PyPDF2
+import fitz  # PyMuPDF
+from PIL import Image
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+# OCR needs pytesseract and the Tesseract binary; every other operation works without them
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+# Headless PDF operations used by PDFManipulatorGUI and the command line.
+#
+# Page-level work (rendering, OCR, text watermark stamping) is split into contiguous page
+# ranges that run in a process pool, several ranges per worker so slow pages balance
+# out and progress is reported often. Each task opens the document itself, so only
+# file names and page numbers cross process boundaries. Every operation takes an
+# optional progress(done, total) callback, called from the thread that started it.
+
+
+def page_chunks(page_count, workers, pages_per_task=None):
+    if pages_per_task is None:
+        pages_per_task = max(1, min(16, -(-page_count // (workers * 4))))
+    return [range(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+
+
+def run_pages(task, pdf_file, page_count, args=(), workers=None, progress=None):
+    # Runs task(pdf_file, pages, *args) over page ranges; returns the results in page order
+    workers = workers or os.cpu_count() or 1
+    chunks = page_chunks(page_count, workers)
+    results = [None] * len(chunks)
+    done = 0
+    if workers == 1 or len(chunks) <= 1:
+        for index, pages in enumerate(chunks):
+            results[index] = task(pdf_file, pages, *args)
+            done += len(pages)
+            if progress:
+                progress(done, page_count)
+        return results
+
+    # spawn: the GUI calls this from a worker thread, and forking a threaded Tk process is unsafe
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                                mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {pool.submit(task, pdf_file, pages, *args): index for index, pages in enumerate(chunks)}
+        for future in concurrent.futures.as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            done += len(chunks[index])
+            if progress:
+                progress(done, page_count)
+    return results
+
+
+def page_count(pdf_file):
+    with fitz.open(pdf_file) as doc:
+        return len(doc)
+
+
+# Page-level tasks (run in worker processes)
+
+def render_pages(pdf_file, pages, output_dir, dpi=None):
+    paths = []
+    with fitz.open(pdf_file) as doc:
+        for page_index in pages:
+            pix = doc.load_page(page_index).get_pixmap(dpi=dpi)
+            image_filename = os.path.join(output_dir, f"page_{page_index + 1}.png")
+            pix.save(image_filename)
+            paths.append(image_filename)
+    return paths
+
+
+def ocr_pages(pdf_file, pages, dpi=None, language="eng"):
+    texts = []
+    with fitz.open(pdf_file) as doc:
+        for page_index in pages:
+            pix = doc.load_page(page_index).get_pixmap(dpi=dpi)
+            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+            texts.append(pytesseract.image_to_string(img, lang=language))
+    return texts
+
+
+def stamp_pages(pdf_file, pages, watermark_pdf, progress=None):
+    # Returns the stamped pages as a standalone PDF; the caller concatenates the ranges
+    reader = PyPDF2.PdfReader(pdf_file)
+    watermark = PyPDF2.PdfReader(io.BytesIO(watermark_pdf)).pages[0]
+    writer = PyPDF2.PdfWriter()
+    for done, page_index in enumerate(pages, 1):
+        page = reader.pages[page_index]
+        page.merge_page(watermark)
+        writer.add_page(page)
+        if progress:
+            progress(done, len(pages))
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+# Watermarks (one letter-size page, centred)
+
+def text_watermark(text):
+    packet = io.BytesIO()
+    can = canvas.Canvas(packet, pagesize=letter)
+    can.setFont('Helvetica', 60)
+    can.setFillColor(HexColor("#AAAAAA"))
+    can.saveState()
+    can.translate(letter[0]/2, letter[1]/2)
+    can.rotate(45)
+    can.drawCentredString(0, 0, text)
+    can.restoreState()
+    can.save()
+    return packet.getvalue()
+
+
+def image_watermark(image_path):
+    with Image.open(image_path) as img:
+        img_width, img_height = img.size
+    packet = io.BytesIO()
+    can = canvas.Canvas(packet, pagesize=letter)
+    can.drawImage(image_path, letter[0]/2 - img_width/2, letter[1]/2 - img_height/2, width=img_width, height=img_height)
+    can.save()
+    return packet.getvalue()
+
+
+# Operations
+
+def merge_pdfs(pdf_files, output_file, progress=None):
+    merger = PyPDF2.PdfMerger()
+    for done, pdf_file in enumerate(pdf_files, 1):
+        merger.append(pdf_file)
+        if progress:
+            progress(done, len(pdf_files))
+    merger.write(output_file)
+    merger.close()
+    return output_file
+
+
+def split_pdf(pdf_file, split_page, output_dir, progress=None):
+    reader = PyPDF2.PdfReader(pdf_file)
+    total = len(reader.pages)
+    if not 0 < split_page < total:
+        raise ValueError("Split page number is out of range.")
+
+    output_files = []
+    for part, pages in enumerate((range(split_page), range(split_page, total)), 1):
+        writer = PyPDF2.PdfWriter()
+        for i in pages:
+            writer.add_page(reader.pages[i])
+        output_filename = os.path.join(output_dir, f"split_part{part}.pdf")
+        with open(output_filename, "wb") as f:
+            writer.write(f)
+        output_files.append(output_filename)
+        if progress:
+            progress(pages.stop, total)
+    return output_files
+
+
+def rotate_pages(pdf_file, angle, output_file, progress=None):
+    # Rotation only sets /Rotate on each page, so it is cheap enough to stay serial
+    reader = PyPDF2.PdfReader(pdf_file)
+    writer = PyPDF2.PdfWriter()
+    for done, page in enumerate(reader.pages, 1):
+        page.rotate(angle)
+        writer.add_page(page)
+        if progress:
+            progress(done, len(reader.pages))
+    with open(output_file, "wb") as f:
+        writer.write(f)
+    return output_file
+
+
+def add_watermark(pdf_file, output_file, text=None, image=None, workers=None, progress=None):
+    if text:
+        watermark_pdf = text_watermark(text)
+    elif image:
+        if not os.path.exists(image):
+            raise ValueError("Invalid watermark image path.")
+        watermark_pdf = image_watermark(image)
+    else:
+        raise ValueError("Please give watermark text or an image.")
+
+    # Every page range carries its own copy of the watermark. Writers that can (pypdf >= 5)
+    # fold the copies back into one; otherwise an image, which would be stored once per
+    # range, is stamped in a single pass instead
+    can_fold = hasattr(PyPDF2.PdfWriter, "compress_identical_objects")
+    count = page_count(pdf_file)
+    if image and not text and not can_fold:
+        parts = [stamp_pages(pdf_file, range(count), watermark_pdf, progress)]
+    else:
+        parts = run_pages(stamp_pages, pdf_file, count, (watermark_pdf,), workers, progress)
+
+    if len(parts) == 1:
+        with open(output_file, "wb") as f:
+            f.write(parts[0])
+        return output_file
+    writer = PyPDF2.PdfWriter()
+    for part in parts:
+        writer.append(PyPDF2.PdfReader(io.BytesIO(part)))
+    if can_fold:
+        writer.compress_identical_objects()
+    with open(output_file, "wb") as f:
+        writer.write(f)
+    return output_file
+
+
+def convert_to_images(pdf_file, output_dir, dpi=None, workers=None, progress=None):
+    os.makedirs(output_dir, exist_ok=True)
+    parts = run_pages(render_pages, pdf_file, page_count(pdf_file), (output_dir, dpi), workers, progress)
+    return [path for part in parts for path in part]
+
+
+def extract_text_with_ocr(pdf_file, output_file, dpi=None, language="eng", workers=None, progress=None):
+    if pytesseract is None:
+        raise RuntimeError("pytesseract is not installed.")
+    # Checked here because Tesseract's own error cannot be sent back from a worker process
+    try:
+        pytesseract.get_tesseract_version()
+    except pytesseract.TesseractNotFoundError:
+        raise RuntimeError("Tesseract is not installed or not on PATH.")
+    parts = run_pages(ocr_pages, pdf_file, page_count(pdf_file), (dpi, language), workers, progress)
+    full_text = "".join(text for part in parts for text in part)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(full_text)
+    return output_file
+
+
+def print_progress(done, total):
+    print(f"\r{done}/{total}", end="\n" if done == total else "", file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless PDF operations (page-level work runs on every core)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    merge = subparsers.add_parser("merge", help="Merge PDFs in the given order")
+    merge.add_argument("pdf_files", nargs="+")
+    merge.add_argument("-o", "--output", default="merged.pdf")
+
+    split = subparsers.add_parser("split", help="Split a PDF in two after a page")
+    split.add_argument("pdf_file")
+    split.add_argument("--after", type=int, required=True, help="Last page of the first part")
+    split.add_argument("-o", "--output-dir", default=".")
+
+    rotate = subparsers.add_parser("rotate", help="Rotate every page")
+    rotate.add_argument("pdf_file")
+    rotate.add_argument("--angle", type=int, default=90, help="Rotation in degrees (multiple of 90)")
+    rotate.add_argument("-o", "--output", default="rotated.pdf")
+
+    watermark = subparsers.add_parser("watermark", help="Stamp a text or image watermark on every page")
+    watermark.add_argument("pdf_file")
+    source = watermark.add_mutually_exclusive_group(required=True)
+    source.add_argument("--text")
+    source.add_argument("--image")
+    watermark.add_argument("-o", "--output", default="watermarked.pdf")
+
+    images = subparsers.add_parser("images", help="Render every page to PNG")
+    images.add_argument("pdf_file")
+    images.add_argument("--dpi", type=int, default=None, help="Resolution (default: 72)")
+    images.add_argument("-o", "--output-dir", default="converted_images")
+
+    ocr = subparsers.add_parser("ocr", help="Extract text with Tesseract OCR")
+    ocr.add_argument("pdf_file")
+    ocr.add_argument("--dpi", type=int, default=None, help="Render resolution (default: 72)")
+    ocr.add_argument("--language", default="eng", help="Tesseract language")
+    ocr.add_argument("-o", "--output", default="ocr_extracted_text.txt")
+
+    for command in (watermark, images, ocr):
+        command.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "merge":
+            result = merge_pdfs(args.pdf_files, args.output, print_progress)
+        elif args.command == "split":
+            result = ", ".join(split_pdf(args.pdf_file, args.after, args.output_dir, print_progress))
+        elif args.command == "rotate":
+            result = rotate_pages(args.pdf_file, args.angle, args.output, print_progress)
+        elif args.command == "watermark":
+            result = add_watermark(args.pdf_file, args.output, args.text, args.image, args.workers, print_progress)
+        elif args.command == "images":
+            convert_to_images(args.pdf_file, args.output_dir, args.dpi, args.workers, print_progress)
+            result = args.output_dir
+        else:
+            result = extract_text_with_ocr(args.pdf_file, args.output, args.dpi, args.language, args.workers,
+                                           print_progress)
+    except (ValueError, RuntimeError, OSError) as e:
+        parser.error(str(e))
+    print(f"Written to {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import requests
-from bs4 import BeautifulSoup
+from html_extract import parse_html
 import json
 import csv
 import time
@@ -119,7 +119,7 @@ def scrape_product(product_url):
     if not response:
         return None
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = parse_html(response.content)
     
     if "amazon.com" in product_url:
         product_name = soup.find("span", id="productTitle").text.strip() if soup.find("span", id="productTitle") else "N/A"
@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sqlite3
 import requests
-from bs4 import BeautifulSoup
+from html_extract import parse_html
 import schedule
 import time
 import threading
@@ -101,15 +101,15 @@ class PriceTrackerApp:
             headers = {'User-Agent': self.user_agent.random}
             response = requests.get(url, headers=headers, timeout=10)
             response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = parse_html(response.content)
 
             if "amazon.com" in url:
-                name = soup.find('span', {'id': 'productTitle'}).text.strip()
-                price_element = soup.find('span', {'class': 'a-offscreen'})
+                name = soup.find('span', id='productTitle').text.strip()
+                price_element = soup.find('span', class_='a-offscreen')
                 if not price_element:
-                    price_element = soup.find('span', {'class': 'a-price'})
+                    price_element = soup.find('span', class_='a-price')
                     if price_element:
-                        price_element = price_element.find('span', {'class': 'a-offscreen'})
+                        price_element = price_element.find('span', class_='a-offscreen')
 
                 if price_element:
                     price = price_element.text.strip().replace('$', '').replace(',', '')
@@ -118,8 +118,8 @@ class PriceTrackerApp:
                     raise ValueError("Price element not found on Amazon.")
 
             elif "ebay.com" in url:
-                name = soup.find('h1', {'class': 'item-title__mainTitle'}).text.strip()
-                price_element = soup.find('span', {'class': 'ux-price-block__price__text'})
+                name = soup.find('h1', class_='item-title__mainTitle').text.strip()
+                price_element = soup.find('span', class_='ux-price-block__price__text')
                 if price_element:
                     price = price_element.text.strip().replace('$', '').replace(',', '')
                     return name, float(price)
@@ -127,8 +127,8 @@ class PriceTrackerApp:
                     raise ValueError("Price element not found on eBay.")
 
             elif "alibaba.com" in url:
-                name = soup.find('h1', {'class': 'title'}).text.strip()
-                price_element = soup.find('div', {'class': 'price'})
+                name = soup.find('h1', class_='title').text.strip()
+                price_element = soup.find('div', class_='price')
                 if price_element:
                     price = price_element.text.strip().replace('US $', '').replace(',', '')
                     #Alibaba prices can be a range - take the lower value
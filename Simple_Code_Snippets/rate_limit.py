@@ -0,0 +1,26 @@
+import asyncio
+import time
+
+# Shared by network_scanner.py (probes) and web_vuln_scanner.py (HTTP requests).
+
+
+class HostRateLimiter:
+    # Token bucket per host so a wide concurrency window cannot hammer a single target.
+    # Up to `burst` acquisitions go through at once (default: one second's worth).
+    def __init__(self, rate=None, burst=None):
+        self.rate = rate  # acquisitions per second per host, None = unlimited
+        self.burst = burst or (max(1, int(rate)) if rate else 1)
+        self.buckets = {}  # {host: (tokens, last_refill)}
+
+    async def acquire(self, host):
+        if not self.rate:
+            return
+        while True:
+            now = time.monotonic()
+            tokens, last = self.buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self.buckets[host] = (tokens - 1, now)
+                return
+            self.buckets[host] = (tokens, now)
+            await asyncio.sleep((1 - tokens) / self.rate)
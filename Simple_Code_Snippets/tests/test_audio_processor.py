@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import soundfile as sf
+
+from audio_processor import DEFERRED_IMPORTS, RealTimeProcessor, add_echo, add_reverb
+from audio_processor_benchmark import import_times
+
+STARTUP_BUDGET_MS = 300.0  # Same budget as `audio_processor_benchmark.py -s startup`
+
+
+class TestStartup(unittest.TestCase):
+    """Cold start of `import audio_processor` (heavy packages are deferred)."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Best of three fresh interpreters, so one slow start does not fail the suite
+        runs = [import_times("import audio_processor") for _ in range(3)]
+        cls.times = min(runs, key=lambda times: times["audio_processor"][1])
+
+    def test_import_within_budget(self):
+        total_ms = self.times["audio_processor"][1] / 1000
+        self.assertLessEqual(total_ms, STARTUP_BUDGET_MS,
+                             f"import audio_processor took {total_ms:.1f} ms")
+
+    def test_deferred_modules_not_imported(self):
+        leaked = sorted({lazy._module_name for lazy in DEFERRED_IMPORTS.values()
+                         if any(module == lazy._module_name or module.startswith(lazy._module_name + ".")
+                                for module in self.times)})
+        self.assertEqual(leaked, [], "deferred modules imported at startup")
+
+
+class TestRealTimeOffline(unittest.TestCase):
+    """RealTimeProcessor.run_offline must match the whole-file effect functions."""
+
+    rate = 8000
+    chunk = 1024
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.input_file = os.path.join(directory.name, "input.wav")
+        self.output_file = os.path.join(directory.name, "output.wav")
+        # Quiet enough that the chain's final clip to [-1, 1] never engages; the length is
+        # not a multiple of the chunk, so the zero-padded last block is covered too
+        rng = np.random.default_rng(0)
+        self.audio = (0.05 * rng.standard_normal(3 * self.rate + 100)).astype(np.float32)
+        sf.write(self.input_file, self.audio, self.rate, subtype='FLOAT')
+
+    def run_chain(self, effects):
+        processor = RealTimeProcessor(chunk=self.chunk, rate=self.rate)
+        processor.set_effects(effects)
+        stats = processor.run_offline(self.input_file, self.output_file)
+        output, _ = sf.read(self.output_file, dtype='float32')
+        self.assertEqual(stats['blocks'], -(-len(self.audio) // self.chunk))
+        return output
+
+    def test_echo_matches_add_echo(self):
+        # A 0.5 s delay spans several blocks, so the ring buffer carries it across them
+        output = self.run_chain([('echo', {'delay': 0.5, 'decay': 0.6})])
+        np.testing.assert_allclose(output, add_echo(self.audio, self.rate, delay=0.5, decay=0.6), atol=1e-5)
+
+    def test_reverb_matches_add_reverb(self):
+        output = self.run_chain([('reverb', {'reverb_time': 0.5, 'decay_rate': 0.5})])
+        np.testing.assert_allclose(output, add_reverb(self.audio, self.rate, reverb_time=0.5, decay_rate=0.5),
+                                   atol=1e-4)
+
+    def test_chain_matches_composition(self):
+        output = self.run_chain([('echo', {'delay': 0.2}), ('reverb', {})])
+        np.testing.assert_allclose(output, add_reverb(add_echo(self.audio, self.rate, delay=0.2), self.rate),
+                                   atol=1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+import scapy.all as scapy
+
+from network_scanner import NetworkScanner
+
+
+class FakeHost:
+    """Stand-in for scapy.sr: answers SYNs like a host with the given open and closed ports."""
+
+    def __init__(self, open_ports, closed_ports):
+        self.open_ports = set(open_ports)
+        self.closed_ports = set(closed_ports)
+        self.batches = []  # Destination ports of every send, one list per call
+
+    def __call__(self, packets, timeout=None, inter=0, verbose=False):
+        self.batches.append([packet[scapy.TCP].dport for packet in packets])
+        answered = []
+        for packet in packets:
+            port = packet[scapy.TCP].dport
+            if port in self.open_ports:
+                flags = 'SA'
+            elif port in self.closed_ports:
+                flags = 'RA'
+            else:
+                continue  # Filtered: no reply
+            reply = scapy.IP(src=packet[scapy.IP].dst) / scapy.TCP(sport=port, dport=packet[scapy.TCP].sport,
+                                                                   flags=flags)
+            answered.append((packet, reply))
+        return answered, []
+
+
+class TestSynScan(unittest.TestCase):
+    """SYN scan against a fake sender instead of raw sockets."""
+
+    host = "192.0.2.10"
+
+    def make_scanner(self, fake_host, block_size):
+        scanner = NetworkScanner(target_network=self.host, scan_type='syn', max_retries=1)
+        scanner.packet_sender = fake_host
+        scanner.syn_block_size = block_size
+        return scanner
+
+    def test_classification(self):
+        fake_host = FakeHost(open_ports=[22, 80], closed_ports=[23, 443])
+        scanner = self.make_scanner(fake_host, block_size=1024)
+        probes = {(self.host, 40000, port) for port in (22, 23, 80, 443, 8080)}
+        answered, _ = fake_host(scanner.build_syn_packets([self.host], [22, 23, 80, 443, 8080], 40000))
+
+        states = scanner.match_syn_replies(answered, probes)
+
+        self.assertEqual(states, {(self.host, 40000, 22): 'open', (self.host, 40000, 80): 'open',
+                                  (self.host, 40000, 23): 'closed', (self.host, 40000, 443): 'closed'})
+
+    def test_only_open_ports_reported(self):
+        fake_host = FakeHost(open_ports=[22, 80], closed_ports=[23, 443])
+        scanner = self.make_scanner(fake_host, block_size=1024)
+
+        open_ports = scanner.syn_scan([self.host], [22, 23, 80, 443, 8080])
+
+        self.assertEqual(open_ports, {self.host: [22, 80]})
+        self.assertEqual(scanner.stats.counters['open'], 2)
+        self.assertEqual(scanner.stats.counters['timeouts'], 1)  # 8080 stayed silent: filtered
+        self.assertEqual(scanner.stats.in_flight, 0)
+
+    def test_batches_and_retries(self):
+        fake_host = FakeHost(open_ports=[1, 6], closed_ports=[2, 3, 5, 7, 8, 9])
+        scanner = self.make_scanner(fake_host, block_size=4)
+
+        open_ports = scanner.syn_scan([self.host], list(range(1, 11)))
+
+        self.assertEqual(open_ports, {self.host: [1, 6]})
+        # Blocks of four ports; only the unanswered ports of a block are sent again
+        self.assertEqual(fake_host.batches, [[1, 2, 3, 4], [4], [5, 6, 7, 8], [9, 10], [10]])
+        self.assertEqual(scanner.stats.counters['probes'], 12)
+        self.assertEqual(scanner.stats.counters['retries'], 2)
+
+    def test_loopback_socket_restored(self):
+        scanner = self.make_scanner(FakeHost(open_ports=[22], closed_ports=[]), block_size=1024)
+        l3socket = scapy.conf.L3socket
+
+        self.assertEqual(scanner.syn_scan(["127.0.0.1"], [22]), {"127.0.0.1": [22]})
+        self.assertIs(scapy.conf.L3socket, l3socket)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,154 +1,846 @@
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import asyncio
 import re
 import urllib.parse
 import time
 import json
-import sys
+import argparse
+import sqlite3
+import zlib
+import os
+from contextlib import asynccontextmanager
+
+from html_extract import BACKENDS, extract_page
+from rate_limit import HostRateLimiter
+
+# Database error signatures. Literal entries are matched case-insensitively;
+# entries with "regex": True are compiled as bytes regular expressions.
+DEFAULT_SIGNATURES = [
+    {"name": "SQL syntax", "pattern": "SQL syntax"},
+    {"name": "MySQL", "pattern": "MySQL"},
+    {"name": "MariaDB", "pattern": "MariaDB"},
+    {"name": "SQLSTATE", "pattern": "SQLSTATE"},
+    {"name": "MySQL warning", "pattern": r"Warning.{1,40}\Wmysqli?_", "regex": True},
+    {"name": "MySQL fetch", "pattern": "mysql_fetch_array()"},
+    {"name": "MySQL num rows", "pattern": "mysql_num_rows()"},
+    {"name": "MySQLSyntaxErrorException", "pattern": "MySqlException"},
+    {"name": "MySQL check manual", "pattern": "check the manual that corresponds to your MySQL server version"},
+    {"name": "MySQL unknown column", "pattern": r"Unknown column '[^']+' in '(?:field list|where clause)'", "regex": True},
+    {"name": "MySQL JDBC", "pattern": "com.mysql.jdbc"},
+    {"name": "PostgreSQL error", "pattern": "PostgreSQL query failed"},
+    {"name": "PostgreSQL pg_query", "pattern": r"Warning.{1,40}\Wpg_", "regex": True},
+    {"name": "PostgreSQL valid result", "pattern": "valid PostgreSQL result"},
+    {"name": "PostgreSQL Npgsql", "pattern": "Npgsql."},
+    {"name": "PostgreSQL PSQLException", "pattern": "org.postgresql.util.PSQLException"},
+    {"name": "PostgreSQL psycopg2", "pattern": "psycopg2.errors"},
+    {"name": "PostgreSQL unterminated", "pattern": "unterminated quoted string at or near"},
+    {"name": "PostgreSQL syntax", "pattern": r"syntax error at or near \"", "regex": True},
+    {"name": "MSSQL driver", "pattern": "Driver.{0,20}SQL[\\-\\_\\ ]*Server", "regex": True},
+    {"name": "MSSQL OLE DB", "pattern": "OLE DB.{0,20}SQL Server", "regex": True},
+    {"name": "MSSQL SqlException", "pattern": "System.Data.SqlClient.SqlException"},
+    {"name": "MSSQL unclosed quotation", "pattern": "Unclosed quotation mark after the character string"},
+    {"name": "MSSQL incorrect syntax", "pattern": "Incorrect syntax near"},
+    {"name": "MSSQL mssql_query", "pattern": r"Warning.{1,40}\W(?:mssql|sqlsrv)_", "regex": True},
+    {"name": "MSSQL JDBC", "pattern": "com.microsoft.sqlserver.jdbc"},
+    {"name": "MSSQL ODBC", "pattern": "[Microsoft][ODBC SQL Server Driver]"},
+    {"name": "MSSQL ODBC Driver", "pattern": r"\[SQL Server\]", "regex": True},
+    {"name": "MS Access JET", "pattern": "Microsoft JET Database Engine"},
+    {"name": "MS Access ODBC", "pattern": "[Microsoft][ODBC Microsoft Access Driver]"},
+    {"name": "MS Access syntax", "pattern": "Syntax error in query expression"},
+    {"name": "Oracle ORA", "pattern": r"\bORA-[0-9]{5}", "regex": True},
+    {"name": "Oracle error", "pattern": "Oracle error"},
+    {"name": "Oracle driver", "pattern": "Oracle.{0,20}Driver", "regex": True},
+    {"name": "Oracle oci", "pattern": r"Warning.{1,40}\W(?:oci|ora)_", "regex": True},
+    {"name": "Oracle JDBC", "pattern": "oracle.jdbc"},
+    {"name": "Oracle quoted string", "pattern": "quoted string not properly terminated"},
+    {"name": "SQLite error", "pattern": "SQLite/JDBCDriver"},
+    {"name": "SQLite exception", "pattern": "SQLite.Exception"},
+    {"name": "SQLite System.Data", "pattern": "System.Data.SQLite.SQLiteException"},
+    {"name": "SQLite warning", "pattern": r"Warning.{1,40}\W(?:sqlite_|SQLite3::)", "regex": True},
+    {"name": "SQLite error prefix", "pattern": "SQLite error"},
+    {"name": "SQLite3 OperationalError", "pattern": "sqlite3.OperationalError"},
+    {"name": "SQLite unrecognized token", "pattern": "unrecognized token:"},
+    {"name": "SQLite near syntax", "pattern": r"near \"[^\"]*\": syntax error", "regex": True},
+    {"name": "DB2 SQL error", "pattern": "DB2 SQL error"},
+    {"name": "DB2 CLI", "pattern": "CLI Driver.{0,20}DB2", "regex": True},
+    {"name": "DB2 SQLCODE", "pattern": r"\bSQLCODE[=:\s]+-?\d+", "regex": True},
+    {"name": "DB2 JDBC", "pattern": "com.ibm.db2.jcc"},
+    {"name": "Informix", "pattern": "Exception.{0,40}Informix", "regex": True},
+    {"name": "Informix ODBC", "pattern": "Informix ODBC Driver"},
+    {"name": "Sybase", "pattern": "Sybase message"},
+    {"name": "Sybase JDBC", "pattern": "com.sybase.jdbc"},
+    {"name": "Ingres", "pattern": "Ingres SQLSTATE"},
+    {"name": "Firebird", "pattern": "Dynamic SQL Error"},
+    {"name": "HSQLDB", "pattern": "org.hsqldb.jdbc"},
+    {"name": "H2", "pattern": "org.h2.jdbc"},
+    {"name": "SAP MaxDB", "pattern": "SAP DBTech JDBC"},
+    {"name": "Hibernate", "pattern": "org.hibernate.QueryException"},
+    {"name": "PDOException", "pattern": "PDOException"},
+    {"name": "Zend DB", "pattern": "Zend_Db_Statement"},
+    {"name": "Doctrine", "pattern": "Doctrine\\DBAL\\"},
+    {"name": "ActiveRecord", "pattern": "ActiveRecord::StatementInvalid"},
+    {"name": "Sequelize", "pattern": "SequelizeDatabaseError"},
+    {"name": "SQLAlchemy", "pattern": "sqlalchemy.exc."},
+    {"name": "Django DB", "pattern": "django.db.utils."},
+    {"name": "ODBC generic", "pattern": "ODBC Driver Manager"},
+    {"name": "JDBC generic", "pattern": "java.sql.SQLException"},
+    {"name": "ADODB", "pattern": "ADODB.Field error"},
+    {"name": "Unterminated string", "pattern": "unterminated string literal"},
+]
+
+
+class SignatureMatcher:
+    # All signatures are folded into one prefix trie of lowercase literal "anchors" and
+    # compiled into a single bytes regex, so adding signatures adds almost nothing to the
+    # per-byte cost. Regex signatures are anchored on their leading literal text and only
+    # evaluated where that anchor occurs.
+    def __init__(self, signatures=None, window=256):
+        self.signatures = []  # [{"name", "pattern", "category", "regex", "anchor"}]
+        self.window = window  # Bytes carried between chunks so matches can span chunk borders
+        self.pattern = None  # Trie regex over the anchors, matched against lowercased bytes
+        self.anchors = {}  # {lowercase anchor bytes: [entry]}
+        self.unanchored = None  # Combined regex for signatures without a usable anchor
+        self.unanchored_entries = []
+        self.overlap = window
+        for signature in signatures or []:
+            self.add(**signature)
+
+    def add(self, name, pattern, category="sqli", regex=False, anchor=None):
+        self.signatures.append({"name": name, "pattern": pattern, "category": category,
+                                "regex": regex, "anchor": anchor})
+        self.pattern = None
+
+    def load(self, path):
+        with open(path) as f:
+            for signature in json.load(f):
+                self.add(**signature)
+
+    def compile(self):
+        self.anchors = {}
+        self.unanchored_entries = []
+        for signature in self.signatures:
+            entry = {"name": signature["name"], "category": signature["category"], "regex": None}
+            if signature["regex"]:
+                entry["regex"] = re.compile(signature["pattern"].encode(), re.IGNORECASE | re.DOTALL)
+                anchor = signature["anchor"] or self.literal_prefix(signature["pattern"])
+                if len(anchor) < 3:
+                    self.unanchored_entries.append(entry)
+                    continue
+            else:
+                anchor = signature["pattern"]
+            self.anchors.setdefault(anchor.encode().lower(), []).append(entry)
+
+        trie = {}
+        for anchor in self.anchors:
+            node = trie
+            for byte in anchor:
+                node = node.setdefault(byte, {})
+            node[None] = True
+        self.pattern = re.compile(self.trie_regex(trie)) if trie else None
+        self.unanchored = None
+        if self.unanchored_entries:
+            self.unanchored = re.compile(b"|".join(b"(?P<u%d>%s)" % (i, entry["regex"].pattern)
+                                                   for i, entry in enumerate(self.unanchored_entries)),
+                                         re.IGNORECASE | re.DOTALL)
+        self.overlap = max([self.window] + [len(anchor) for anchor in self.anchors])
+        return self
+
+    def trie_regex(self, node):
+        branches = [re.escape(bytes([byte])) + self.trie_regex(child)
+                    for byte, child in sorted((k, v) for k, v in node.items() if k is not None)]
+        if not branches:
+            return b""
+        if len(branches) == 1 and None not in node:
+            return branches[0]
+        return b"(?:" + b"|".join(branches) + b")" + (b"?" if None in node else b"")
+
+    @staticmethod
+    def literal_prefix(pattern):
+        # Leading literal text of a regex; empty when the regex has a top-level alternation
+        depth = 0
+        escaped = False
+        for ch in pattern:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+            elif ch == "|" and depth == 0:
+                return ""
+
+        prefix = []
+        i = 2 if pattern.startswith("\\b") else 0
+        while i < len(pattern):
+            ch = pattern[i]
+            step = 1
+            if ch == "\\":
+                if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                    break
+                ch = pattern[i + 1]
+                step = 2
+            elif ch in ".^$*+?{}[]|()":
+                break
+            following = pattern[i + step:i + step + 1]
+            if following in ("*", "?", "{"):
+                break
+            prefix.append(ch)
+            if following == "+":
+                break
+            i += step
+        return "".join(prefix)
+
+    def stream(self, literals=(), categories=None, stop_on_first=True):
+        if self.pattern is None and self.signatures:
+            self.compile()
+        return SignatureStream(self, literals, categories, stop_on_first)
+
+
+class SignatureStream:
+    # Feeds response bytes chunk by chunk; only a small tail is kept between chunks,
+    # so the body is never buffered or decoded as a whole
+    def __init__(self, matcher, literals, categories, stop_on_first):
+        self.matcher = matcher
+        self.literals = [literal.encode() if isinstance(literal, str) else literal for literal in literals]
+        self.categories = categories
+        self.stop_on_first = stop_on_first
+        self.overlap = max([matcher.overlap] + [len(literal) for literal in self.literals])
+        self.tail = b""
+        self.matches = {}  # {name: category}
+        self.done = False
+
+    def add(self, entry):
+        if self.categories is None or entry["category"] in self.categories:
+            self.matches[entry["name"]] = entry["category"]
+        self.done = self.stop_on_first and bool(self.matches)
+
+    def feed(self, chunk):
+        # Returns True once nothing more needs to be read
+        if self.done:
+            return True
+        buffer = self.tail + chunk
+        self.tail = buffer[-self.overlap:]
+        for literal in self.literals:
+            if literal in buffer:
+                # Reflected literals are always reported; `categories` only filters signatures
+                self.matches[literal.decode(errors="replace")] = "reflection"
+                self.done = self.stop_on_first
+        if self.done or self.categories == ():
+            return self.done
+
+        if self.matcher.pattern is not None:
+            for match in self.matcher.pattern.finditer(buffer.lower()):
+                hit = match.group()
+                # Every anchor that is a prefix of the hit, not just the longest one
+                for end in range(len(hit), 0, -1):
+                    for entry in self.matcher.anchors.get(hit[:end], ()):
+                        if entry["regex"] is None or entry["regex"].match(buffer, match.start()):
+                            self.add(entry)
+                            if self.done:
+                                return True
+        if self.matcher.unanchored is not None:
+            for match in self.matcher.unanchored.finditer(buffer):
+                self.add(self.matcher.unanchored_entries[int(match.lastgroup[1:])])
+                if self.done:
+                    return True
+        return self.done
+
+
+class HttpCache:
+    # On-disk response cache keyed by (method, normalized URL). Bodies are stored
+    # zlib-compressed next to their validators (ETag / Last-Modified) and, for crawled
+    # pages, the forms and links parsed from them, so an unchanged page costs one
+    # conditional request and no parsing on the next scan.
+    def __init__(self, path="web_scan_cache.db", commit_every=100):
+        self.path = path
+        self.commit_every = commit_every
+        self.pending = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                method TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                forms TEXT,
+                links TEXT,
+                fetched_at REAL NOT NULL,
+                validated_at REAL NOT NULL,
+                PRIMARY KEY (method, url)
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, method, url):
+        row = self.conn.execute("SELECT * FROM http_cache WHERE method = ? AND url = ?", (method, url)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["headers"] = json.loads(entry["headers"])
+        entry["forms"] = json.loads(entry["forms"]) if entry["forms"] is not None else None
+        entry["links"] = json.loads(entry["links"]) if entry["links"] is not None else None
+        return entry
+
+    def body(self, entry):
+        return zlib.decompress(entry["body"])
+
+    def put(self, method, url, response, body, forms=None, links=None):
+        # Only responses that can be revalidated are worth keeping
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO http_cache "
+            "(method, url, status, headers, body, etag, last_modified, forms, links, fetched_at, validated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (method, url, response.status, json.dumps(dict(response.headers)), zlib.compress(body),
+             etag, last_modified,
+             json.dumps(forms) if forms is not None else None,
+             json.dumps(links) if links is not None else None, now, now))
+        self.mark_dirty()
+        return True
+
+    def touch(self, method, url, forms=None, links=None):
+        # A 304 confirmed the stored copy is still current; parse results given here are
+        # stored with it (entries written without them get them on first revalidation)
+        if forms is None:
+            self.conn.execute("UPDATE http_cache SET validated_at = ? WHERE method = ? AND url = ?",
+                              (time.time(), method, url))
+        else:
+            self.conn.execute("UPDATE http_cache SET validated_at = ?, forms = ?, links = ? "
+                              "WHERE method = ? AND url = ?",
+                              (time.time(), json.dumps(forms), json.dumps(links), method, url))
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        self.conn.commit()
+        self.pending = 0
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry is None:
+            return headers
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+class FindingsLog:
+    # Append-only JSON Lines log of confirmed findings. Every line is flushed so `tail -f`
+    # sees it at once; fsync is batched (every `sync_every` findings or `sync_interval`
+    # seconds) so a crash loses at most one batch while the scan never waits on the disk
+    # per finding. A new scan truncates the log; resuming an interrupted scan appends to
+    # it, so what was already found is kept and compaction drops the repeats.
+    def __init__(self, path, resume=False, sync_every=20, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.file = open(path, "a" if resume else "w")
+        if self.file.tell() and not self.ends_with_newline():
+            self.file.write("\n")  # Finish a line torn by a crash so the next record parses
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.count = 0
+
+    def ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+        self.pending += 1
+        if self.pending >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def add(self, finding):
+        self.count += 1
+        self.write(dict(finding, type="finding", found_at=time.time()))
+
+    def sync(self):
+        if self.pending:
+            os.fsync(self.file.fileno())
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+
+SEVERITY_ORDER = ["Critical", "High", "Medium", "Low", "Info"]
+
+
+def read_findings_log(path):
+    # Yields records from a findings log; a torn last line from a crash is skipped
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def compact_findings(log_path, report_path, target_url=None):
+    # Folds a findings log into the summary report: duplicates dropped, findings grouped
+    # by URL and vulnerability type, severity counts per URL and overall. Only the last
+    # scan counts: a scan marker that is not a resume discards everything before it.
+    scan = {}
+    urls = {}
+    seen = set()
+    for record in read_findings_log(log_path):
+        if record.get("type") == "scan":
+            if not record.get("resumed") or not scan:
+                scan = record
+                urls = {}
+                seen = set()
+            continue
+        key = (record["url"], record["vulnerability"], record["method"], record["payload"])
+        if key in seen:
+            continue
+        seen.add(key)
+        vulnerabilities = urls.setdefault(record["url"], {})
+        group = vulnerabilities.setdefault(record["vulnerability"], {
+            "vulnerability": record["vulnerability"],
+            "severity": record["severity"],
+            "remediation": record["remediation"],
+            "findings": []
+        })
+        group["findings"].append({k: record[k] for k in ("payload", "method", "data", "evidence", "found_at")
+                                  if k in record})
+
+    def severity_rank(severity):
+        return SEVERITY_ORDER.index(severity) if severity in SEVERITY_ORDER else len(SEVERITY_ORDER)
+
+    def count_severities(groups):
+        counts = {}
+        for group in groups:
+            counts[group["severity"]] = counts.get(group["severity"], 0) + len(group["findings"])
+        return dict(sorted(counts.items(), key=lambda item: severity_rank(item[0])))
+
+    url_reports = []
+    for url, vulnerabilities in urls.items():
+        groups = sorted(vulnerabilities.values(), key=lambda group: (severity_rank(group["severity"]), group["vulnerability"]))
+        url_reports.append({"url": url, "severity_counts": count_severities(groups), "vulnerabilities": groups})
+    url_reports.sort(key=lambda report: (min(severity_rank(g["severity"]) for g in report["vulnerabilities"]), report["url"]))
+
+    all_groups = [group for report in url_reports for group in report["vulnerabilities"]]
+    report = {
+        "target_url": target_url or scan.get("target_url"),
+        "scan_time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(scan.get("started_at", time.time()))),
+        "findings": len(seen),
+        "severity_counts": count_severities(all_groups),
+        "urls": url_reports
+    }
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=4)
+    return report
+
 
 class WebsiteVulnerabilityScanner:
-    def __init__(self, target_url, report_file="vulnerability_report.json"):
+    sqli_payloads = ["' OR '1'='1", '" OR "1"="1', "'; DROP TABLE users;--"]
+    xss_payloads = ["<script>alert('XSS')</script>", "<img src=x onerror=alert('XSS')>", "\"><script>alert('XSS')</script>"]
+
+    def __init__(self, target_url, report_file="vulnerability_report.json", max_concurrency=20,
+                 per_host_limit=4, crawl_delay=0.0, max_depth=5, max_pages=10000, timeout=5,
+                 attack_workers=None, host_rate_limit=None, test_both_methods=False,
+                 signatures=None, cache=None, html_backend="auto", findings_log=None, resume=False):
         self.target_url = target_url
         self.report_file = report_file
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"})
-        self.vulnerabilities = []
+        self.headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
+        self.session = None  # aiohttp.ClientSession, only open while a scan runs
+        self.max_concurrency = max_concurrency  # Requests in flight across all hosts
+        self.per_host_limit = per_host_limit  # Politeness: requests in flight per host
+        self.crawl_delay = crawl_delay  # Politeness: pause after each request to a host
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.scope_prefix = self.normalize_url(target_url)
+        # Findings go straight to this JSON Lines log; the report is compacted from it
+        self.findings_log_file = findings_log or os.path.splitext(report_file)[0] + ".jsonl"
+        self.findings_log = None
+        self.resume = resume  # Append to the findings log of an interrupted scan
         self.forms = []
         self.links = []
-        self.crawled = set()
+        self.crawled = set()  # Normalized URLs already queued (dedupe set)
+        self.pages_fetched = 0
         self.report = {}
+        self.attack_workers = attack_workers or max_concurrency  # Workers draining the attack queue
+        self.rate_limiter = HostRateLimiter(host_rate_limit)
+        self.test_both_methods = test_both_methods  # Also send each payload with the other HTTP method
+        self.request_semaphore = None
+        self.host_semaphores = {}
+        self.attack_queue = None
+        self.form_signatures = set()  # (method, action, input names) already scheduled
+        self.duplicate_forms = 0
+        self.signatures = signatures or SignatureMatcher(DEFAULT_SIGNATURES)
+        self.signatures.compile()
+        self.cache = cache  # Optional HttpCache; re-scans revalidate instead of refetching
+        self.cache_hits = 0  # Responses answered 304 and served from the cache
+        self.html_backend = html_backend  # html_extract backend used to pull forms and links
 
-    def crawl_website(self, url):
-        try:
-            response = self.session.get(url, timeout=5)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+    def normalize_url(self, url):
+        # Lowercase scheme/host, drop default ports, fragments and duplicate slashes,
+        # and sort query parameters so equivalent URLs dedupe to one entry
+        parsed = urllib.parse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        host = (parsed.hostname or "").lower()
+        port = parsed.port
+        if port is None or (scheme, port) in (("http", 80), ("https", 443)):
+            netloc = host
+        else:
+            netloc = f"{host}:{port}"
+        path = re.sub(r"/{2,}", "/", parsed.path) or "/"
+        query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)))
+        return urllib.parse.urlunsplit((scheme, netloc, path, query, ""))
+
+    def host_semaphore(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self.host_semaphores[host]
 
-            self.extract_forms(soup, url)
-            self.extract_links(soup, url)
+    @asynccontextmanager
+    async def request(self, method, url, **kwargs):
+        # Every request goes through the global and the per-host limits
+        await self.rate_limiter.acquire(urllib.parse.urlsplit(url).netloc)
+        async with self.request_semaphore, self.host_semaphore(url):
+            try:
+                async with self.session.request(method, url, **kwargs) as response:
+                    response.raise_for_status()
+                    yield response
+            finally:
+                if self.crawl_delay:
+                    await asyncio.sleep(self.crawl_delay)
 
-        except requests.exceptions.RequestException as e:
+    async def fetch(self, method, url, **kwargs):
+        async with self.request(method, url, **kwargs) as response:
+            body = await response.read()
+        return response, body
+
+    async def crawl_website(self, url):
+        cached = self.cache.get("GET", url) if self.cache else None
+        try:
+            response, body = await self.fetch("GET", url, headers=HttpCache.conditional_headers(cached))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"Error crawling {url}: {e}")
-            return
-
-    def extract_forms(self, soup, url):
-        forms = soup.find_all('form')
-        for form in forms:
-            form_details = {
-                "action": form.attrs.get("action"),
-                "method": form.attrs.get("method", "get").lower(),
-                "inputs": []
-            }
-            for input_field in form.find_all("input"):
-                input_details = {
-                    "type": input_field.attrs.get("type", "text"),
-                    "name": input_field.attrs.get("name"),
-                    "value": input_field.attrs.get("value", "")
-                }
-                form_details["inputs"].append(input_details)
-            self.forms.append({"url": url, "form": form_details})
-
-    def extract_links(self, soup, url):
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag.attrs['href']
-            absolute_url = urllib.parse.urljoin(url, href)
-            parsed_url = urllib.parse.urlparse(absolute_url)
-            absolute_url = parsed_url.scheme + "://" + parsed_url.netloc + parsed_url.path
-            if absolute_url.startswith(self.target_url) and absolute_url not in self.crawled:
+            return []
+
+        if response.status == 304 and cached is not None:
+            # Unchanged page: reuse what was parsed from it last time
+            self.cache_hits += 1
+            if cached["forms"] is not None:
+                forms, links = cached["forms"], cached["links"]
+            else:
+                # Stored without parse results: parse the stored copy (the 304 has no body)
+                forms, hrefs = extract_page(self.cache.body(cached), self.html_backend)
+                links = self.extract_links(hrefs, url)
+            self.cache.touch("GET", url, forms, links)
+        elif "html" not in response.headers.get("Content-Type", "text/html"):
+            return []
+        else:
+            forms, hrefs = extract_page(body, self.html_backend)
+            links = self.extract_links(hrefs, url)
+            if self.cache and response.status == 200:
+                self.cache.put("GET", url, response, body, forms, links)
+
+        self.add_forms(forms, url)
+        return self.add_links(links)
+
+    def add_forms(self, forms, url):
+        for form_details in forms:
+            form = {"url": url, "form": form_details}
+            # The same form repeated across pages (same action and inputs) is tested once
+            signature = self.form_signature(form)
+            if signature in self.form_signatures:
+                self.duplicate_forms += 1
+                continue
+            self.form_signatures.add(signature)
+            self.forms.append(form)
+            self.schedule_attacks(form)
+
+    def extract_links(self, hrefs, url):
+        # In-scope, normalized links of a page (this is what gets cached per page)
+        links = []
+        for href in hrefs:
+            try:
+                absolute_url = self.normalize_url(urllib.parse.urljoin(url, href))
+            except ValueError:  # Malformed href (bad port, invalid IPv6 literal): drop just this link
+                continue
+            if absolute_url.startswith(self.scope_prefix):
+                links.append(absolute_url)
+        return links
+
+    def add_links(self, links):
+        new_links = []
+        for absolute_url in links:
+            if absolute_url not in self.crawled:
                 self.links.append(absolute_url)
                 self.crawled.add(absolute_url)
+                new_links.append(absolute_url)
+        return new_links
 
-    def sqli_test(self, form_details):
-         sqli_payloads = ["' OR '1'='1", '" OR "1"="1', "'; DROP TABLE users;--"]
-
-         for payload in sqli_payloads:
-            data = {}
-            for input_field in form_details["form"]["inputs"]:
-                 if input_field["type"] == "hidden":
-                     data[input_field["name"]] = input_field["value"]
-                 elif input_field["name"]:
-                     data[input_field["name"]] = payload
-            
-            url = urllib.parse.urljoin(form_details["url"], form_details["form"]["action"])
+    async def crawl_worker(self, frontier):
+        while True:
+            url, depth = await frontier.get()
             try:
-                if form_details["form"]["method"] == "post":
-                    response = self.session.post(url, data=data, timeout=5)
-                else:
-                    response = self.session.get(url, params=data, timeout=5)
-
-                response.raise_for_status()
-
-                if re.search(r"SQL syntax|MySQL|MariaDB|SQLSTATE", response.text, re.IGNORECASE):
-                    self.vulnerabilities.append({
-                         "url": url,
-                         "vulnerability": "SQL Injection",
-                         "payload": payload,
-                         "method": form_details["form"]["method"],
-                         "data": data,
-                         "remediation": "Use parameterized queries or prepared statements.  Sanitize user inputs.  Implement least privilege principle for database access.",
-                         "severity": "Critical"
-                    })
-
-            except requests.exceptions.RequestException as e:
-                print(f"Error during SQLi test on {url}: {e}")
-
-    def xss_test(self, form_details):
-         xss_payloads = ["<script>alert('XSS')</script>", "<img src=x onerror=alert('XSS')>", "\"><script>alert('XSS')</script>"]
-         
-         for payload in xss_payloads:
-            data = {}
-            for input_field in form_details["form"]["inputs"]:
-                if input_field["type"] == "hidden":
-                    data[input_field["name"]] = input_field["value"]
-                elif input_field["name"]:
-                    data[input_field["name"]] = payload
-
-            url = urllib.parse.urljoin(form_details["url"], form_details["form"]["action"])
+                if self.pages_fetched >= self.max_pages:
+                    continue
+                self.pages_fetched += 1
+                links = await self.crawl_website(url)
+                if depth < self.max_depth:
+                    for link in links:
+                        frontier.put_nowait((link, depth + 1))
+            except Exception as e:
+                # A dead worker would leave frontier.join() waiting forever
+                print(f"Error processing {url}: {e}")
+            finally:
+                frontier.task_done()
+
+    async def crawl(self):
+        # Breadth-first frontier shared by max_concurrency workers, bounded by
+        # max_depth and max_pages; the crawled set keeps every URL to a single fetch
+        frontier = asyncio.Queue()
+        start_url = self.normalize_url(self.target_url)
+        self.crawled.add(start_url)
+        frontier.put_nowait((start_url, 0))
+
+        workers = [asyncio.ensure_future(self.crawl_worker(frontier)) for _ in range(self.max_concurrency)]
+        await frontier.join()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def form_action_url(self, form_details):
+        return self.normalize_url(urllib.parse.urljoin(form_details["url"], form_details["form"]["action"] or ""))
+
+    def form_signature(self, form_details):
+        names = tuple(sorted(field["name"] for field in form_details["form"]["inputs"] if field["name"]))
+        return (form_details["form"]["method"], self.form_action_url(form_details), names)
+
+    def schedule_attacks(self, form_details):
+        # Queue the cross product form x payload x method; forms are tested while the crawl runs
+        methods = [form_details["form"]["method"]]
+        if self.test_both_methods:
+            methods.append("get" if methods[0] == "post" else "post")
+        for method in methods:
+            for payload in self.sqli_payloads:
+                self.attack_queue.put_nowait((self.sqli_test, form_details, payload, method))
+            for payload in self.xss_payloads:
+                self.attack_queue.put_nowait((self.xss_test, form_details, payload, method))
+
+    def build_form_data(self, form_details, payload):
+        data = {}
+        for input_field in form_details["form"]["inputs"]:
+            if not input_field["name"]:
+                continue
+            if input_field["type"] == "hidden":
+                data[input_field["name"]] = input_field["value"]
+            else:
+                data[input_field["name"]] = payload
+        return data
+
+    async def submit_form(self, url, method, data, literals=(), categories=None):
+        # Streams the response through the signature matcher and stops reading at the first hit.
+        # GET attacks are revalidated against the cache; POSTs always go to the server.
+        kwargs = {"data": data} if method == "post" else {"params": data}
+        stream = self.signatures.stream(literals, categories)
+        key = None
+        cached = None
+        if self.cache and method == "get":
+            key = self.normalize_url(url + ("&" if "?" in url else "?") + urllib.parse.urlencode(data))
+            cached = self.cache.get("GET", key)
+            kwargs["headers"] = HttpCache.conditional_headers(cached)
+
+        async with self.request(method.upper(), url, **kwargs) as response:
+            if response.status == 304 and cached is not None:
+                self.cache_hits += 1
+                self.cache.touch("GET", key)
+                stream.feed(self.cache.body(cached))
+                return stream.matches
+            chunks = [] if key is not None else None
+            async for chunk in response.content.iter_chunked(65536):
+                if chunks is not None:
+                    chunks.append(chunk)
+                if stream.feed(chunk):
+                    break
+            else:
+                # Only fully read bodies are cached
+                if chunks is not None:
+                    self.cache.put("GET", key, response, b"".join(chunks))
+        return stream.matches
+
+    async def sqli_test(self, form_details, payload, method):
+        data = self.build_form_data(form_details, payload)
+        url = self.form_action_url(form_details)
+        try:
+            matches = await self.submit_form(url, method, data, categories={"sqli"})
+
+            if matches:
+                self.findings_log.add({
+                     "url": url,
+                     "vulnerability": "SQL Injection",
+                     "payload": payload,
+                     "method": method,
+                     "data": data,
+                     "evidence": sorted(matches),
+                     "remediation": "Use parameterized queries or prepared statements.  Sanitize user inputs.  Implement least privilege principle for database access.",
+                     "severity": "Critical"
+                })
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error during SQLi test on {url}: {e}")
+
+    async def xss_test(self, form_details, payload, method):
+        data = self.build_form_data(form_details, payload)
+        url = self.form_action_url(form_details)
+        try:
+            matches = await self.submit_form(url, method, data, literals=[payload], categories=())
+
+            if matches:
+                self.findings_log.add({
+                    "url": url,
+                    "vulnerability": "XSS",
+                    "payload": payload,
+                    "method": method,
+                    "data": data,
+                    "remediation": "Encode output. Sanitize input.  Use a Content Security Policy (CSP).",
+                    "severity": "High"
+                })
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error during XSS test on {url}: {e}")
+
+    async def attack_worker(self):
+        while True:
+            test, form_details, payload, method = await self.attack_queue.get()
+            try:
+                await test(form_details, payload, method)
+            except Exception as e:
+                # One bad form (e.g. an unusable action URL) must not stop the other jobs
+                print(f"Error running {test.__name__} on form {form_details['form']['action']!r} "
+                      f"of {form_details['url']}: {e}")
+            finally:
+                self.attack_queue.task_done()
+
+    async def perform_attacks(self):
+        # Attacks are queued as the crawler finds forms; wait for the queue to drain
+        await self.attack_queue.join()
+
+    async def scan(self):
+        self.request_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.host_semaphores = {}
+        self.attack_queue = asyncio.Queue()
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(headers=self.headers, timeout=timeout) as session:
+            self.session = session
+            workers = [asyncio.ensure_future(self.attack_worker()) for _ in range(self.attack_workers)]
             try:
-                if form_details["form"]["method"] == "post":
-                    response = self.session.post(url, data=data, timeout=5)
-                else:
-                    response = self.session.get(url, params=data, timeout=5)
-                response.raise_for_status()
-
-                if payload in response.text:
-                    self.vulnerabilities.append({
-                        "url": url,
-                        "vulnerability": "XSS",
-                        "payload": payload,
-                        "method": form_details["form"]["method"],
-                        "data": data,
-                        "remediation": "Encode output. Sanitize input.  Use a Content Security Policy (CSP).",
-                        "severity": "High"
-                    })
-            except requests.exceptions.RequestException as e:
-                print(f"Error during XSS test on {url}: {e}")
-
-    def perform_attacks(self):
-        for form in self.forms:
-            self.sqli_test(form)
-            self.xss_test(form)
+                await self.crawl()
+                print(f"Crawling finished. Fetched {self.pages_fetched} pages, found {len(self.links)} links and "
+                      f"{len(self.forms)} unique forms ({self.duplicate_forms} duplicates skipped).")
+                await self.perform_attacks()
+                if self.cache:
+                    print(f"{self.cache_hits} responses were unchanged and served from the cache.")
+            finally:
+                if self.cache:
+                    self.cache.commit()
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                self.session = None
 
     def run_scanner(self):
-        self.crawl_website(self.target_url)
-        print(f"Crawling finished. Found {len(self.links)} links and {len(self.forms)} forms.")
-        self.perform_attacks()
+        self.findings_log = FindingsLog(self.findings_log_file, resume=self.resume)
+        self.findings_log.write({"type": "scan", "target_url": self.target_url, "started_at": time.time(),
+                                 "resumed": self.resume})
+        try:
+            asyncio.run(self.scan())
+        finally:
+            self.findings_log.close()
         self.generate_report()
 
     def generate_report(self):
-        self.report["target_url"] = self.target_url
-        self.report["scan_time"] = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.report["vulnerabilities"] = self.vulnerabilities
-
-        with open(self.report_file, "w") as f:
-            json.dump(self.report, f, indent=4)
-        print(f"Scan completed. Vulnerability report saved to {self.report_file}")
+        self.report = compact_findings(self.findings_log_file, self.report_file, self.target_url)
+        print(f"Scan completed. {self.report['findings']} findings logged to {self.findings_log_file}, "
+              f"summary report saved to {self.report_file}")
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python scanner.py <target_url>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Website Vulnerability Scanner")
+    parser.add_argument("target_url", nargs="?", help="URL to start crawling from; only URLs under it are crawled")
+    parser.add_argument("-o", "--output", dest="report_file", default="vulnerability_report.json", help="Report file")
+    parser.add_argument("--findings-log", dest="findings_log", help="JSON Lines log findings are written to as they are confirmed (default: report file with .jsonl)")
+    parser.add_argument("--resume", action="store_true", help="Append to the findings log of an interrupted scan instead of starting a new one")
+    parser.add_argument("--compact", dest="compact_log", metavar="LOG", help="Only rebuild the report from an existing findings log, e.g. after a crash")
+    parser.add_argument("-c", "--concurrency", dest="max_concurrency", type=int, default=20, help="Requests in flight across all hosts")
+    parser.add_argument("--per-host", dest="per_host_limit", type=int, default=4, help="Requests in flight per host")
+    parser.add_argument("--delay", dest="crawl_delay", type=float, default=0.0, help="Seconds to wait after each request to a host")
+    parser.add_argument("--max-depth", dest="max_depth", type=int, default=5, help="Maximum link depth from the start URL")
+    parser.add_argument("--max-pages", dest="max_pages", type=int, default=10000, help="Maximum pages to fetch")
+    parser.add_argument("--timeout", dest="timeout", type=float, default=5, help="Request timeout in seconds")
+    parser.add_argument("--attack-workers", dest="attack_workers", type=int, help="Workers running payloads (default: --concurrency)")
+    parser.add_argument("--rate", dest="host_rate_limit", type=float, help="Maximum requests per second per host")
+    parser.add_argument("--signatures", dest="signature_files", action="append", help="JSON file of extra response signatures ([{name, pattern, category, regex}]); may be repeated")
+    parser.add_argument("--both-methods", dest="test_both_methods", action="store_true", help="Send every payload with GET and POST")
+    parser.add_argument("--html-backend", dest="html_backend", default="auto", choices=("auto",) + BACKENDS, help="HTML parser for form and link extraction (default: fastest installed)")
+    parser.add_argument("--cache", dest="cache_file", help="SQLite HTTP cache; re-scans send conditional requests and reuse unchanged pages")
+    args = parser.parse_args()
+
+    if args.compact_log:
+        report = compact_findings(args.compact_log, args.report_file, args.target_url)
+        print(f"Compacted {report['findings']} findings from {args.compact_log} into {args.report_file}")
+        raise SystemExit
+    if not args.target_url:
+        parser.error("target_url is required unless --compact is given")
+
+    signatures = SignatureMatcher(DEFAULT_SIGNATURES)
+    for path in args.signature_files or []:
+        signatures.load(path)
+
+    cache = HttpCache(args.cache_file) if args.cache_file else None
 
-    target_url = sys.argv[1]
-    scanner = WebsiteVulnerabilityScanner(target_url)
-    scanner.run_scanner()
\ No newline at end of file
+    scanner = WebsiteVulnerabilityScanner(
+        args.target_url,
+        report_file=args.report_file,
+        max_concurrency=args.max_concurrency,
+        per_host_limit=args.per_host_limit,
+        crawl_delay=args.crawl_delay,
+        max_depth=args.max_depth,
+        max_pages=args.max_pages,
+        timeout=args.timeout,
+        attack_workers=args.attack_workers,
+        host_rate_limit=args.host_rate_limit,
+        test_both_methods=args.test_both_methods,
+        signatures=signatures,
+        cache=cache,
+        html_backend=args.html_backend,
+        findings_log=args.findings_log,
+        resume=args.resume
+    )
+    try:
+        scanner.run_scanner()
+    finally:
+        if cache:
+            cache.close()